@@ -0,0 +1,249 @@
+"""
+Local stand-in of the AmiAmi API, serving the synthetic payloads of `fixtures.py`.
+
+- `/items` serves pages of `num_items` items (odd indexes are pre-owned items)
+- `/item` serves the details of any `FIGURE-<index>` gcode or `FIGURE-<index>-R<n>` scode,
+  each listing `alternatives` alternative scodes
+- `/images/...` serves a small placeholder image for any path, so that the server can also
+  be used as `AMIAMI_IMG_ROOT`
+
+A latency can be added to every response, and a share of the requests can be answered
+with an HTTP 500 (`error_rate`) or an HTTP 429 with a Retry-After header (`throttle_rate`).
+
+Usage (from the root directory):
+    uv run core/benchmarks/fake_server.py [--port 8765] [--items 1000] [--latency 0.02] ...
+
+then point the scraper to it with `AMIAMI_API_ROOT=http://127.0.0.1:8765/api/v1.0`
+(and `AMIAMI_IMG_ROOT=http://127.0.0.1:8765` to mirror images).
+"""
+
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps as json_dumps
+from random import Random
+from re import fullmatch
+from threading import Lock, Thread
+from time import sleep
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from fixtures import build_item_response, build_items_response, build_list_item
+
+API_PATH = "/api/v1.0"
+
+
+class FakeAmiAmiHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive handler answering the /items and /item endpoints of the API, and images.
+    """
+
+    server: "FakeAmiAmiHTTPServer"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent separately, avoid delayed ACK stalls on kept-alive connections
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status, headers, body = self.server.fake.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", headers.pop("Content-Type", "application/json"))
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeAmiAmiHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], fake: "FakeAmiAmiServer"):
+        super().__init__(address, FakeAmiAmiHandler)
+        self.fake = fake
+
+
+class FakeAmiAmiServer:
+    def __init__(
+        self,
+        num_items: int = 1000,
+        alternatives: int = 1,
+        latency: float = 0,
+        error_rate: float = 0,
+        throttle_rate: float = 0,
+        retry_after: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Stand-in server of the AmiAmi API, run in a background thread.
+
+        Args:
+            num_items (int, optional): Number of items matching any query. Defaults to 1000.
+            alternatives (int, optional): Number of alternative scodes of each item.
+                Defaults to 1.
+            latency (float, optional): Delay before each response, in seconds. Defaults to 0.
+            error_rate (float, optional): Share of requests answered with an HTTP 500.
+                Defaults to 0.
+            throttle_rate (float, optional): Share of requests answered with an HTTP 429.
+                Defaults to 0.
+            retry_after (int, optional): Retry-After header of the HTTP 429, in seconds.
+                Defaults to 1.
+            host (str, optional): Listening host. Defaults to "127.0.0.1".
+            port (int, optional): Listening port. Defaults to 0 (any free port).
+            seed (Optional[int], optional): Seed of the injected failures. Defaults to None.
+        """
+        self.num_items = num_items
+        self.alternatives = alternatives
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+
+        self.status_counts: Dict[int, int] = {}
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._http_server = FakeAmiAmiHTTPServer((host, port), self)
+
+    @property
+    def api_root(self) -> str:
+        """
+        Root url of the served API, to set as `AMIAMI_API_ROOT`.
+        """
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def serve_forever(self):
+        """
+        Serve requests in the current thread, until stopped.
+        """
+        self._http_server.serve_forever()
+
+    def start(self) -> "FakeAmiAmiServer":
+        """
+        Serve requests in a background thread.
+        """
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+    def __enter__(self) -> "FakeAmiAmiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _draw_failure(self) -> Optional[int]:
+        """
+        Draw whether a request fails.
+
+        Returns:
+            Optional[int]: Status code of the injected failure, if any.
+        """
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.throttle_rate:
+            return 429
+        if draw < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def _items_body(self, query: Dict[str, str]) -> bytes:
+        page = int(query.get("pagecnt", 1))
+        per_page = int(query.get("pagemax", 50))
+        indexes = range((page - 1) * per_page, min(page * per_page, self.num_items))
+        return json_dumps(
+            build_items_response(
+                [build_list_item(index) for index in indexes],
+                total_results=self.num_items,
+            )
+        ).encode()
+
+    def _item_body(self, query: Dict[str, str]) -> Optional[bytes]:
+        code = query.get("gcode") or query.get("scode") or ""
+        match = fullmatch(r"FIGURE-(\d+)(-R\d*)?", code)
+        if match is None or int(match.group(1)) >= self.num_items:
+            return None
+        return json_dumps(
+            build_item_response(
+                int(match.group(1)),
+                scode=code if match.group(2) else None,
+                alternatives=self.alternatives,
+            )
+        ).encode()
+
+    def respond(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Build the response to a GET request.
+
+        Args:
+            path (str): Requested path, with its query string.
+
+        Returns:
+            Tuple[int, Dict[str, str], bytes]: (status, headers, body) of the response.
+        """
+        if self.latency:
+            sleep(self.latency)
+
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        status, headers, body = 200, {}, None
+        failure = self._draw_failure()
+        if failure == 429:
+            status, headers = 429, {"Retry-After": str(self.retry_after)}
+        elif failure is not None:
+            status = failure
+        elif url.path == f"{API_PATH}/items":
+            body = self._items_body(query)
+        elif url.path == f"{API_PATH}/item":
+            body = self._item_body(query)
+            if body is None:
+                status = 404
+        elif url.path.startswith("/images/"):
+            headers["Content-Type"] = "image/jpeg"
+            body = f"placeholder image {url.path}".encode()
+        else:
+            status = 404
+
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if body is None:
+            body = json_dumps({"RSuccess": False, "RValue": None, "RMessage": str(status)}).encode()
+        return status, headers, body
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Local stand-in of the AmiAmi API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--items", type=int, default=1000, help="number of items")
+    parser.add_argument("--alternatives", type=int, default=1, help="alternatives per item")
+    parser.add_argument("--latency", type=float, default=0, help="response delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of HTTP 500")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="share of HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of HTTP 429")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeAmiAmiServer(
+        num_items=args.items,
+        alternatives=args.alternatives,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+    )
+    # Parsed by the benchmarks running the server in a subprocess
+    print(f"Serving on {server.api_root}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Responses: {server.status_counts}")
@@ -0,0 +1,240 @@
+"""
+Synthetic API payloads shared by the benchmarks, shaped like the /items
+(`AmiAmiItemsResponseModel`) and /item (`AmiAmiItemResponseModel`) responses.
+"""
+
+from typing import Any, Dict, List, Optional
+
+ITEMS_PER_PAGE = 50
+
+
+def build_list_item(index: int) -> Dict[str, Any]:
+    """
+    Build an item of the /items endpoint (odd indexes are pre-owned items).
+
+    Args:
+        index (int): Item index, giving its gcode (`FIGURE-<index>`).
+
+    Returns:
+        Dict[str, Any]: Item payload.
+    """
+    return {
+        "gcode": f"FIGURE-{index:06d}",
+        "gname": f"Figure {index} Complete Figure",
+        "thumb_url": f"/images/product/thumb300/{index:06d}.jpg",
+        "min_price": 10000 + index,
+        "max_price": 12000 + index,
+        "maker_name": "Good Smile Company",
+        "saleitem": 0,
+        "condition_flg": index % 2,
+        "instock_flg": 1,
+        "order_closed_flg": 0,
+        "releasedate": "2024-01-01 00:00:00",
+        "jancode": "4580590000000",
+        "preorderitem": 0,
+        "saletopitem": 0,
+        "resale_flg": 0,
+        "preowned_sale_flg": 0,
+        "for_women_flg": 0,
+        "genre_moe": 1,
+        "cate6": None,
+        "cate7": None,
+        "buy_price": 0,
+        "thumb_alt": f"Figure {index}",
+        "thumb_title": f"Figure {index}",
+        "c_price_taxed": 13200 + index,
+        "list_preorder_available": 0,
+        "list_backorder_available": 0,
+        "list_store_bonus": 0,
+        "list_amiami_limited": 0,
+        "element_id": None,
+        "salestatus": "Pre-owned",
+        "salestatus_detail": "",
+        "buy_flg": 0,
+        "buy_remarks": None,
+        "stock_flg": 1,
+        "image_on": 1,
+        "image_category": None,
+        "image_name": None,
+        "metaalt": None,
+    }
+
+
+def build_items_response(
+    items: Optional[List[Dict[str, Any]]] = None,
+    total_results: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Build a response of the /items endpoint.
+
+    Args:
+        items (Optional[List[Dict[str, Any]]], optional): Items of the page.
+            Defaults to None (a full page of the first items).
+        total_results (int, optional): Number of items matching the query. Defaults to 1000.
+
+    Returns:
+        Dict[str, Any]: Response payload.
+    """
+    if items is None:
+        items = [build_list_item(index) for index in range(ITEMS_PER_PAGE)]
+    return {
+        "RSuccess": True,
+        "RValue": None,
+        "RMessage": "",
+        "search_result": {"total_results": total_results},
+        "items": items,
+        "_embedded": {
+            "category_tags": [
+                {"id": index, "name": f"Tag {index}", "count": index} for index in range(20)
+            ]
+        },
+    }
+
+
+def build_item_response(
+    index: int = 1,
+    scode: Optional[str] = None,
+    alternatives: int = 3,
+) -> Dict[str, Any]:
+    """
+    Build a response of the /item endpoint, for a pre-owned item and its alternatives.
+
+    Args:
+        index (int, optional): Item index, giving its gcode (`FIGURE-<index>`). Defaults to 1.
+        scode (Optional[str], optional): Item scode. Defaults to None (`FIGURE-<index>-R`).
+        alternatives (int, optional): Number of alternative items (`FIGURE-<index>-R<n>`)
+            in the embedded other items. Defaults to 3.
+
+    Returns:
+        Dict[str, Any]: Response payload.
+    """
+    gcode = f"FIGURE-{index:06d}"
+    item = {
+        "gcode": gcode,
+        "scode": scode or f"{gcode}-R",
+        "gname": f"Figure {index} Complete Figure",
+        "sname": f"(Pre-owned ITEM:A/BOX:B)Figure {index} Complete Figure",
+        "main_image_url": f"/images/product/main/{index:06d}.jpg",
+        "list_price": 15000,
+        "c_price_taxed": 13200,
+        "price": 12000,
+        "point": 120,
+        "salestatus": "Pre-owned",
+        "releasedate": "Jan-2024",
+        "watch_list_available": 1,
+        "jancode": "4580590000000",
+        "maker_name": "Good Smile Company",
+        "modeler": "Sculptor",
+        "spec": "Painted plastic complete figure, approx. 230mm in height. " * 10,
+        "memo": "Pre-owned item, box may have some damage. " * 5,
+        "copyright": "(C) Copyright holder",
+        "condition_flg": 1,
+        "preorderitem": 0,
+        "backorderitem": 0,
+        "store_bonus": 0,
+        "amiami_limited": 0,
+        "agelimit": 0,
+        "preorder_bonus_flg": 0,
+        "onsale_flg": 0,
+        "preowned_sale_flg": 0,
+        "youtube": None,
+        "gname_sub": "",
+        "sname_simple": f"Figure {index}",
+        "sname_simple_j": f"Figure {index}",
+        "main_image_alt": f"Figure {index}",
+        "main_image_title": f"Figure {index}",
+        "image_comment": "",
+        "period_from": None,
+        "period_to": None,
+        "cart_type": 1,
+        "max_cartin_count": 3,
+        "include_instock_only_flg": 0,
+        "remarks": "",
+        "size_info": None,
+        "modelergroup": "",
+        "saleitem": 0,
+        "instock_flg": 1,
+        "order_closed_flg": 0,
+        "preown_attention": 1,
+        "producttypeattention": 0,
+        "customs_warning_flg": 0,
+        "preorderattention": "",
+        "domesticitem": 0,
+        "metadescription": f"Figure {index} Complete Figure",
+        "metawords": "figure,complete",
+        "releasechange_text": "",
+        "cate1": [1, 2],
+        "cate2": [10],
+        "cate3": None,
+        "cate4": None,
+        "cate5": None,
+        "cate6": None,
+        "cate7": None,
+        "salestalk": "",
+        "buy_flg": 0,
+        "buy_price": 0,
+        "buy_remarks": None,
+        "end_flg": 0,
+        "disp_flg": 1,
+        "handling_store": None,
+        "salestatus_detail": "",
+        "stock": 1,
+        "newitem": 0,
+        "saletopitem": 0,
+        "resale_flg": 0,
+        "big_title_flg": 0,
+        "soldout_flg": 0,
+        **{f"inc_txt{number}": 0 for number in range(1, 11)},
+        "image_on": 1,
+        "image_category": None,
+        "image_name": None,
+        "metaalt": "",
+        "image_reviewnumber": 12,
+        "image_reviewcategory": None,
+        **{f"price{number}": 0 for number in range(1, 6)},
+        **{f"discountrate{number}": 0 for number in range(1, 6)},
+        "sizew": "",
+        "colorw": "",
+        "thumb_url": f"/images/product/thumb300/{index:06d}.jpg",
+        "thumb_alt": None,
+        "thumb_title": None,
+        "thumb_agelimit": 0,
+    }
+    embedded = {
+        "review_images": [
+            {
+                "image_url": f"/images/product/review/{index:06d}_{image:02d}.jpg",
+                "thumb_url": f"/images/product/review/thumb/{index:06d}_{image:02d}.jpg",
+                "alt": f"Figure {index}",
+                "title": f"Figure {index}",
+            }
+            for image in range(12)
+        ],
+        "bonus_images": [],
+        "related_items": [
+            {
+                "gcode": f"FIGURE-{related:06d}",
+                "gname": f"Figure {related} Complete Figure",
+                "thumb_url": f"/images/product/thumb300/{related:06d}.jpg",
+                "thumb_alt": f"Figure {related}",
+                "thumb_title": f"Figure {related}",
+                "thumb_agelimit": 0,
+            }
+            for related in range(20)
+        ],
+        "other_items": [
+            {"scode": f"{gcode}-R{other}", "icon_type": 1, "price": 9000, "condition": "A/B"}
+            for other in range(alternatives)
+        ],
+        "makers": [{"id": 1, "name": "Good Smile Company"}],
+        "series_titles": [{"id": 2, "name": "Series"}],
+        "original_titles": [{"id": 3, "name": "Original"}],
+        "character_names": [{"id": 4, "name": "Character"}],
+    }
+    return {
+        "RSuccess": True,
+        "RValue": None,
+        "RMessage": "ok",
+        "item": item,
+        "_embedded": embedded,
+    }
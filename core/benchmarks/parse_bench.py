@@ -0,0 +1,90 @@
+"""
+Benchmark of the CPU time and memory allocations of the API responses parsing.
+
+Parses the same synthetic /items page and /item response with:
+- `json.loads` then `Model(**data)` (previous path, parsing twice)
+- `Model.model_validate_json` on the raw bytes (full models)
+- `Model.model_validate_json` on the raw bytes (projected details models, see `lite_details`)
+
+Usage (from the root directory):
+    uv run --env-file=.env core/benchmarks/parse_bench.py [iterations]
+"""
+
+from json import dumps as json_dumps
+from json import loads as json_loads
+from sys import argv
+from time import process_time
+from tracemalloc import get_traced_memory, reset_peak, start, stop
+from typing import Any, Callable, Tuple
+
+from fixtures import ITEMS_PER_PAGE, build_item_response, build_items_response
+from models.amiami.index import (
+    AmiAmiItemResponse,
+    AmiAmiItemResponseLite,
+    AmiAmiItemsResponse,
+)
+
+
+def measure(parse: Callable[[], Any], iterations: int) -> Tuple[float, float]:
+    """
+    Measure the CPU time and the allocation peak of a parsing.
+
+    Args:
+        parse (Callable[[], Any]): Function parsing one response.
+        iterations (int): Number of parsings to time.
+
+    Returns:
+        Tuple[float, float]: (cpu_time, peak), in microseconds and KB per parsing.
+    """
+    parse()
+    start_time = process_time()
+    for _ in range(iterations):
+        parse()
+    cpu_time = (process_time() - start_time) / iterations * 1e6
+
+    start()
+    reset_peak()
+    parse()
+    peak = get_traced_memory()[1] / 1024
+    stop()
+    return cpu_time, peak
+
+
+def report(label: str, parse: Callable[[], Any], iterations: int):
+    cpu_time, peak = measure(parse, iterations)
+    print(f"{label:<34} cpu={cpu_time:9.1f} us  peak={peak:8.1f} KB")
+
+
+if __name__ == "__main__":
+    iterations = int(argv[1]) if len(argv) > 1 else 500
+
+    items_content = json_dumps(build_items_response()).encode()
+    item_content = json_dumps(build_item_response()).encode()
+    print(f"/items page ({ITEMS_PER_PAGE} items, {len(items_content) / 1024:.1f} KB)")
+    report(
+        "json.loads + Model(**data)",
+        lambda: AmiAmiItemsResponse(**json_loads(items_content)),
+        iterations,
+    )
+    report(
+        "model_validate_json",
+        lambda: AmiAmiItemsResponse.model_validate_json(items_content),
+        iterations,
+    )
+
+    print(f"/item response ({len(item_content) / 1024:.1f} KB)")
+    report(
+        "json.loads + Model(**data)",
+        lambda: AmiAmiItemResponse(**json_loads(item_content)),
+        iterations,
+    )
+    report(
+        "model_validate_json",
+        lambda: AmiAmiItemResponse.model_validate_json(item_content),
+        iterations,
+    )
+    report(
+        "model_validate_json (lite)",
+        lambda: AmiAmiItemResponseLite.model_validate_json(item_content),
+        iterations,
+    )
@@ -0,0 +1,206 @@
+"""
+Benchmark of the scraper throughput against the local stand-in API (`fake_server.py`).
+
+For each dataset size, a stand-in server is started in a subprocess (so that serving
+does not compete with the scraper for the GIL), then a query is crawled with `run_scraping`
+and enriched with `run_enrich`. Wall time, items/s and requests/s of both stages are
+reported, and can be saved as JSON to compare runs.
+
+Usage (from the root directory):
+    uv run --env-file=.env core/benchmarks/scraper_bench.py [--sizes 100,1000,5000]
+        [--latency 0.02] [--throttle-rate 0.01] [--output bench.json] ...
+
+Note: Scraper outputs (raw dumps, journals, web data files) are written in a temporary
+working directory, removed at the end.
+"""
+
+from argparse import ArgumentParser, Namespace
+from contextlib import contextmanager, redirect_stdout
+from io import StringIO
+from json import dump as json_dump
+from os import chdir, environ, getcwd
+from os.path import abspath, dirname, join
+from shutil import rmtree
+from subprocess import PIPE, Popen
+from sys import executable
+from tempfile import mkdtemp
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+FAKE_SERVER_SCRIPT = join(dirname(abspath(__file__)), "fake_server.py")
+
+
+@contextmanager
+def run_fake_server(args: Namespace, num_items: int) -> Iterator[str]:
+    """
+    Run the stand-in server in a subprocess.
+
+    Args:
+        args (Namespace): Benchmark options.
+        num_items (int): Number of items served.
+
+    Yields:
+        Iterator[str]: Root url of the served API.
+    """
+    command = [
+        executable,
+        FAKE_SERVER_SCRIPT,
+        f"--port={args.port}",
+        f"--items={num_items}",
+        f"--alternatives={args.alternatives}",
+        f"--latency={args.latency}",
+        f"--error-rate={args.error_rate}",
+        f"--throttle-rate={args.throttle_rate}",
+        f"--retry-after={args.retry_after}",
+        f"--seed={args.seed}",
+    ]
+    process = Popen(command, stdout=PIPE, text=True)
+    try:
+        # "Serving on <api_root>", once listening
+        yield process.stdout.readline().split()[-1]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def measure(run: Callable[[], Any], get_requests: Callable[[], int]) -> Tuple[Any, float, int]:
+    """
+    Time a scraper stage.
+
+    Args:
+        run (Callable[[], Any]): Function running the stage.
+        get_requests (Callable[[], int]): Function giving the number of requests sent so far.
+
+    Returns:
+        Tuple[Any, float, int]: (result, wall_time, requests), where:
+            - result: Return value of the stage
+            - wall_time: Wall time, in seconds
+            - requests: Number of requests sent by the stage
+    """
+    requests = get_requests()
+    start_time = perf_counter()
+    result = run()
+    return result, perf_counter() - start_time, get_requests() - requests
+
+
+def build_result(
+    size: int,
+    stage: str,
+    items: int,
+    wall_time: float,
+    requests: int,
+) -> Dict[str, Any]:
+    return {
+        "size": size,
+        "stage": stage,
+        "items": items,
+        "requests": requests,
+        "wall_time": round(wall_time, 3),
+        "items_per_second": round(items / wall_time, 1),
+        "requests_per_second": round(requests / wall_time, 1),
+    }
+
+
+def report(result: Dict[str, Any]):
+    print(
+        f"{result['size']:>7} {result['stage']:<8}",
+        f"items={result['items']:<7} requests={result['requests']:<7}",
+        f"wall={result['wall_time']:8.2f} s",
+        f"{result['items_per_second']:9.1f} items/s",
+        f"{result['requests_per_second']:9.1f} req/s",
+    )
+
+
+def run_benchmark(args: Namespace) -> List[Dict[str, Any]]:
+    """
+    Crawl and enrich a query of each dataset size against the stand-in server.
+
+    Args:
+        args (Namespace): Benchmark options.
+
+    Returns:
+        List[Dict[str, Any]]: Results of each size and stage.
+    """
+    # The API root and the output directories are read when the config is imported
+    environ["AMIAMI_API_ROOT"] = f"http://127.0.0.1:{args.port}/api/v1.0"
+    from models.amiami.utils import AmiAmiQueryArgs
+    from scrapers.amiami import AmiAmiScraper
+    from utils.date_util import get_current_date
+
+    results: List[Dict[str, Any]] = []
+    last_timestamp = ""
+    for size in args.sizes:
+        # Timestamps have a one-second resolution: wait for a new one, so that a size never
+        # reuses the raw dump or the enriching checkpoint of the previous one
+        while get_current_date() <= last_timestamp:
+            sleep(0.05)
+
+        with run_fake_server(args, size), AmiAmiScraper(
+            enrich_workers=args.enrich_workers,
+            crawl_workers=args.crawl_workers,
+            request_rate=args.rate,
+            max_request_rate=args.rate,
+            lite_details=args.lite_details,
+        ) as scraper:
+
+            def get_requests() -> int:
+                return scraper.requests_count
+
+            with redirect_stdout(StringIO()):
+                (timestamp, filename), crawl_time, crawl_requests = measure(
+                    lambda: scraper.run_scraping(AmiAmiQueryArgs()), get_requests
+                )
+                (enriched_count, _), enrich_time, enrich_requests = measure(
+                    lambda: scraper.run_enrich(timestamp, filename), get_requests
+                )
+            _, raw_items = scraper.open_raw_items(timestamp, filename)
+            crawled_count = sum(1 for _ in raw_items)
+
+        last_timestamp = timestamp
+        assert enriched_count == size, f"{enriched_count} items enriched out of {size}"
+        for result in (
+            build_result(size, "crawl", crawled_count, crawl_time, crawl_requests),
+            build_result(size, "enrich", enriched_count, enrich_time, enrich_requests),
+        ):
+            report(result)
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Scraper throughput against the stand-in API.")
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[100, 1000, 5000],
+        help="comma separated numbers of items",
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--alternatives", type=int, default=1, help="alternatives per item")
+    parser.add_argument("--latency", type=float, default=0.02, help="response delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of HTTP 500")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="share of HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of HTTP 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=500, help="max requests per second")
+    parser.add_argument("--crawl-workers", type=int, default=4)
+    parser.add_argument("--enrich-workers", type=int, default=8)
+    parser.add_argument("--lite-details", action="store_true")
+    parser.add_argument("--output", help="JSON file to save the results to")
+    args = parser.parse_args()
+
+    output = abspath(args.output) if args.output else None
+    root_dir = getcwd()
+    work_dir = mkdtemp(prefix="amiami_bench_")
+    chdir(work_dir)
+    try:
+        print(f"Stand-in API: latency={args.latency}s, rate={args.rate}/s")
+        results = run_benchmark(args)
+    finally:
+        chdir(root_dir)
+        rmtree(work_dir)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json_dump({"options": vars(args), "results": results}, f, indent=4)
+        print(f"Results saved to '{output}'")
@@ -0,0 +1,83 @@
+"""
+Benchmark of the per-request latency saved by the pooled sessions.
+
+Runs the same requests against the local stand-in API (`fake_server.py`),
+first with one-shot `requests.get` calls (new connection and curl handle each
+time), then through a `SessionPool` (reused connection).
+
+Usage (from the root directory):
+    uv run --env-file=.env core/benchmarks/session_bench.py [num_requests]
+
+Note: The local server is plain HTTP, so the measured gain excludes the TLS
+handshake that is also saved against the real HTTPS API.
+"""
+
+from os import environ
+from statistics import mean, median
+from sys import argv
+from time import perf_counter
+from typing import Callable, List
+
+from curl_cffi import requests
+from fake_server import FakeAmiAmiServer
+from utils.http_util import SessionPool
+
+BROWSER = environ.get("BROWSER", "chrome110")
+
+
+def measure(fetch: Callable[[], None], num_requests: int) -> List[float]:
+    """
+    Time a number of sequential requests.
+
+    Args:
+        fetch (Callable[[], None]): Function performing one request.
+        num_requests (int): Number of requests.
+
+    Returns:
+        List[float]: Latency of each request, in milliseconds.
+    """
+    latencies = []
+    for _ in range(num_requests):
+        start = perf_counter()
+        fetch()
+        latencies.append((perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: List[float]):
+    print(
+        f"{label:<10} mean={mean(latencies):7.3f} ms",
+        f"median={median(latencies):7.3f} ms",
+        f"max={max(latencies):7.3f} ms",
+    )
+
+
+if __name__ == "__main__":
+    num_requests = int(argv[1]) if len(argv) > 1 else 200
+
+    server = FakeAmiAmiServer().start()
+    url = f"{server.api_root}/item?gcode=FIGURE-000001"
+
+    def one_shot():
+        requests.get(url, impersonate=BROWSER).raise_for_status()
+
+    with SessionPool(impersonate=BROWSER) as pool:
+
+        def pooled():
+            pool.get().get(url).raise_for_status()
+
+        # Warm-up (imports, first connection)
+        one_shot()
+        pooled()
+
+        print(f"{num_requests} requests on {url}")
+        one_shot_latencies = measure(one_shot, num_requests)
+        pooled_latencies = measure(pooled, num_requests)
+
+    server.stop()
+    report("one-shot", one_shot_latencies)
+    report("pooled", pooled_latencies)
+    print(
+        "Saved per request:",
+        f"{mean(one_shot_latencies) - mean(pooled_latencies):.3f} ms (mean)",
+    )
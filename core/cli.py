@@ -0,0 +1,313 @@
+"""
+Command line entry point of the scraper.
+
+Usage (from the root directory):
+    uv run --env-file=.env core/cli.py scrape plans/example.json
+    uv run --env-file=.env core/cli.py enrich 20250318_000540 [--plan plans/example.json]
+    uv run --env-file=.env core/cli.py resume [--plan plans/example.json]
+    uv run --env-file=.env core/cli.py remap 20250318_000540 [--workers 4]
+    uv run core/cli.py export [20250318_000540 --format compact] [--merge] [--search-index]
+
+Network and models modules (curl_cffi, pydantic) are only imported by the commands using
+them, so that offline commands (e.g. `export` from the web data files) start quickly.
+"""
+
+from argparse import ArgumentParser, Namespace
+from glob import glob
+from os.path import basename, exists, join
+from sys import exit
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from config import (
+    DATA_LIST_FILE,
+    DATABASE_FILE,
+    MERGED_DATA_FILENAME,
+    OUTPUT_DIR,
+    SEARCH_INDEX_FILE,
+    WEB_DATA_DIR,
+    make_directories,
+)
+
+if TYPE_CHECKING:
+    from models.amiami.index import AmiAmiItem
+    from storages.sqlite import SqliteStorage
+
+JOURNAL_SUFFIX = "-mapped_items.journal.jsonl"
+
+
+def load_scraper_options(plan_path: Optional[str]) -> Dict[str, Any]:
+    """
+    Load the scraper options of a query plan.
+
+    Args:
+        plan_path (Optional[str]): Path of the plan file, if any.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments of AmiAmiScraper.
+    """
+    if plan_path is None:
+        return {}
+    from models.amiami.utils import AmiAmiQueryPlan
+    from utils.plan_util import read_plan_file
+
+    return AmiAmiQueryPlan.model_validate(read_plan_file(plan_path)).scraper
+
+
+def find_raw_filename(storage: Optional["SqliteStorage"], timestamp: str) -> str:
+    """
+    Find the raw data dump of a run.
+
+    Args:
+        storage (Optional[SqliteStorage]): Storage where the dump is looked for first, if any.
+        timestamp (str): Run timestamp.
+
+    Raises:
+        ValueError: If no dump (or several) exists for the run.
+
+    Returns:
+        str: Raw data dump filename.
+    """
+    from storages.dump import RAW_DUMP_EXTENSIONS
+
+    if storage is not None:
+        run = storage.get_run(timestamp)
+        if run is not None:
+            return run[0]
+    paths = [
+        path
+        for extension in RAW_DUMP_EXTENSIONS
+        for path in glob(join(OUTPUT_DIR, f"{timestamp}-*{extension}"))
+    ]
+    if len(paths) != 1:
+        raise ValueError(f"Expected one raw data dump for '{timestamp}', found {len(paths)}")
+    return basename(paths[0])
+
+
+def load_raw_items(timestamp: str) -> List["AmiAmiItem"]:
+    """
+    Load the raw items of a run, from the SQLite database if it holds them, or else from its dump.
+
+    Args:
+        timestamp (str): Run timestamp.
+
+    Returns:
+        List[AmiAmiItem]: Raw items.
+    """
+    from storages.dump import open_raw_dump
+    from storages.sqlite import SqliteStorage
+
+    storage = SqliteStorage(DATABASE_FILE) if exists(DATABASE_FILE) else None
+    try:
+        if storage is not None and storage.get_run(timestamp) is not None:
+            return storage.load_raw_items(timestamp)
+        _, items = open_raw_dump(join(OUTPUT_DIR, find_raw_filename(None, timestamp)))
+        return list(items)
+    finally:
+        if storage is not None:
+            storage.close()
+
+
+def run_scrape(args: Namespace) -> int:
+    from models.amiami.utils import AmiAmiQueryPlan
+    from scrapers.amiami import AmiAmiScraper
+    from scrapers.amiami_batch import AmiAmiBatchScheduler
+    from utils.plan_util import read_plan_file
+
+    plan = AmiAmiQueryPlan.model_validate(read_plan_file(args.plan))
+    print(f"Running {len(plan.queries)} queries from '{args.plan}'...")
+    with AmiAmiScraper(**plan.scraper) as scraper:
+        if args.no_enrich:
+            for query in plan.queries:
+                scraper.run_scraping(query)
+        else:
+            AmiAmiBatchScheduler(scraper, plan.max_concurrent_queries).run(plan.queries)
+    return 0
+
+
+def enrich_runs(
+    timestamps: List[str],
+    plan_path: Optional[str],
+    filename: Optional[str] = None,
+    sqlite_storage: bool = False,
+) -> int:
+    """
+    Enrich (or resume enriching) crawled runs, one after the other.
+
+    Args:
+        timestamps (List[str]): Runs timestamps.
+        plan_path (Optional[str]): Path of the plan file giving the scraper options, if any.
+        filename (Optional[str], optional): Raw data dump filename, for a single run.
+            Defaults to None (found from the timestamp).
+        sqlite_storage (bool, optional): If True, the SQLite storage is used whatever the plan,
+            so that runs stored in it resume from their checkpoint. Defaults to False.
+
+    Returns:
+        int: Exit code.
+    """
+    from scrapers.amiami import AmiAmiScraper
+
+    options = dict(load_scraper_options(plan_path))
+    if sqlite_storage:
+        options["sqlite_storage"] = True
+    with AmiAmiScraper(**options) as scraper:
+        for timestamp in timestamps:
+            print(f"Enriching '{timestamp}'...")
+            scraper.run_enrich(
+                timestamp, filename or find_raw_filename(scraper.storage, timestamp)
+            )
+    return 0
+
+
+def run_enrich(args: Namespace) -> int:
+    if args.filename and len(args.timestamps) > 1:
+        print("A raw data dump filename can only be given for a single timestamp")
+        return 2
+    return enrich_runs(args.timestamps, args.plan, args.filename)
+
+
+def find_interrupted_runs() -> Tuple[List[str], List[str]]:
+    """
+    Find the runs whose enriching was interrupted: runs keeping their journal,
+    and runs stored in the SQLite database with a checkpoint before their last item.
+
+    Returns:
+        Tuple[List[str], List[str]]: (journal_timestamps, sqlite_timestamps), oldest first.
+    """
+    journal_timestamps = sorted(
+        basename(path)[: -len(JOURNAL_SUFFIX)]
+        for path in glob(join(OUTPUT_DIR, f"*{JOURNAL_SUFFIX}"))
+    )
+    sqlite_timestamps: List[str] = []
+    if exists(DATABASE_FILE):
+        from storages.sqlite import SqliteStorage
+
+        storage = SqliteStorage(DATABASE_FILE)
+        try:
+            sqlite_timestamps = storage.get_interrupted_runs()
+        finally:
+            storage.close()
+    return journal_timestamps, sqlite_timestamps
+
+
+def run_resume(args: Namespace) -> int:
+    journal_timestamps, sqlite_timestamps = find_interrupted_runs()
+    timestamps = sorted(set(journal_timestamps) | set(sqlite_timestamps))
+    if not timestamps:
+        print("No interrupted enriching to resume")
+        return 0
+    print(f"Interrupted enrichings to resume: {', '.join(timestamps)}")
+    return enrich_runs(timestamps, args.plan, sqlite_storage=bool(sqlite_timestamps))
+
+
+def run_remap(args: Namespace) -> int:
+    from scrapers.amiami_remap import remap_run
+
+    for timestamp in args.timestamps:
+        print(f"Remapping '{timestamp}'...")
+        remapped_count, items_count = remap_run(timestamp, load_raw_items(timestamp), args.workers)
+        print(f"{remapped_count} of {items_count} items mapped again from their details")
+    print("Run `export` again for the compact and NDJSON formats, if used")
+    return 0
+
+
+def run_export(args: Namespace) -> int:
+    from utils.search_util import add_to_data_list
+
+    make_directories()
+    if args.timestamp is not None:
+        filename = f"{args.timestamp}-mapped_items.json"
+        if args.from_sqlite:
+            from storages.sqlite import SqliteStorage
+
+            storage = SqliteStorage(DATABASE_FILE)
+            try:
+                filename = storage.export_mapped(args.timestamp)
+            finally:
+                storage.close()
+        if args.format != "json":
+            from json import load as json_load
+
+            from utils.export_util import write_compact_export, write_ndjson_export
+
+            with open(join(WEB_DATA_DIR, filename), "r", encoding="utf-8") as f:
+                data = json_load(f)
+            if args.format == "compact":
+                filename = write_compact_export(
+                    WEB_DATA_DIR,
+                    f"{args.timestamp}-mapped_items",
+                    {"current_index": data["current_index"]},
+                    data["items"],
+                    args.shard_size,
+                )
+            else:
+                filename = f"{args.timestamp}-mapped_items.ndjson"
+                write_ndjson_export(join(WEB_DATA_DIR, filename), data["items"])
+        print(f"Exported '{filename}'")
+        if args.list and add_to_data_list(DATA_LIST_FILE, filename):
+            print(f"Listed '{filename}'")
+
+    if args.merge:
+        from utils.merge_util import merge_data_files
+
+        rows_count, items_count = merge_data_files(
+            WEB_DATA_DIR, DATA_LIST_FILE, MERGED_DATA_FILENAME, args.replace_sources
+        )
+        print(f"Merged {rows_count} items into {items_count} unique items")
+
+    if args.search_index:
+        from utils.search_util import write_search_index
+
+        items_length = write_search_index(WEB_DATA_DIR, DATA_LIST_FILE, SEARCH_INDEX_FILE)
+        print(f"Search index built over {items_length} items")
+    return 0
+
+
+def build_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="cli.py", description="AmiAmi scraper.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scrape = commands.add_parser("scrape", help="crawl and enrich the queries of a plan")
+    scrape.add_argument("plan", help="query plan file (JSON or TOML)")
+    scrape.add_argument("--no-enrich", action="store_true", help="only crawl the queries")
+    scrape.set_defaults(run=run_scrape)
+
+    enrich = commands.add_parser("enrich", help="enrich (or resume enriching) crawled runs")
+    enrich.add_argument("timestamps", nargs="+", help="runs timestamps")
+    enrich.add_argument("--filename", help="raw data dump filename (found if omitted)")
+    enrich.add_argument("--plan", help="plan file giving the scraper options")
+    enrich.set_defaults(run=run_enrich)
+
+    resume = commands.add_parser("resume", help="resume all interrupted enrichings")
+    resume.add_argument("--plan", help="plan file giving the scraper options")
+    resume.set_defaults(run=run_resume)
+
+    remap = commands.add_parser(
+        "remap", help="map enriched runs again from their archived details, offline"
+    )
+    remap.add_argument("timestamps", nargs="+", help="runs timestamps")
+    remap.add_argument("--workers", type=int, help="worker processes (number of CPUs if omitted)")
+    remap.set_defaults(run=run_remap)
+
+    export = commands.add_parser("export", help="export data files for the webview, offline")
+    export.add_argument("timestamp", nargs="?", help="run to export")
+    export.add_argument(
+        "--format",
+        choices=("json", "compact", "ndjson"),
+        default="json",
+        help="exported format (json only rewrites the file from the SQLite database)",
+    )
+    export.add_argument("--shard-size", type=int, default=5000, help="items per compact shard")
+    export.add_argument("--from-sqlite", action="store_true", help="export from the database")
+    export.add_argument("--list", action="store_true", help="list the exported file")
+    export.add_argument("--merge", action="store_true", help="merge all listed files")
+    export.add_argument(
+        "--replace-sources", action="store_true", help="list the merged file instead of its sources"
+    )
+    export.add_argument("--search-index", action="store_true", help="rebuild the search index")
+    export.set_defaults(run=run_export)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    exit(args.run(args))
@@ -1,6 +1,6 @@
 from os import environ, getcwd, makedirs
 from os.path import join
-from typing import Literal
+from typing import Literal, Tuple
 
 # Type aliases
 
@@ -8,31 +8,76 @@ from typing import Literal
 AmiAmiCodeTypeLiteral = Literal["gcode", "scode"]
 
 
-# Directories
+# Directories (created by `make_directories`)
 
 OUTPUT_DIR = join(getcwd(), "output")
-makedirs(OUTPUT_DIR, exist_ok=True)
+
+CACHE_DIR = join(OUTPUT_DIR, "_cache")
+
+STATE_DIR = join(OUTPUT_DIR, "_state")
+
+METRICS_DIR = join(OUTPUT_DIR, "_metrics")
+
+PROFILES_DIR = join(OUTPUT_DIR, "_profiles")
 
 WEB_DIR = join(getcwd(), "web")
-makedirs(WEB_DIR, exist_ok=True)
 
 WEB_DATA_DIR = join(WEB_DIR, "data")
-makedirs(WEB_DATA_DIR, exist_ok=True)
+
+WEB_IMG_DIR = join(WEB_DIR, "img")
+
+DIRECTORIES = (
+    OUTPUT_DIR,
+    CACHE_DIR,
+    STATE_DIR,
+    METRICS_DIR,
+    PROFILES_DIR,
+    WEB_DIR,
+    WEB_DATA_DIR,
+    WEB_IMG_DIR,
+)
 
 
 # Files
 
 DATA_LIST_FILE = join(WEB_DATA_DIR, "_data_files.txt")
 
+SEARCH_INDEX_FILE = join(WEB_DATA_DIR, "_search_index.json")
 
-# Env variables
+MERGED_DATA_FILENAME = "_merged_items.json"
+
+DETAILS_CACHE_FILE = join(CACHE_DIR, "details.sqlite3")
 
-AMIAMI_USER_KEY = environ["AMIAMI_USER_KEY"]
-AMIAMI_USER_AGENT = environ["AMIAMI_USER_AGENT"]
+ENRICHED_RECORDS_FILE = join(STATE_DIR, "enriched_records.sqlite3")
 
-AMIAMI_API_ROOT = environ["AMIAMI_API_ROOT"]
-AMIAMI_IMG_ROOT = environ["AMIAMI_IMG_ROOT"]
+DATABASE_FILE = join(OUTPUT_DIR, "amiami.sqlite3")
 
-ITEMS_PER_PAGE = environ["ITEMS_PER_PAGE"]
+METRICS_PROMETHEUS_FILE = join(METRICS_DIR, "amiami.prom")
 
-BROWSER = environ["BROWSER"]
+
+# Env variables
+# Read on first access (e.g. `from config import AMIAMI_API_ROOT`), so that offline tools
+# importing the paths above do not need them
+
+ENV_VARIABLES: Tuple[str, ...] = (
+    "AMIAMI_USER_KEY",
+    "AMIAMI_USER_AGENT",
+    "AMIAMI_API_ROOT",
+    "AMIAMI_IMG_ROOT",
+    "ITEMS_PER_PAGE",
+    "BROWSER",
+)
+
+
+def __getattr__(name: str) -> str:
+    if name in ENV_VARIABLES:
+        return environ[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def make_directories():
+    """
+    Create the output and web directories, if missing.
+    """
+    for directory in DIRECTORIES:
+        makedirs(directory, exist_ok=True)
@@ -8,10 +8,9 @@ from models.amiami.enums import (
 )
 from models.amiami.utils import AmiAmiQueryArgs
 from scrapers.amiami import AmiAmiScraper
+from scrapers.amiami_batch import AmiAmiBatchScheduler
 
 if __name__ == "__main__":
-    print("Init scraper...")
-    amiami = AmiAmiScraper(always_scrap_details=False)
     # Request args
     batch_args: List[AmiAmiQueryArgs] = [
         AmiAmiQueryArgs(
@@ -31,15 +30,17 @@ if __name__ == "__main__":
         ),
     ]
 
-    print("Starting scraping...")
-    for args in batch_args:
-        # Scrap website
-        timestamp, filename = amiami.run_scraping(args)
+    print("Init scraper...")
+    with AmiAmiScraper(always_scrap_details=False) as amiami:
+        print("Starting scraping...")
+        # Queries are crawled then enriched concurrently, sharing the scraper request budget
+        AmiAmiBatchScheduler(amiami).run(batch_args)
+
+        # Or, to run (or resume) a single query:
+        # timestamp, filename = amiami.run_scraping(batch_args[0])
         # timestamp, filename = (
         #     "20250318_000540",
-        #     "20250318_000540-categories=s_st_condition_flg.json",
+        #     "20250318_000540-categories=s_st_condition_flg.ndjson",
         # )
-
-        # Enrich format
-        amiami.run_enrich(timestamp, filename)
+        # amiami.run_enrich(timestamp, filename)
     print("End scraping")
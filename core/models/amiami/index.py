@@ -1,9 +1,12 @@
-from typing import List
+from hashlib import sha1
+from typing import List, Union
 
 from config import AMIAMI_IMG_ROOT
 from models.amiami.v1.item import (
+    AmiAmiItemDetailLiteModel,
     AmiAmiItemDetailModel,
     AmiAmiItemModelFinal,
+    AmiAmiItemResponseLiteModel,
     AmiAmiItemResponseModel,
 )
 from models.amiami.v1.items import (
@@ -57,6 +60,29 @@ class AmiAmiItem(AmiAmiItemModel):
             is_preowned_sale=self.is_preowned_sale,
         )
 
+    def fingerprint(self) -> str:
+        """
+        Generate a fingerprint of the fields that change when the item is updated in the listing
+        (price, sale status and stock flags).
+
+        Returns:
+            str: Fingerprint.
+        """
+        fields = (
+            self.gcode,
+            self.min_price,
+            self.max_price,
+            self.c_price_taxed,
+            self.salestatus,
+            self.salestatus_detail,
+            self.is_in_stock,
+            self.stock_flg,
+            self.is_order_closed,
+            self.list_preorder_available,
+            self.list_backorder_available,
+        )
+        return sha1("|".join(map(str, fields)).encode()).hexdigest()[:16]
+
 
 class AmiAmiItemsResponse(AmiAmiItemsResponseModel):
     """
@@ -70,9 +96,9 @@ class AmiAmiItemsResponse(AmiAmiItemsResponseModel):
 # Item (detail) endpoint
 
 
-class AmiAmiItemInput(AmiAmiItemDetailModel):
+class AmiAmiItemInputMixin:
     """
-    Alias for the detailed item representation returned in the /item endpoint.
+    Mapping shared by the full and projected detailed item representations.
     """
 
     def minify(self) -> AmiAmiItemOutput:
@@ -112,6 +138,23 @@ class AmiAmiItemInput(AmiAmiItemDetailModel):
         )
 
 
+class AmiAmiItemInput(AmiAmiItemInputMixin, AmiAmiItemDetailModel):
+    """
+    Alias for the detailed item representation returned in the /item endpoint.
+    """
+
+    ...
+
+
+class AmiAmiItemInputLite(AmiAmiItemInputMixin, AmiAmiItemDetailLiteModel):
+    """
+    Alias for the detailed item representation returned in the /item endpoint,
+    only keeping the fields used by `minify`.
+    """
+
+    ...
+
+
 class AmiAmiItemResponse(AmiAmiItemResponseModel):
     """
     Alias for the data model returned by the /item endpoint.
@@ -119,3 +162,16 @@ class AmiAmiItemResponse(AmiAmiItemResponseModel):
 
     # Overriding type of the variable
     item: AmiAmiItemInput
+
+
+class AmiAmiItemResponseLite(AmiAmiItemResponseLiteModel):
+    """
+    Alias for the data model returned by the /item endpoint,
+    only keeping the fields used to build the final items.
+    """
+
+    # Overriding type of the variable
+    item: AmiAmiItemInputLite
+
+
+AmiAmiItemResponseAny = Union[AmiAmiItemResponse, AmiAmiItemResponseLite]
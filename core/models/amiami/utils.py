@@ -1,4 +1,5 @@
-from typing import List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional, Type
 
 from models.amiami.enums import (
     ItemCategory1Enum,
@@ -9,7 +10,16 @@ from models.amiami.enums import (
 )
 from models.amiami.index import AmiAmiItem, AmiAmiItemOutput
 from models.base import CustomBaseForbid
-from pydantic import Field
+from pydantic import Field, ValidationInfo, field_validator
+
+# Enums of the query args, whose member names are accepted as well as their values
+QUERY_ARGS_ENUMS: Dict[str, Type[Enum]] = {
+    "types": ItemTypeEnum,
+    "category1": ItemCategory1Enum,
+    "category2": ItemCategory2Enum,
+    "category3": ItemCategory3Enum,
+    "sort_key": ItemSortingEnum,
+}
 
 
 class AmiAmiQueryArgs(CustomBaseForbid):
@@ -25,6 +35,16 @@ class AmiAmiQueryArgs(CustomBaseForbid):
     category3: Optional[ItemCategory3Enum] = None
     sort_key: Optional[ItemSortingEnum] = None
 
+    @field_validator(*QUERY_ARGS_ENUMS, mode="before")
+    def parse_enum_names(cls, v: Any, info: ValidationInfo):
+        # Hand-written query plans can use readable names (e.g. "PRE_OWNED")
+        enum = QUERY_ARGS_ENUMS[info.field_name]
+        if isinstance(v, list):
+            return [enum[value] if value in enum.__members__ else value for value in v]
+        if isinstance(v, str) and v in enum.__members__:
+            return enum[v]
+        return v
+
     def stringify(self) -> str:
         """
         Generate a string from the arguments of the query.
@@ -43,7 +63,7 @@ class AmiAmiQueryArgs(CustomBaseForbid):
 
 class AmiAmiItemsDump(CustomBaseForbid):
     """
-    Data model for the temporary data dump after the /items scraping.
+    Data model for the legacy (JSON) data dump after the /items scraping.
     """
 
     items_length: int
@@ -58,3 +78,39 @@ class AmiAmiItemOutputDump(CustomBaseForbid):
     current_index: int = 0
     items_length: int
     items: List[AmiAmiItemOutput] = Field(default_factory=list)
+
+
+class AmiAmiQueryState(CustomBaseForbid):
+    """
+    Data model for the state kept between incremental scrapings of a query.
+    """
+
+    query: str
+    snapshot_filename: str
+    fingerprints: Dict[str, str] = Field(default_factory=dict)
+
+
+class AmiAmiQueryReport(CustomBaseForbid):
+    """
+    Data model for the throughput report of a query run by the batch scheduler.
+    """
+
+    query: str
+    timestamp: Optional[str] = None
+    filename: Optional[str] = None
+    enriched_items: int = 0
+    mapped_items: int = 0
+    crawl_time: float = 0
+    enrich_time: float = 0
+    error: Optional[str] = None
+
+
+class AmiAmiQueryPlan(CustomBaseForbid):
+    """
+    Data model for a query plan file, run by the CLI.
+    """
+
+    # Keyword arguments of AmiAmiScraper
+    scraper: Dict[str, Any] = Field(default_factory=dict)
+    max_concurrent_queries: Optional[int] = None
+    queries: List[AmiAmiQueryArgs] = Field(default_factory=list)
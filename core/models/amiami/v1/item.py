@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from models.base import CustomBaseForbid
+from models.base import CustomBaseForbid, CustomBaseIgnore
 from pydantic import Field, field_validator
 
 
@@ -258,3 +258,78 @@ class AmiAmiItemResponseModel(CustomBaseForbid):
     api_message: str = Field(alias="RMessage")
     item: AmiAmiItemDetailModel
     embedded_data: AmiAmiEmbeddedDataModel = Field(alias="_embedded")
+
+
+# Projections of the /item endpoint, only keeping the fields used to build the final items
+
+
+class AmiAmiEmbeddedDataLiteModel(CustomBaseIgnore):
+    other_items: List[AmiAmiOtherItemModel] = Field(default_factory=list)
+    makers: List[AmiAmiNamedFieldModel] = Field(default_factory=list)
+    series_titles: List[AmiAmiNamedFieldModel] = Field(default_factory=list)
+    original_titles: List[AmiAmiNamedFieldModel] = Field(default_factory=list)
+    character_names: List[AmiAmiNamedFieldModel] = Field(default_factory=list)
+
+    @field_validator(
+        "other_items",
+        "makers",
+        "series_titles",
+        "original_titles",
+        "character_names",
+        mode="before",
+    )
+    def check_cate7(cls, v):
+        if v is None:
+            return []
+        return v
+
+
+class AmiAmiItemDetailLiteModel(CustomBaseIgnore):
+    gcode: str
+    scode: str
+    gname: str
+    sname: str
+    main_image_url: str
+    c_price_taxed: int
+    price: Optional[int]
+    point: int = 0
+    salestatus: str
+    jancode: Optional[str]
+    maker_name: str
+    modeler: str
+    spec: str
+    memo: str
+    copyright: str
+    is_preowned: bool = Field(alias="condition_flg")
+    is_preorder: bool = Field(alias="preorderitem")
+    is_backorder: bool = Field(alias="backorderitem")
+    has_store_bonus: bool = Field(alias="store_bonus")
+    is_amiami_limited: bool = Field(alias="amiami_limited")
+    is_age_limited: bool = Field(alias="agelimit")
+    categories: List[int] = Field(default_factory=list)
+    has_preorder_bonus: bool = Field(alias="preorder_bonus_flg")
+    is_on_sale: bool = Field(alias="onsale_flg")
+    is_preowned_sale: bool = Field(alias="preowned_sale_flg")
+
+    @field_validator(
+        "is_preowned",
+        "is_preorder",
+        "is_backorder",
+        "has_store_bonus",
+        "is_amiami_limited",
+        "is_age_limited",
+        "has_preorder_bonus",
+        "is_on_sale",
+        "is_preowned_sale",
+        mode="before",
+    )
+    def convert_int_to_bool(cls, v):
+        return bool(v)
+
+
+class AmiAmiItemResponseLiteModel(CustomBaseIgnore):
+    api_success: bool = Field(alias="RSuccess")
+    api_value: Optional[str] = Field(alias="RValue")
+    api_message: str = Field(alias="RMessage")
+    item: AmiAmiItemDetailLiteModel
+    embedded_data: AmiAmiEmbeddedDataLiteModel = Field(alias="_embedded")
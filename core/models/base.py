@@ -17,3 +17,8 @@ class CustomBaseForbid(CustomBaseModel):
 class CustomBaseAllow(CustomBaseForbid):
     class Config(CustomConfig):
         extra = "allow"
+
+
+class CustomBaseIgnore(CustomBaseModel):
+    class Config(CustomConfig):
+        extra = "ignore"
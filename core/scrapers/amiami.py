@@ -1,8 +1,15 @@
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from hashlib import sha1
+from itertools import islice
 from json import load as json_load
+from math import ceil
 from os.path import exists, join
 from re import search as re_search
-from time import sleep
-from typing import Dict, List, Optional, Tuple
+from threading import Lock
+from time import perf_counter
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple, Type
 
 from config import (
     AMIAMI_API_ROOT,
@@ -10,12 +17,22 @@ from config import (
     AMIAMI_USER_KEY,
     BROWSER,
     DATA_LIST_FILE,
+    DATABASE_FILE,
+    DETAILS_CACHE_FILE,
+    ENRICHED_RECORDS_FILE,
     ITEMS_PER_PAGE,
+    METRICS_DIR,
+    METRICS_PROMETHEUS_FILE,
     OUTPUT_DIR,
+    PROFILES_DIR,
+    SEARCH_INDEX_FILE,
+    STATE_DIR,
     WEB_DATA_DIR,
+    WEB_IMG_DIR,
     AmiAmiCodeTypeLiteral,
+    make_directories,
 )
-from curl_cffi import requests
+from curl_cffi.requests import Response
 from models.amiami.enums import (
     ItemSortingEnum,
     ItemTypeEnum,
@@ -24,11 +41,27 @@ from models.amiami.index import (
     AmiAmiItem,
     AmiAmiItemOutput,
     AmiAmiItemResponse,
+    AmiAmiItemResponseAny,
+    AmiAmiItemResponseLite,
     AmiAmiItemsResponse,
 )
-from models.amiami.utils import AmiAmiItemOutputDump, AmiAmiItemsDump, AmiAmiQueryArgs
+from models.amiami.utils import AmiAmiQueryArgs, AmiAmiQueryState
+from storages.dump import RAW_DUMP_EXTENSION, open_raw_dump, write_raw_dump
+from storages.records import EnrichedRecordStore
+from storages.sqlite import SqliteStorage
+from utils.archive_util import DETAILS_ARCHIVE_SUFFIX, DetailsArchive
+from utils.cache_util import DiskCache
+from utils.checkpoint_util import JournalCheckpoint
 from utils.date_util import get_current_date
+from utils.export_util import write_compact_export, write_ndjson_export
+from utils.http_util import SessionPool, TooManyRequestsError, parse_retry_after
+from utils.image_util import ImageMirror, mirror_data_file_images
 from utils.json_util import save_model_to_json
+from utils.metrics_util import ERROR_STATUS, RunMetrics
+from utils.profile_util import StageProfiler
+from utils.rate_util import AdaptiveRateLimiter
+from utils.registry_util import CodeRegistry
+from utils.search_util import add_to_data_list, write_search_index
 
 
 class AmiAmiScraper:
@@ -37,6 +70,30 @@ class AmiAmiScraper:
         always_scrap_details: bool = False,
         stop_on_429: bool = True,
         extra_headers: Optional[Dict[str, str]] = None,
+        enrich_workers: int = 1,
+        crawl_workers: int = 1,
+        request_rate: float = 1,
+        min_request_rate: float = 0.1,
+        max_request_rate: float = 5,
+        max_retries: int = 5,
+        checkpoint_every_items: Optional[int] = None,
+        checkpoint_every_seconds: Optional[float] = None,
+        details_cache_ttl: Optional[float] = None,
+        details_cache_max_size: int = 512 * 1024**2,
+        incremental_crawl: bool = False,
+        incremental_enrich: bool = False,
+        sqlite_storage: bool = False,
+        lite_details: bool = False,
+        archive_details: bool = False,
+        compact_export: bool = False,
+        export_shard_size: int = 5000,
+        search_index: bool = False,
+        ndjson_export: bool = False,
+        mirror_images: bool = False,
+        image_thumbnail_size: Optional[int] = None,
+        image_workers: int = 8,
+        export_metrics: bool = False,
+        profile_stages: bool = False,
     ):
         """
         Main class for scraping AmiAmi
@@ -45,12 +102,98 @@ class AmiAmiScraper:
             always_scrap_details (bool, optional): If True, scrap item details to get more data.
                 Note: Always the case for pre-owned items.
                 Defaults to False.
-            stop_on_429 (bool, optional): If True, will stop the program if an error 429 occurs.
+            stop_on_429 (bool, optional): If True, will stop the program if requests are still
+                throttled (error 429) after all retries.
                 Note: The other case will result on items enriched with only basic crawled data.
                 Defaults to True.
             extra_headers (Optional[Dict[str, str]], optional): Extra request headers.
                 Defaults to None.
+            enrich_workers (int, optional): Number of details requests kept in flight while enriching.
+                Note: Results are still processed in the original item order.
+                Defaults to 1.
+            crawl_workers (int, optional): Number of pages requests kept in flight while crawling.
+                If greater than 1, the number of pages is computed from the first page results,
+                and the remaining pages are crawled concurrently.
+                Defaults to 1.
+            request_rate (float, optional): Initial global requests rate (per second),
+                shared by all crawl and enrich workers. It is increased after each successful request,
+                and decreased when the API throttles requests (error 429).
+                Defaults to 1.
+            min_request_rate (float, optional): Minimum global requests rate (per second).
+                Defaults to 0.1.
+            max_request_rate (float, optional): Maximum global requests rate (per second).
+                Defaults to 5.
+            max_retries (int, optional): Number of retries of a throttled request.
+                Defaults to 5.
+            checkpoint_every_items (Optional[int], optional): If set, rewrite the enriched data file
+                every N items. Progress is always journaled, the file is written at the end otherwise.
+                Defaults to None.
+            checkpoint_every_seconds (Optional[float], optional): If set, rewrite the enriched data file
+                every T seconds.
+                Defaults to None.
+            details_cache_ttl (Optional[float], optional): If set, raw details responses are cached
+                on disk and reused for this duration (in seconds), across runs.
+                Defaults to None (no cache).
+            details_cache_max_size (int, optional): Maximum size of the details cache, in bytes.
+                Least recently used responses are evicted beyond it.
+                Defaults to 512 MB.
+            incremental_crawl (bool, optional): If True, queries sorted by update (recent update or
+                pre-owned sorting) stop crawling at the first page with only known and unchanged items,
+                and the crawled items are merged into the previous data dump of the same query.
+                Defaults to False.
+            incremental_enrich (bool, optional): If True, the items enriched from details pages are
+                recorded (`output/_state/enriched_records.sqlite3`) with the fingerprint of their
+                listing item, and reused by later enrichings while the listing item is unchanged.
+                Only new or updated items are requested, and the reused ones still get the fields
+                taken from the listing (release date).
+                Defaults to False.
+            sqlite_storage (bool, optional): If True, raw and enriched items are stored in a SQLite
+                database (`output/amiami.sqlite3`) instead of the raw data dump files and the journal.
+                The enriched data file is still exported to the web directory.
+                Defaults to False.
+            lite_details (bool, optional): If True, details responses are only validated for the fields
+                used to build the final items, skipping review images, related items and such.
+                Defaults to False.
+            archive_details (bool, optional): If True, the raw details responses received while
+                enriching are archived (`output/<timestamp>-item_details.jsonl.gz`), so that the run
+                can be mapped again offline (see `scrapers/amiami_remap.py`).
+                Defaults to False.
+            compact_export (bool, optional): If True, enriched items are also exported as minified JSON
+                shards with pre-compressed siblings (`.gz`, and `.br` if brotli is installed), and the
+                webview loads them through their manifest instead of the indented JSON file.
+                Defaults to False.
+            export_shard_size (int, optional): Maximum number of items per shard of the compact export.
+                Defaults to 5000.
+            search_index (bool, optional): If True, the inverted index used by the webview text search
+                is rebuilt over all listed data files after each enriching.
+                Defaults to False.
+            ndjson_export (bool, optional): If True, enriched items are also exported as NDJSON
+                (`<timestamp>-mapped_items.ndjson`), which the webview parses while downloading.
+                It is listed for the webview instead of the other formats.
+                Defaults to False.
+            mirror_images (bool, optional): If True, the images of the enriched items are downloaded
+                to `web/img` (named by a hash of their content, each URL downloaded once across runs),
+                and the exported items link to these local copies.
+                Defaults to False.
+            image_thumbnail_size (Optional[int], optional): If set with `mirror_images`, exported items
+                link to JPEG thumbnails fitting in a square of this size (in pixels) instead of the
+                full images. Needs the optional `Pillow` package.
+                Defaults to None.
+            image_workers (int, optional): Number of images downloaded concurrently.
+                Defaults to 8.
+            export_metrics (bool, optional): If True, the scraper metrics (requests latencies,
+                status codes, received bytes, retries, rate limiting waits, validation and checkpoint
+                durations) are exported at the end of each scraping and enriching, as JSON
+                (`output/_metrics/<timestamp>-<stage>.metrics.json`) and as a Prometheus textfile
+                (`output/_metrics/amiami.prom`).
+                Defaults to False.
+            profile_stages (bool, optional): If True, the scraper stages (list crawl, responses
+                validation, mapping, checkpoint writes, data list update...) are profiled with cProfile
+                and tracemalloc, which slows down the scraper. Per-stage profiles and the wall/CPU/memory
+                breakdown are written to `output/_profiles/<date>` when the scraper is closed.
+                Defaults to False.
         """
+        make_directories()
         self.always_scrap_details = always_scrap_details
         self.stop_on_429 = stop_on_429
         self.headers = {
@@ -59,8 +202,166 @@ class AmiAmiScraper:
         }
         if extra_headers is not None:
             self.headers.update(extra_headers)
-        self.crawl_sleep_time = 1
-        self.scrap_sleep_time = 1.5
+        self.sessions = SessionPool(impersonate=BROWSER, headers=self.headers)
+        self.limiter = AdaptiveRateLimiter(
+            rate=request_rate,
+            min_rate=min_request_rate,
+            max_rate=max_request_rate,
+        )
+        self.max_retries = max_retries
+        self.enrich_workers = max(1, enrich_workers)
+        self.crawl_workers = max(1, crawl_workers)
+        self.incremental_crawl = incremental_crawl
+        self.checkpoint_every_items = checkpoint_every_items
+        self.checkpoint_every_seconds = checkpoint_every_seconds
+        self.registry = CodeRegistry()
+        # Workers live as long as the scraper, so that their sessions are reused by every query
+        self._crawl_executor = ThreadPoolExecutor(max_workers=self.crawl_workers)
+        self._enrich_executor = ThreadPoolExecutor(max_workers=self.enrich_workers)
+        self.requests_count = 0
+        self._lock = Lock()
+        self._timestamps: Set[str] = set()
+        self.storage = SqliteStorage(DATABASE_FILE) if sqlite_storage else None
+        self.compact_export = compact_export
+        self.export_shard_size = export_shard_size
+        self.search_index = search_index
+        self.ndjson_export = ndjson_export
+        self.export_metrics = export_metrics
+        self.metrics = RunMetrics()
+        self.profiler = StageProfiler() if profile_stages else None
+        self._started_at = get_current_date()
+        self.item_response_model: Type[AmiAmiItemResponseAny] = (
+            AmiAmiItemResponseLite if lite_details else AmiAmiItemResponse
+        )
+        self.archive_details = archive_details
+        self._archives: Dict[str, DetailsArchive] = {}
+        self.details_cache: Optional[DiskCache] = None
+        if details_cache_ttl is not None:
+            self.details_cache = DiskCache(
+                DETAILS_CACHE_FILE,
+                ttl=details_cache_ttl,
+                max_size=details_cache_max_size,
+            )
+        self.image_mirror: Optional[ImageMirror] = None
+        if mirror_images:
+            # Separate sessions, the API headers are not meant for the images server
+            self.image_mirror = ImageMirror(
+                WEB_IMG_DIR,
+                "img",
+                SessionPool(impersonate=BROWSER),
+                workers=image_workers,
+                thumbnail_size=image_thumbnail_size,
+            )
+        self.records: Optional[EnrichedRecordStore] = None
+        if incremental_enrich:
+            self.records = EnrichedRecordStore(ENRICHED_RECORDS_FILE)
+
+    def close(self):
+        """
+        Stop the workers, close the HTTP sessions, the caches and the storage used by the scraper,
+        and write the stages profile if enabled.
+        """
+        self._crawl_executor.shutdown(wait=True, cancel_futures=True)
+        self._enrich_executor.shutdown(wait=True, cancel_futures=True)
+        self.sessions.close()
+        if self.image_mirror is not None:
+            self.image_mirror.sessions.close()
+        if self.details_cache is not None:
+            self.details_cache.close()
+        if self.records is not None:
+            self.records.close()
+        if self.storage is not None:
+            self.storage.close()
+        if self.profiler is not None:
+            output_dir = join(PROFILES_DIR, self._started_at)
+            print(f"Stages profile (saved to '{output_dir}'):")
+            print(self.profiler.dump(output_dir))
+            self.profiler.close()
+            self.profiler = None
+
+    def __enter__(self) -> "AmiAmiScraper":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        """
+        Measure a stage of the scraper in its metrics, and profile it if enabled.
+
+        Args:
+            name (str): Stage name.
+        """
+        with self.metrics.time(name):
+            if self.profiler is None:
+                yield
+            else:
+                with self.profiler.stage(name):
+                    yield
+
+    def _export_metrics(self, name: str):
+        """
+        Export the scraper metrics (cumulated since its creation), if enabled.
+
+        Args:
+            name (str): Name of the JSON file, without extension (e.g. `<timestamp>-enrich`).
+        """
+        if not self.export_metrics:
+            return
+        path = join(METRICS_DIR, f"{name}.metrics.json")
+        # Runs of a batch share the Prometheus textfile
+        with self._lock:
+            self.metrics.export(path, METRICS_PROMETHEUS_FILE)
+        print(f"Metrics saved to '{path}'")
+
+    def _request(self, url: str, params: Dict[str, Any]) -> Response:
+        """
+        Request the API through the shared rate limiter, retrying throttled requests.
+
+        Args:
+            url (str): Url.
+            params (Dict[str, Any]): Query params.
+
+        Raises:
+            TooManyRequestsError: If the request is still throttled after all retries.
+
+        Returns:
+            Response: Successful response.
+        """
+        endpoint = url.rsplit("/", 1)[-1]
+        for attempt in range(1, self.max_retries + 2):
+            if attempt > 1:
+                self.metrics.observe_retry(endpoint)
+            self.metrics.observe_wait(self.limiter.wait())
+            start_time = perf_counter()
+            try:
+                response = self.sessions.get().get(url, params=params)
+            except Exception:
+                self.metrics.observe_request(
+                    endpoint, ERROR_STATUS, perf_counter() - start_time, 0
+                )
+                raise
+            self.metrics.observe_request(
+                endpoint,
+                response.status_code,
+                perf_counter() - start_time,
+                len(response.content),
+            )
+            with self._lock:
+                self.requests_count += 1
+            if response.status_code != 429:
+                response.raise_for_status()
+                self.limiter.on_success()
+                return response
+
+            pause = self.limiter.on_throttle(
+                parse_retry_after(response.headers.get("Retry-After"))
+            )
+            self.metrics.observe_throttle(pause)
+            print(f"HTTP 429 (attempt {attempt}), pausing requests for {pause:.1f}s")
+
+        raise TooManyRequestsError("HTTP 429, try again later")
 
     def _crawl_items_on_page(
         self,
@@ -97,35 +398,53 @@ class AmiAmiScraper:
         # Get items on given page
         url = f"{AMIAMI_API_ROOT}/items"
         print(f"> Crawling '{url}' with params={params}")
-        response = requests.get(
-            url,
-            params=params,
-            headers=self.headers,
-            impersonate=BROWSER,
-        )
-        print(f"Crawl request status: {response.status_code}")
-        response.raise_for_status()
-        data = response.json()
-        return AmiAmiItemsResponse(**data)
+        with self._stage("list_crawl"):
+            response = self._request(url, params)
+            print(f"Crawl request status: {response.status_code}")
+            with self._stage("validation"):
+                return AmiAmiItemsResponse.model_validate_json(response.content)
 
-    def _scrap_items(self, args: AmiAmiQueryArgs) -> List[AmiAmiItem]:
+    def prepare_sort_key(self, args: AmiAmiQueryArgs):
         """
-        Scrap all items according to query.
+        Set the default sorting option of a query, if not given.
 
         Args:
             args (AmiAmiQueryArgs): Request args.
-
-        Returns:
-            List[AmiAmiItem]: List of raw items obtained.
         """
-        # Prepare sorting option
         if args.sort_key is None:
             if ItemTypeEnum.PRE_OWNED in args.types and len(args.types) == 1:
                 args.sort_key = ItemSortingEnum.PREOWNED
             else:
                 args.sort_key = ItemSortingEnum.RECENT_UPDATE
 
+    def _scrap_items(
+        self,
+        args: AmiAmiQueryArgs,
+        known_fingerprints: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[AmiAmiItem], bool]:
+        """
+        Scrap all items according to query.
+
+        Args:
+            args (AmiAmiQueryArgs): Request args.
+            known_fingerprints (Optional[Dict[str, str]], optional): Fingerprints of the items
+                crawled previously, by gcode. If given, stop at the first page with only known
+                and unchanged items (only relevant for queries sorted by update).
+                Defaults to None.
+
+        Returns:
+            Tuple[List[AmiAmiItem], bool]: (items, stopped_early), where:
+                - items: List of raw items obtained
+                - stopped_early: True if the crawl stopped at a page without updated items,
+                    before the last page of the query
+        """
+        # Prepare sorting option
+        self.prepare_sort_key(args)
+
         # Crawl items in pages
+        if self.crawl_workers > 1 and known_fingerprints is None:
+            return self._scrap_pages_concurrently(args), False
+
         results: List[AmiAmiItem] = []
         page = 1
         while True:
@@ -139,8 +458,47 @@ class AmiAmiScraper:
             if args.num_pages and page >= args.num_pages:
                 break
 
+            # If the rest of the pages were not updated since last scraping
+            if known_fingerprints is not None and all(
+                known_fingerprints.get(item.gcode) == item.fingerprint()
+                for item in response.items
+            ):
+                print(f"> No updated items on page {page}, stopping crawl")
+                return results, True
+
             page += 1
-            sleep(self.crawl_sleep_time)
+
+        return results, False
+
+    def _scrap_pages_concurrently(self, args: AmiAmiQueryArgs) -> List[AmiAmiItem]:
+        """
+        Scrap all items according to query, crawling pages concurrently.
+        The first page gives the total number of results, from which the remaining pages are deduced.
+
+        Args:
+            args (AmiAmiQueryArgs): Request args (with sorting option set).
+
+        Returns:
+            List[AmiAmiItem]: List of raw items obtained, in pages order.
+        """
+        response = self._crawl_items_on_page(1, args)
+        if not response.api_success or not response.items:
+            return []
+        results: List[AmiAmiItem] = list(response.items)
+
+        last_page = ceil(response.search_result.total_results / int(ITEMS_PER_PAGE))
+        if args.num_pages:
+            last_page = min(last_page, args.num_pages)
+        print(f"> {response.search_result.total_results} results, crawling {last_page} pages")
+
+        # Executor.map yields responses in pages order, whatever the completion order
+        responses = self._crawl_executor.map(
+            lambda page: self._crawl_items_on_page(page, args),
+            range(2, last_page + 1),
+        )
+        for response in responses:
+            if response.api_success:
+                results.extend(response.items)
 
         return results
 
@@ -148,43 +506,57 @@ class AmiAmiScraper:
         self,
         code: str,
         code_type: AmiAmiCodeTypeLiteral,
-    ) -> AmiAmiItemResponse:
+        archive: Optional[DetailsArchive] = None,
+    ) -> AmiAmiItemResponseAny:
         """
         Crawl details page for the given item.
 
         Args:
             code (str): Item code.
             code_type (AmiAmiCodeTypeLiteral): Item code type.
+            archive (Optional[DetailsArchive], optional): Archive of the raw found items, if any.
+                Defaults to None.
 
         Returns:
-            AmiAmiItemResponse: Received data.
+            AmiAmiItemResponseAny: Received data (projected if `lite_details` is set).
         """
+        # Use cached response if any
+        cache_key = f"{code_type}={code}"
+        content = None
+        if self.details_cache is not None:
+            content = self.details_cache.get(cache_key)
+
+        if content is not None:
+            print(f"Scrap cache hit for '{cache_key}'")
+            with self._stage("validation"):
+                data = self.item_response_model.model_validate_json(content)
+            if archive is not None:
+                archive.add(code, code_type, content)
+            return data
+
         params = {code_type: code}
 
         # Crawl details page for given item
         url = f"{AMIAMI_API_ROOT}/item"
-        response = requests.get(
-            url,
-            params=params,
-            headers=self.headers,
-            impersonate=BROWSER,
-        )
-        response.raise_for_status()
+        response = self._request(url, params)
         print(f"Scrap request status: {response.status_code}")
-        data = response.json()
+        with self._stage("validation"):
+            data = self.item_response_model.model_validate_json(response.content)
 
-        sleep(self.scrap_sleep_time)
-        return AmiAmiItemResponse(**data)
+        # Only cache found items (raw bytes, so that both models can read them)
+        if self.details_cache is not None and data.api_success:
+            self.details_cache.set(cache_key, response.content)
+        if archive is not None and data.api_success:
+            archive.add(code, code_type, response.content)
+        return data
 
-    def _map_item_details_to_final(
-        self,
-        api_response: AmiAmiItemResponse,
-    ) -> AmiAmiItemOutput:
+    @staticmethod
+    def _map_item_details_to_final(api_response: AmiAmiItemResponseAny) -> AmiAmiItemOutput:
         """
         Map the detailed item into its final enriched format.
 
         Args:
-            api_response (AmiAmiItemResponse): API data.
+            api_response (AmiAmiItemResponseAny): API data.
 
         Returns:
             AmiAmiItemOutput: Final item.
@@ -215,7 +587,8 @@ class AmiAmiScraper:
         code: str,
         code_type: AmiAmiCodeTypeLiteral,
         check_alts: bool = True,
-    ) -> List[AmiAmiItemOutput]:
+        archive: Optional[DetailsArchive] = None,
+    ) -> Optional[List[AmiAmiItemOutput]]:
         """
         Scrap an item's details page and its related items.
 
@@ -225,41 +598,302 @@ class AmiAmiScraper:
             check_alts (bool, optional): If True, will scrap the items related to the current one.
                 Useful to get alternative pre-owned items.
                 Defaults to True.
+            archive (Optional[DetailsArchive], optional): Archive of the raw found items, if any.
+                Defaults to None.
 
         Returns:
-            List[AmiAmiItemOutput]: List of final items obtained.
+            Optional[List[AmiAmiItemOutput]]: List of final items obtained (without the items
+                already obtained in this run), or None if nothing could be scraped.
         """
         results: List[AmiAmiItemOutput] = []
 
         # Crawl details for given item
         try:
-            response = self._crawl_item_details(code, code_type)
+            response = self._crawl_item_details(code, code_type, archive)
+        except TooManyRequestsError as e:
+            if self.stop_on_429:
+                raise
+            print(e)
+            return None
         except Exception as e:
-            if "429" in str(e) and self.stop_on_429:
-                raise Exception("HTTP 429, try again later")
             print(e)
-            return results
+            return None
         if not response.api_success or not response.item:
             print(f"Error on '{code}', nothing found.")
-            return results
+            return None
+
+        # Map item to final format, unless already obtained as another item's alternative
+        # (alternatives are claimed by their caller)
+        scode = response.item.scode
+        if not check_alts or not scode or self.registry.claim(scode, "scode"):
+            with self._stage("mapping"):
+                results.append(self._map_item_details_to_final(response))
+        else:
+            print("> Item already obtained in this run, only keeping its new alternatives...")
 
-        # Map item to final format
-        results.append(self._map_item_details_to_final(response))
         if check_alts:
             # Crawl related items pages
             print("Checking related items...")
             for other_item in response.embedded_data.other_items:
+                # Alternatives are often shared by several items, only get them once per run
+                if not self.registry.claim(other_item.scode, "scode"):
+                    continue
                 # Check_alts to false to avoid getting items twice (and entering an infinite loop)
-                results.extend(
-                    self._scrap_item(other_item.scode, "scode", check_alts=False)
+                alt_items = self._scrap_item(
+                    other_item.scode, "scode", check_alts=False, archive=archive
                 )
+                if alt_items is None:
+                    self.registry.release(other_item.scode, "scode")
+                else:
+                    results.extend(alt_items)
 
         return results
 
+    def _reuse_enriched_items(self, item: AmiAmiItem) -> Optional[List[AmiAmiItemOutput]]:
+        """
+        Get the items previously enriched from an identical listing item, if any.
+        Their scodes are claimed in the registry as if they were scraped again.
+
+        Args:
+            item (AmiAmiItem): Raw item.
+
+        Returns:
+            Optional[List[AmiAmiItemOutput]]: Final items (the item, then its alternatives),
+                without the items already obtained in this run, or None if they must be scraped.
+        """
+        if self.records is None:
+            return None
+        records = self.records.get(item.gcode, item.fingerprint())
+        if not records:
+            return None
+
+        mapped_items = [AmiAmiItemOutput(**record) for record in records]
+        return [
+            mapped_item
+            for mapped_item in mapped_items
+            if not mapped_item.scode or self.registry.claim(mapped_item.scode, "scode")
+        ]
+
+    def _enrich_item(
+        self,
+        timestamp: str,
+        index: int,
+        total: int,
+        item: AmiAmiItem,
+    ) -> Tuple[List[AmiAmiItemOutput], bool]:
+        """
+        Enrich a single raw item, scraping its details if needed.
+
+        Args:
+            timestamp (str): Date used in the file to enrich.
+            index (int): Item index in the raw data.
+            total (int): Number of raw items.
+            item (AmiAmiItem): Raw item.
+
+        Returns:
+            Tuple[List[AmiAmiItemOutput], bool]: (mapped_items, failed), where:
+                - mapped_items: Final items obtained
+                - failed: True if details were wanted but nothing could be scraped
+        """
+        print(
+            f"({index + 1}/{total}) On item {item.gcode}",
+            f"https://www.amiami.com/eng/detail/?gcode={item.gcode}",
+        )
+        # Scrap details for pre-owned or if requested
+        if not self.wants_details(item):
+            print("> Skipping details scraping...")
+            with self._stage("mapping"):
+                return [item.minify()], False
+
+        # Same item already obtained from another query or index of the run
+        if not self.registry.claim(item.gcode, "gcode"):
+            print("> Details already scraped in this run, skipping...")
+            return [], False
+
+        mapped_items = self._reuse_enriched_items(item)
+        failed = False
+        if mapped_items is not None:
+            print("> Listing unchanged since last enriching, reusing item details...")
+        else:
+            print("> Scraping item details...")
+            mapped_items = self._scrap_item(
+                item.gcode, "gcode", archive=self._archives.get(timestamp)
+            )
+            failed = mapped_items is None
+            if mapped_items is None:
+                print("No items found, mapping from original data...")
+                with self._stage("mapping"):
+                    mapped_items = [item.minify()]
+            elif mapped_items and self.records is not None:
+                self.records.put(
+                    item.gcode,
+                    item.fingerprint(),
+                    timestamp,
+                    [mapped_item.model_dump(mode="json") for mapped_item in mapped_items],
+                )
+
+        # Using date from general scraping as it is more precise
+        for mapped_item in mapped_items:
+            mapped_item.release_date = item.releasedate
+        return mapped_items, failed
+
+    def _iter_enriched_items(
+        self,
+        timestamp: str,
+        items: Iterator[AmiAmiItem],
+        start_index: int,
+        total: int,
+    ) -> Iterator[Tuple[int, AmiAmiItem, List[AmiAmiItemOutput], bool]]:
+        """
+        Enrich raw items from a given index, keeping up to `enrich_workers` items in flight.
+        Raw items are only consumed as the window moves, and results are always yielded
+        in the original index order.
+        Codes claimed in the registry while enriching an index are owned by (timestamp, index).
+
+        Args:
+            timestamp (str): Date used in the file to enrich.
+            items (Iterator[AmiAmiItem]): Raw items, from the start index.
+            start_index (int): Index of the first item to enrich.
+            total (int): Number of raw items.
+
+        Yields:
+            Iterator[Tuple[int, AmiAmiItem, List[AmiAmiItemOutput], bool]]:
+                (index, item, mapped_items, failed).
+        """
+
+        def enrich(index: int, item: AmiAmiItem) -> Tuple[List[AmiAmiItemOutput], bool]:
+            with self.registry.owner(timestamp, index):
+                return self._enrich_item(timestamp, index, total, item)
+
+        indexed_items = enumerate(items, start_index)
+        if self.enrich_workers == 1:
+            for index, item in indexed_items:
+                yield (index, item, *enrich(index, item))
+            return
+
+        # Sliding window of futures, consumed in submission order
+        pending: Deque[Tuple[int, AmiAmiItem, Future]] = deque()
+        try:
+            while True:
+                for index, item in islice(indexed_items, 2 * self.enrich_workers - len(pending)):
+                    future = self._enrich_executor.submit(enrich, index, item)
+                    pending.append((index, item, future))
+                if not pending:
+                    return
+                index, item, future = pending.popleft()
+                yield (index, item, *future.result())
+        finally:
+            # Executor is shared by the scraper, only stop the items of this window
+            for _, _, future in pending:
+                future.cancel()
+            wait([future for _, _, future in pending])
+
+    def wants_details(self, item: AmiAmiItem) -> bool:
+        """
+        Tell whether the details of a raw item are scraped when enriching it.
+
+        Args:
+            item (AmiAmiItem): Raw item.
+
+        Returns:
+            bool: True for pre-owned items, or for all items if `always_scrap_details` is set.
+        """
+        return item.is_preowned or self.always_scrap_details
+
+    def open_raw_items(
+        self,
+        timestamp: str,
+        filename: str,
+        start: int = 0,
+    ) -> Tuple[int, Iterator[AmiAmiItem]]:
+        """
+        Open the raw items of a scraping, from the storage if it holds them, or else from the data dump.
+        Items are read and validated lazily, as they are consumed.
+
+        Args:
+            timestamp (str): Date used in the data dump.
+            filename (str): Data dump filename.
+            start (int, optional): Index of the first item to read. Defaults to 0.
+
+        Raises:
+            FileNotFoundError: If the raw items are nowhere to be found.
+
+        Returns:
+            Tuple[int, Iterator[AmiAmiItem]]: (items_length, items), where:
+                - items_length: Number of raw items of the scraping
+                - items: Iterator over the raw items, from the start index
+        """
+        if self.storage is not None and self.storage.get_run(timestamp) is not None:
+            return self.storage.count_raw_items(timestamp), (
+                AmiAmiItem(**data) for data in self.storage.iter_raw_items(timestamp, start)
+            )
+
+        return open_raw_dump(join(OUTPUT_DIR, filename), start)
+
+    def _new_timestamp(self) -> str:
+        """
+        Get a timestamp for a new scraping, unique for the scraper even when
+        several queries end within the same second.
+
+        Returns:
+            str: Stringified current date, with a suffix if it was already used.
+        """
+        with self._lock:
+            timestamp = base_timestamp = get_current_date()
+            suffix = 1
+            while timestamp in self._timestamps:
+                timestamp = f"{base_timestamp}_{suffix}"
+                suffix += 1
+            self._timestamps.add(timestamp)
+            return timestamp
+
+    def _get_query_state_path(self, args: AmiAmiQueryArgs) -> str:
+        """
+        Get the path of the incremental scraping state of a query.
+
+        Args:
+            args (AmiAmiQueryArgs): Request args.
+
+        Returns:
+            str: State filepath.
+        """
+        query_hash = sha1(args.stringify().encode()).hexdigest()[:16]
+        return join(STATE_DIR, f"query-{query_hash}.json")
+
+    def _load_query_state(
+        self,
+        args: AmiAmiQueryArgs,
+    ) -> Optional[Tuple[AmiAmiQueryState, Iterator[AmiAmiItem]]]:
+        """
+        Load the incremental scraping state of a query, with its last data dump.
+
+        Args:
+            args (AmiAmiQueryArgs): Request args.
+
+        Returns:
+            Optional[Tuple[AmiAmiQueryState, Iterator[AmiAmiItem]]]: (state, snapshot_items),
+                or None if the query was never scraped (or its last data dump was removed).
+        """
+        state_path = self._get_query_state_path(args)
+        if not exists(state_path):
+            return None
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = AmiAmiQueryState(**json_load(f))
+
+        snapshot_timestamp = state.snapshot_filename.split("-", 1)[0]
+        try:
+            _, snapshot_items = self.open_raw_items(
+                snapshot_timestamp, state.snapshot_filename
+            )
+        except FileNotFoundError:
+            return None
+        return state, snapshot_items
+
     def run_scraping(self, args: AmiAmiQueryArgs) -> Tuple[str, str]:
         """
         Main scraping method.
         Get all data from multiple pages according to a query.
+        In incremental mode, only updated pages are crawled and merged into the previous data dump.
 
         Args:
             args (AmiAmiQueryArgs): Request args.
@@ -270,21 +904,65 @@ class AmiAmiScraper:
                 - filename: Full filename where the items were dumped
         """
         print("Run scraping...")
-        results = self._scrap_items(args)
+        self.prepare_sort_key(args)
+        previous = None
+        if self.incremental_crawl and args.sort_key in (
+            ItemSortingEnum.RECENT_UPDATE,
+            ItemSortingEnum.PREOWNED,
+        ):
+            previous = self._load_query_state(args)
+
+        if previous is None:
+            results, _ = self._scrap_items(args)
+        else:
+            state, snapshot_items = previous
+            print(f"> Incremental scraping from '{state.snapshot_filename}'")
+            results, stopped_early = self._scrap_items(args, known_fingerprints=state.fingerprints)
+
+            # A crawl reaching the last page replaces the previous data, evicting the items
+            # no longer listed
+            if stopped_early:
+                # Updated items first (as sorted by the API), then the untouched ones
+                updated_gcodes = {item.gcode for item in results}
+                print(f"> {len(results)} items crawled, merging with previous data...")
+                untouched_items = (
+                    item for item in snapshot_items if item.gcode not in updated_gcodes
+                )
+                # Items pushed out of the wanted pages by the updated ones are dropped
+                if args.num_pages:
+                    max_items = args.num_pages * int(ITEMS_PER_PAGE)
+                    untouched_items = islice(untouched_items, max(0, max_items - len(results)))
+                results.extend(untouched_items)
 
         print(f"Saving {len(results)} items...")
-        timestamp = get_current_date()
-        filename = f"{timestamp}-{args.stringify()}.json"
-        with open(join(OUTPUT_DIR, filename), "w", encoding="utf-8") as f:
-            save_model_to_json(
-                f,
-                AmiAmiItemsDump(items_length=len(results), items=results),
-            )
+        timestamp = self._new_timestamp()
+        filename = f"{timestamp}-{args.stringify()}{RAW_DUMP_EXTENSION}"
+        with self._stage("raw_dump"):
+            if self.storage is not None:
+                self.storage.save_raw_items(timestamp, filename, args.stringify(), results)
+            else:
+                write_raw_dump(
+                    join(OUTPUT_DIR, filename),
+                    len(results),
+                    (item.model_dump_json() for item in results),
+                )
+
+        if self.incremental_crawl:
+            with open(self._get_query_state_path(args), "w", encoding="utf-8") as f:
+                save_model_to_json(
+                    f,
+                    AmiAmiQueryState(
+                        query=args.stringify(),
+                        snapshot_filename=filename,
+                        fingerprints={item.gcode: item.fingerprint() for item in results},
+                    ),
+                )
 
         print(f"Data saved to '{filename}'")
+        self._export_metrics(f"{timestamp}-scraping")
         return timestamp, filename
 
-    def run_enrich(self, timestamp: str, filename: str):
+    def run_enrich(self, timestamp: str, filename: str) -> Tuple[int, int]:
         """
         Main enriching method.
         Format raw items to final format.
@@ -293,78 +971,128 @@ class AmiAmiScraper:
         Args:
             timestamp (str): Date used in the file to enrich.
             filename (str): Filename where raw data is located.
+
+        Returns:
+            Tuple[int, int]: (enriched_count, mapped_count), where:
+                - enriched_count: Number of raw items enriched by this call
+                - mapped_count: Number of final items they gave
         """
         print("Run enrich...")
-        # Open raw data file
-        filepath = join(OUTPUT_DIR, filename)
-        with open(filepath, "r", encoding="utf-8") as f:
-            base_data_parsed = AmiAmiItemsDump(**json_load(f))
-        amiami_items = base_data_parsed.items
-
-        # Open output file, if any, and retrieve checkpoint variables
+        # Open checkpoint, if any, and retrieve last enriched index
         new_filename = f"{timestamp}-mapped_items.json"
-        new_filepath = join(WEB_DATA_DIR, new_filename)
-        try:
-            with open(new_filepath, "r", encoding="utf-8") as f:
-                result_data_parsed = AmiAmiItemOutputDump(**json_load(f))
-            start_index = result_data_parsed.current_index
-            result_mapped: List[AmiAmiItemOutput] = result_data_parsed.items
-        except FileNotFoundError:
-            start_index = -1
-            result_mapped: List[AmiAmiItemOutput] = []
+        if self.storage is not None and self.storage.get_run(timestamp) is not None:
+            checkpoint = self.storage.checkpoint(
+                timestamp,
+                every_items=self.checkpoint_every_items,
+                every_seconds=self.checkpoint_every_seconds,
+            )
         else:
-            print("> Data retrieved from file")
+            checkpoint = JournalCheckpoint(
+                journal_path=join(OUTPUT_DIR, f"{timestamp}-mapped_items.journal.jsonl"),
+                output_path=join(WEB_DATA_DIR, new_filename),
+                every_items=self.checkpoint_every_items,
+                every_seconds=self.checkpoint_every_seconds,
+            )
+        start_index = checkpoint.load()
+        if start_index >= 0:
+            print("> Data retrieved from checkpoint")
+        saved_requests = self.registry.saved_requests
+        if self.archive_details:
+            archive_path = join(OUTPUT_DIR, f"{timestamp}{DETAILS_ARCHIVE_SUFFIX}")
+            with self._lock:
+                self._archives[timestamp] = DetailsArchive(archive_path)
 
-        # Loop over items to scrap their details pages (start at next item from checkpoint)
-        for index in range(start_index + 1, len(amiami_items)):
-            item = amiami_items[index]
+        # Open raw data lazily, from the next item of the checkpoint
+        try:
+            total, raw_items = self.open_raw_items(timestamp, filename, start_index + 1)
+        except BaseException:
+            checkpoint.close()
+            raise
 
-            print(
-                f"({index + 1}/{len(amiami_items)}) On item {item.gcode}",
-                f"https://www.amiami.com/eng/detail/?gcode={item.gcode}",
-            )
-            # Scrap details for pre-owned or if requested
-            if item.is_preowned or self.always_scrap_details:
-                print("> Scraping item details...")
-                mapped_items = self._scrap_item(item.gcode, "gcode")
-
-                if not mapped_items:
-                    print("No items found, mapping from original data...")
-                    mapped_items.append(item.minify())
+        # Loop over items to scrap their details pages
+        enriched_items = self._iter_enriched_items(
+            timestamp, raw_items, start_index + 1, total
+        )
+        enriched_count = mapped_count = 0
+        try:
+            for index, item, mapped_items, failed in enriched_items:
+                if failed:
                     with open(join(OUTPUT_DIR, "_errors.txt"), "a") as f:
                         f.write(
                             f"> {get_current_date()} - On file {timestamp}: "
                             + f"Error at index {index} / gcode {item.gcode}\n",
                         )
 
-                # Using date from general scraping as it is more precise
-                for mapped_item in mapped_items:
-                    mapped_item.release_date = item.releasedate
-                result_mapped.extend(mapped_items)
+                print("Saving items...\n")
+                with self._stage("checkpoint_record"):
+                    checkpoint.record(
+                        index, [mapped_item.model_dump(mode="json") for mapped_item in mapped_items]
+                    )
+                self.registry.commit(timestamp, index)
+                enriched_count += 1
+                mapped_count += len(mapped_items)
+        except BaseException:
+            # Items in flight were not saved, their codes must be requested again on resume
+            enriched_items.close()
+            self.registry.rollback(timestamp)
+            raise
+        finally:
+            checkpoint.close()
+            if self.archive_details:
+                with self._lock:
+                    self._archives.pop(timestamp).close()
 
-            else:
-                print("> Skipping details scraping...")
-                result_mapped.append(item.minify())
-
-            print("Saving items...\n")
+        print(f"Writing '{new_filename}'...")
+        with self._stage("checkpoint_finalize"):
+            checkpoint.finalize()
+        if self.details_cache is not None:
+            print(f"Details cache: {self.details_cache.stats()}")
+        if self.records is not None:
+            print(f"Incremental enriching: {self.records.stats()} (since scraper start)")
+        print(
+            "Deduplication:",
+            f"{self.registry.saved_requests - saved_requests} details requests saved",
+            f"({self.registry.saved_requests} since scraper start)",
+        )
 
-            with open(new_filepath, "w", encoding="utf-8") as f:
-                save_model_to_json(
-                    f,
-                    AmiAmiItemOutputDump(
-                        current_index=index,
-                        items_length=len(result_mapped),
-                        items=result_mapped,
-                    ),
+        listed_filename = new_filename
+        if self.image_mirror is not None:
+            print("Mirroring images...")
+            with self._stage("image_mirror"):
+                mirrored_count = mirror_data_file_images(
+                    self.image_mirror, join(WEB_DATA_DIR, new_filename)
                 )
+            print(f"{mirrored_count} items linked to local images ({self.image_mirror.stats()})")
+        if self.compact_export or self.ndjson_export:
+            with open(join(WEB_DATA_DIR, new_filename), "r", encoding="utf-8") as f:
+                data = json_load(f)
+        if self.compact_export:
+            print("Writing compact export...")
+            with self._stage("compact_export"):
+                listed_filename = write_compact_export(
+                    WEB_DATA_DIR,
+                    f"{timestamp}-mapped_items",
+                    {"current_index": data["current_index"]},
+                    data["items"],
+                    self.export_shard_size,
+                )
+        if self.ndjson_export:
+            print("Writing NDJSON export...")
+            listed_filename = f"{timestamp}-mapped_items.ndjson"
+            with self._stage("ndjson_export"):
+                write_ndjson_export(join(WEB_DATA_DIR, listed_filename), data["items"])
 
         # Save final filepath (if not there yet)
-        if exists(DATA_LIST_FILE):
-            with open(DATA_LIST_FILE, "r") as f:
-                existing_files = set(f.read().splitlines())
-        else:
-            existing_files = set()
+        with self._lock, self._stage("data_list"):
+            add_to_data_list(DATA_LIST_FILE, listed_filename)
+
+            if self.search_index:
+                print("Building search index...")
+                with self._stage("search_index"):
+                    items_length = write_search_index(
+                        WEB_DATA_DIR, DATA_LIST_FILE, SEARCH_INDEX_FILE
+                    )
+                print(f"Search index built over {items_length} items")
 
-        with open(DATA_LIST_FILE, "a") as f:
-            if new_filename not in existing_files:
-                f.write(new_filename + "\n")
+        self._export_metrics(f"{timestamp}-enrich")
+        return enriched_count, mapped_count
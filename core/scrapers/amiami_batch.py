@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import List, Optional
+
+from models.amiami.utils import AmiAmiQueryArgs, AmiAmiQueryReport
+from scrapers.amiami import AmiAmiScraper
+
+
+class AmiAmiBatchScheduler:
+    """
+    Run a batch of queries concurrently on a single scraper, so that they share its request
+    budget (rate limiter and HTTP sessions) and its registry of already requested item codes.
+
+    All queries are crawled first, then enriched. Between both phases, each gcode is reserved
+    for the first query (in batch order) containing it, so that every query outputs the same
+    files as when the batch is run sequentially.
+    """
+
+    def __init__(
+        self,
+        scraper: AmiAmiScraper,
+        max_concurrent_queries: Optional[int] = None,
+    ):
+        """
+        Args:
+            scraper (AmiAmiScraper): Scraper shared by all queries.
+            max_concurrent_queries (Optional[int], optional): Maximum number of queries run at the same time.
+                Defaults to None (all queries of the batch).
+        """
+        self.scraper = scraper
+        self.max_concurrent_queries = max_concurrent_queries
+
+    def _scrap(self, args: AmiAmiQueryArgs, report: AmiAmiQueryReport):
+        """
+        Crawl a query, filling its report.
+
+        Args:
+            args (AmiAmiQueryArgs): Request args.
+            report (AmiAmiQueryReport): Query report.
+        """
+        start = monotonic()
+        try:
+            report.timestamp, report.filename = self.scraper.run_scraping(args)
+        except Exception as e:
+            report.error = repr(e)
+            raise
+        finally:
+            report.crawl_time = monotonic() - start
+
+    def _enrich(self, report: AmiAmiQueryReport):
+        """
+        Enrich a crawled query, filling its report.
+
+        Args:
+            report (AmiAmiQueryReport): Query report.
+        """
+        start = monotonic()
+        try:
+            report.enriched_items, report.mapped_items = self.scraper.run_enrich(
+                report.timestamp, report.filename
+            )
+        except Exception as e:
+            report.error = repr(e)
+            raise
+        finally:
+            report.enrich_time = monotonic() - start
+
+    def _reserve_gcodes(self, reports: List[AmiAmiQueryReport]):
+        """
+        Reserve the gcodes whose details the crawled queries will scrap, in batch order.
+
+        Args:
+            reports (List[AmiAmiQueryReport]): Queries reports.
+        """
+        for report in reports:
+            if report.error is None:
+                _, items = self.scraper.open_raw_items(report.timestamp, report.filename)
+                self.scraper.registry.reserve(
+                    (item.gcode for item in items if self.scraper.wants_details(item)),
+                    "gcode",
+                    report.timestamp,
+                )
+
+    def print_report(
+        self,
+        reports: List[AmiAmiQueryReport],
+        elapsed: float,
+        requests: int,
+        saved_requests: int,
+    ):
+        """
+        Print the per-query and total throughput of a batch.
+
+        Args:
+            reports (List[AmiAmiQueryReport]): Queries reports.
+            elapsed (float): Batch wall time, in seconds.
+            requests (int): Number of HTTP requests of the batch.
+            saved_requests (int): Number of details requests saved by deduplication in the batch.
+        """
+        print("Batch report:")
+        for report in reports:
+            enrich_rate = report.enriched_items / report.enrich_time if report.enrich_time else 0
+            print(
+                f"> {report.query}: {report.enriched_items} items enriched",
+                f"into {report.mapped_items} final items",
+                f"(crawl {report.crawl_time:.1f}s, enrich {report.enrich_time:.1f}s,",
+                f"{enrich_rate:.2f} items/s)",
+                f"- ERROR {report.error}" if report.error is not None else "",
+            )
+        enriched_items = sum(report.enriched_items for report in reports)
+        print(
+            f"> Total: {len(reports)} queries, {enriched_items} items enriched",
+            f"in {elapsed:.1f}s ({enriched_items / elapsed if elapsed else 0:.2f} items/s),",
+            f"{requests} requests ({requests / elapsed if elapsed else 0:.2f} requests/s),",
+            f"{saved_requests} details requests saved by deduplication",
+        )
+
+    def run(self, batch_args: List[AmiAmiQueryArgs]) -> List[AmiAmiQueryReport]:
+        """
+        Crawl then enrich all queries of a batch concurrently.
+        A failing query does not stop the others, its error is raised once the batch is done.
+
+        Args:
+            batch_args (List[AmiAmiQueryArgs]): Request args of each query.
+
+        Returns:
+            List[AmiAmiQueryReport]: Reports of each query, in batch order.
+        """
+        # Reports show the queries as run, with their default sorting option
+        for args in batch_args:
+            self.scraper.prepare_sort_key(args)
+        reports = [AmiAmiQueryReport(query=args.stringify()) for args in batch_args]
+        if not reports:
+            return reports
+
+        start = monotonic()
+        requests_start = self.scraper.requests_count
+        saved_requests_start = self.scraper.registry.saved_requests
+        errors: List[Exception] = []
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrent_queries or len(reports)
+        ) as executor:
+            futures = [
+                executor.submit(self._scrap, args, report)
+                for args, report in zip(batch_args, reports)
+            ]
+            errors.extend(e for e in (future.exception() for future in futures) if e)
+
+            self._reserve_gcodes(reports)
+            try:
+                futures = [
+                    executor.submit(self._enrich, report)
+                    for report in reports
+                    if report.error is None
+                ]
+                errors.extend(e for e in (future.exception() for future in futures) if e)
+            finally:
+                self.scraper.registry.clear_reservations()
+
+        self.print_report(
+            reports,
+            monotonic() - start,
+            self.scraper.requests_count - requests_start,
+            self.scraper.registry.saved_requests - saved_requests_start,
+        )
+        if errors:
+            raise errors[0]
+        return reports
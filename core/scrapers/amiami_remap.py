@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from json import load as json_load
+from os.path import join
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import OUTPUT_DIR, WEB_DATA_DIR
+from models.amiami.index import AmiAmiItem, AmiAmiItemResponse
+from pydantic import ValidationError
+from scrapers.amiami import AmiAmiScraper
+from utils.archive_util import DETAILS_ARCHIVE_SUFFIX, iter_details_archive
+from utils.checkpoint_util import write_items_json
+
+# Responses sent to each worker process at once
+BATCH_SIZE = 256
+
+
+def _remap_batch(contents: List[bytes]) -> List[Dict[str, Any]]:
+    """
+    Map raw details responses to final items (run in worker processes).
+
+    Args:
+        contents (List[bytes]): Raw details responses.
+
+    Returns:
+        List[Dict[str, Any]]: Final items, as JSON-compatible dicts.
+    """
+    results: List[Dict[str, Any]] = []
+    for content in contents:
+        try:
+            response = AmiAmiItemResponse.model_validate_json(content)
+        except ValidationError as e:
+            print(e)
+            continue
+        if response.api_success and response.item:
+            final_item = AmiAmiScraper._map_item_details_to_final(response)
+            results.append(final_item.model_dump(mode="json"))
+    return results
+
+
+def _iter_batches(archive_path: str) -> Iterator[List[bytes]]:
+    contents = (content for _, content in iter_details_archive(archive_path))
+    while True:
+        batch = list(islice(contents, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+def remap_run(
+    timestamp: str,
+    raw_items: Iterable[AmiAmiItem],
+    workers: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Rebuild the enriched data file of a run from its archived details responses
+    (see the `archive_details` argument of AmiAmiScraper), without any request.
+    Items keep their order, their mirrored image and the release date taken from the listing.
+    Items enriched without details are mapped again from the raw listing items, and items whose
+    response was not archived (e.g. reused by an incremental enriching) are kept as they are.
+
+    Args:
+        timestamp (str): Run timestamp.
+        raw_items (Iterable[AmiAmiItem]): Raw items of the run.
+        workers (Optional[int], optional): Number of worker processes mapping the responses.
+            Defaults to None (number of CPUs).
+
+    Raises:
+        FileNotFoundError: If the run has no enriched data file or no archive.
+
+    Returns:
+        Tuple[int, int]: (remapped_count, items_count), where:
+            - remapped_count: Number of items mapped again from their details
+            - items_count: Number of items in the data file
+    """
+    archive_path = join(OUTPUT_DIR, f"{timestamp}{DETAILS_ARCHIVE_SUFFIX}")
+    output_path = join(WEB_DATA_DIR, f"{timestamp}-mapped_items.json")
+    with open(output_path, "r", encoding="utf-8") as f:
+        data = json_load(f)
+    mapped_items: List[Dict[str, Any]] = data.pop("items")
+
+    # Parsing, validation and mapping are CPU-bound, spread them over processes
+    remapped_items: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in executor.map(_remap_batch, _iter_batches(archive_path)):
+            # Later responses (e.g. of a resumed enriching) replace older ones
+            remapped_items.update((item["scode"], item) for item in batch)
+
+    raw_items_by_gcode = {item.gcode: item for item in raw_items}
+    remapped_count = 0
+    for index, item in enumerate(mapped_items):
+        scode = item.get("scode")
+        if scode and scode in remapped_items:
+            # Using date from general scraping as it is more precise
+            new_item = {**remapped_items[scode], "release_date": item["release_date"]}
+            remapped_count += 1
+        elif not scode and item["gcode"] in raw_items_by_gcode:
+            new_item = raw_items_by_gcode[item["gcode"]].minify().model_dump(mode="json")
+        else:
+            continue
+        # Images mirrored locally (see `mirror_images`) are kept
+        if not item["image_url"].startswith(("http://", "https://")):
+            new_item["image_url"] = item["image_url"]
+        mapped_items[index] = new_item
+
+    write_items_json(output_path, data, mapped_items)
+    return remapped_count, len(mapped_items)
@@ -0,0 +1,71 @@
+from itertools import islice
+from json import dumps as json_dumps
+from json import loads as json_loads
+from os import replace
+from typing import IO, Iterable, Iterator, Tuple
+
+from models.amiami.index import AmiAmiItem
+from models.amiami.utils import AmiAmiItemsDump
+
+RAW_DUMP_EXTENSION = ".ndjson"
+
+# Raw data dumps written before the NDJSON layout are still read
+RAW_DUMP_EXTENSIONS = (RAW_DUMP_EXTENSION, ".json")
+
+
+def write_raw_dump(path: str, items_length: int, lines: Iterable[str]):
+    """
+    Write a raw data dump as NDJSON, atomically: a header line (`{"items_length": N}`),
+    then one minified JSON item per line.
+
+    Args:
+        path (str): Filepath.
+        items_length (int): Number of items.
+        lines (Iterable[str]): Items, as minified JSON (e.g. `AmiAmiItem.model_dump_json()`).
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json_dumps({"items_length": items_length}) + "\n")
+        for line in lines:
+            f.write(line + "\n")
+    replace(tmp_path, path)
+
+
+def _iter_lines(f: IO[bytes], start: int) -> Iterator[AmiAmiItem]:
+    with f:
+        # Skipped items are not validated
+        for line in islice(f, start, None):
+            if line.strip():
+                yield AmiAmiItem.model_validate_json(line)
+
+
+def open_raw_dump(path: str, start: int = 0) -> Tuple[int, Iterator[AmiAmiItem]]:
+    """
+    Open a raw data dump, reading its items lazily: each item is only validated when consumed,
+    so memory usage does not depend on the dump size.
+    Legacy JSON dumps (`.json`) are fully loaded.
+
+    Args:
+        path (str): Filepath.
+        start (int, optional): Index of the first item to read. Defaults to 0.
+
+    Raises:
+        FileNotFoundError: If the dump does not exist (raised by the call, not by the iteration).
+
+    Returns:
+        Tuple[int, Iterator[AmiAmiItem]]: (items_length, items), where:
+            - items_length: Number of items in the whole dump
+            - items: Iterator over the items, from the start index
+    """
+    if not path.endswith(RAW_DUMP_EXTENSION):
+        with open(path, "r", encoding="utf-8") as f:
+            items = AmiAmiItemsDump.model_validate_json(f.read()).items
+        return len(items), iter(items[start:])
+
+    f = open(path, "rb")
+    try:
+        header = json_loads(f.readline())
+    except BaseException:
+        f.close()
+        raise
+    return header["items_length"], _iter_lines(f, start)
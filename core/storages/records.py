@@ -0,0 +1,100 @@
+from json import dumps as json_dumps
+from json import loads as json_loads
+from sqlite3 import connect
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    gcode TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    items TEXT NOT NULL
+);
+"""
+
+
+class EnrichedRecordStore:
+    """
+    SQLite store of the latest mapped items enriched for each gcode (the item and its alternatives),
+    with the fingerprint of the listing item they were enriched from.
+    Used by the incremental enriching to reuse the items whose listing did not change.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the SQLite file.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._db = connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        # Losing the last records on a crash only costs a few details requests
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def get(self, gcode: str, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the latest mapped items of a gcode, if enriched from an identical listing item.
+
+        Args:
+            gcode (str): Item gcode.
+            fingerprint (str): Fingerprint of the current listing item.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Mapped items, as JSON-compatible dicts,
+                or None if the gcode is unknown or its listing changed.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT items FROM records WHERE gcode = ? AND fingerprint = ?",
+                (gcode, fingerprint),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json_loads(row[0])
+
+    def put(
+        self,
+        gcode: str,
+        fingerprint: str,
+        timestamp: str,
+        items: List[Dict[str, Any]],
+    ):
+        """
+        Save the mapped items enriched for a gcode, replacing the previous ones.
+
+        Args:
+            gcode (str): Item gcode.
+            fingerprint (str): Fingerprint of the listing item.
+            timestamp (str): Timestamp of the run enriching it.
+            items (List[Dict[str, Any]]): Mapped items, as JSON-compatible dicts.
+        """
+        data = json_dumps(items, ensure_ascii=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+                (gcode, fingerprint, timestamp, data),
+            )
+
+    def stats(self) -> str:
+        """
+        Summarize the lookups counters.
+
+        Returns:
+            str: Counters summary.
+        """
+        with self._lock:
+            return f"{self.hits} items reused, {self.misses} new or updated items"
+
+    def close(self):
+        """
+        Close the database.
+        """
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,447 @@
+from json import dumps as json_dumps
+from json import loads as json_loads
+from os.path import join
+from sqlite3 import connect
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import OUTPUT_DIR, WEB_DATA_DIR
+from models.amiami.index import AmiAmiItem
+from storages.dump import RAW_DUMP_EXTENSION, write_raw_dump
+from utils.checkpoint_util import write_items_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    timestamp TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    query TEXT NOT NULL,
+    items_length INTEGER NOT NULL,
+    current_index INTEGER NOT NULL DEFAULT -1
+);
+CREATE TABLE IF NOT EXISTS raw_items (
+    timestamp TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    gcode TEXT NOT NULL,
+    jancode TEXT,
+    maker_name TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (timestamp, position)
+);
+CREATE INDEX IF NOT EXISTS raw_items_gcode ON raw_items (gcode);
+CREATE INDEX IF NOT EXISTS raw_items_jancode ON raw_items (jancode);
+CREATE INDEX IF NOT EXISTS raw_items_maker_name ON raw_items (maker_name);
+CREATE TABLE IF NOT EXISTS mapped_items (
+    timestamp TEXT NOT NULL,
+    item_index INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    gcode TEXT NOT NULL,
+    scode TEXT NOT NULL,
+    jancode TEXT,
+    maker_name TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (timestamp, item_index, position)
+);
+CREATE INDEX IF NOT EXISTS mapped_items_gcode ON mapped_items (gcode);
+CREATE INDEX IF NOT EXISTS mapped_items_scode ON mapped_items (scode);
+CREATE INDEX IF NOT EXISTS mapped_items_jancode ON mapped_items (jancode);
+CREATE INDEX IF NOT EXISTS mapped_items_maker_name ON mapped_items (maker_name);
+"""
+
+
+class SqliteStorage:
+    """
+    SQLite storage of the raw (crawled) and mapped (enriched) items of each run.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the SQLite file.
+        """
+        self.path = path
+        self._lock = Lock()
+        self._db = connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+
+    def save_raw_items(
+        self,
+        timestamp: str,
+        filename: str,
+        query: str,
+        items: List[AmiAmiItem],
+    ):
+        """
+        Upsert the raw items of a run, in a single transaction.
+
+        Args:
+            timestamp (str): Run timestamp.
+            filename (str): Raw data dump filename.
+            query (str): Stringified query args.
+            items (List[AmiAmiItem]): Raw items.
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO runs (timestamp, filename, query, items_length) VALUES (?, ?, ?, ?) "
+                + "ON CONFLICT (timestamp) DO UPDATE SET "
+                + "filename = excluded.filename, query = excluded.query, "
+                + "items_length = excluded.items_length",
+                (timestamp, filename, query, len(items)),
+            )
+            self._db.execute("DELETE FROM raw_items WHERE timestamp = ?", (timestamp,))
+            self._db.executemany(
+                "INSERT INTO raw_items VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        timestamp,
+                        position,
+                        item.gcode,
+                        item.jancode,
+                        item.maker_name,
+                        item.model_dump_json(),
+                    )
+                    for position, item in enumerate(items)
+                ),
+            )
+
+    def get_run(self, timestamp: str) -> Optional[Tuple[str, int]]:
+        """
+        Get a run information.
+
+        Args:
+            timestamp (str): Run timestamp.
+
+        Returns:
+            Optional[Tuple[str, int]]: (filename, current_index), or None if the run is unknown.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT filename, current_index FROM runs WHERE timestamp = ?",
+                (timestamp,),
+            ).fetchone()
+
+    def get_interrupted_runs(self) -> List[str]:
+        """
+        Get the runs whose enriching was started but not completed.
+
+        Returns:
+            List[str]: Runs timestamps, oldest first.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT timestamp FROM runs "
+                + "WHERE current_index >= 0 AND current_index < items_length - 1 "
+                + "ORDER BY timestamp"
+            ).fetchall()
+        return [timestamp for (timestamp,) in rows]
+
+    def count_raw_items(self, timestamp: str) -> int:
+        """
+        Count the raw items of a run.
+
+        Args:
+            timestamp (str): Run timestamp.
+
+        Returns:
+            int: Number of raw items.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM raw_items WHERE timestamp = ?", (timestamp,)
+            ).fetchone()[0]
+
+    def iter_raw_items(self, timestamp: str, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the raw items of a run, in crawl order.
+        Rows are fetched by chunks, so that the whole run is never loaded at once.
+
+        Args:
+            timestamp (str): Run timestamp.
+            start (int, optional): Position of the first item. Defaults to 0.
+
+        Yields:
+            Iterator[Dict[str, Any]]: Raw items, as JSON-compatible dicts.
+        """
+        last_position = start - 1
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT position, data FROM raw_items "
+                    + "WHERE timestamp = ? AND position > ? ORDER BY position LIMIT 1000",
+                    (timestamp, last_position),
+                ).fetchall()
+            if not rows:
+                return
+            for _, data in rows:
+                yield json_loads(data)
+            last_position = rows[-1][0]
+
+    def load_raw_items(self, timestamp: str) -> List[AmiAmiItem]:
+        """
+        Load the raw items of a run.
+
+        Args:
+            timestamp (str): Run timestamp.
+
+        Returns:
+            List[AmiAmiItem]: Raw items, in crawl order.
+        """
+        return [AmiAmiItem(**data) for data in self.iter_raw_items(timestamp)]
+
+    def save_mapped_items(
+        self,
+        timestamp: str,
+        entries: List[Tuple[int, List[Dict[str, Any]]]],
+        current_index: int,
+    ):
+        """
+        Upsert mapped items and move the run checkpoint, in a single transaction.
+
+        Args:
+            timestamp (str): Run timestamp.
+            entries (List[Tuple[int, List[Dict[str, Any]]]]): (index, mapped_items) for each enriched index.
+            current_index (int): Last enriched index.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO mapped_items VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                + "ON CONFLICT (timestamp, item_index, position) DO UPDATE SET "
+                + "gcode = excluded.gcode, scode = excluded.scode, jancode = excluded.jancode, "
+                + "maker_name = excluded.maker_name, data = excluded.data",
+                (
+                    (
+                        timestamp,
+                        index,
+                        position,
+                        item["gcode"],
+                        item["scode"],
+                        item["jancode"],
+                        item["maker_name"],
+                        json_dumps(item, ensure_ascii=False),
+                    )
+                    for index, items in entries
+                    for position, item in enumerate(items)
+                ),
+            )
+            self._db.execute(
+                "UPDATE runs SET current_index = ? WHERE timestamp = ?",
+                (current_index, timestamp),
+            )
+
+    def count_mapped_items(self, timestamp: str) -> int:
+        """
+        Count the mapped items of a run.
+
+        Args:
+            timestamp (str): Run timestamp.
+
+        Returns:
+            int: Number of mapped items.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM mapped_items WHERE timestamp = ?", (timestamp,)
+            ).fetchone()[0]
+
+    def iter_mapped_items(self, timestamp: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the mapped items of a run, in enrich order.
+        Rows are fetched by chunks, so that the whole run is never loaded at once.
+
+        Args:
+            timestamp (str): Run timestamp.
+
+        Yields:
+            Iterator[Dict[str, Any]]: Mapped items, as JSON-compatible dicts.
+        """
+        last_key = (-1, -1)
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT item_index, position, data FROM mapped_items "
+                    + "WHERE timestamp = ? AND (item_index, position) > (?, ?) "
+                    + "ORDER BY item_index, position LIMIT 1000",
+                    (timestamp, *last_key),
+                ).fetchall()
+            if not rows:
+                return
+            for _, _, data in rows:
+                yield json_loads(data)
+            last_key = (rows[-1][0], rows[-1][1])
+
+    def export_raw(self, timestamp: str) -> str:
+        """
+        Export the raw data dump file of a run (in the `output` directory).
+
+        Args:
+            timestamp (str): Run timestamp.
+
+        Returns:
+            str: Exported filename.
+        """
+        run = self.get_run(timestamp)
+        if run is None:
+            raise ValueError(f"Unknown run '{timestamp}'")
+        filename = run[0]
+        items_length = self.count_raw_items(timestamp)
+        if filename.endswith(RAW_DUMP_EXTENSION):
+            write_raw_dump(
+                join(OUTPUT_DIR, filename),
+                items_length,
+                (
+                    json_dumps(item, ensure_ascii=False, separators=(",", ":"))
+                    for item in self.iter_raw_items(timestamp)
+                ),
+            )
+        else:
+            # Run crawled before the NDJSON layout, keep the format of its filename
+            write_items_json(
+                join(OUTPUT_DIR, filename),
+                {"items_length": items_length},
+                self.iter_raw_items(timestamp),
+            )
+        return filename
+
+    def export_mapped(self, timestamp: str) -> str:
+        """
+        Export the mapped data file of a run (in the `web/data` directory).
+
+        Args:
+            timestamp (str): Run timestamp.
+
+        Returns:
+            str: Exported filename.
+        """
+        run = self.get_run(timestamp)
+        if run is None:
+            raise ValueError(f"Unknown run '{timestamp}'")
+        filename = f"{timestamp}-mapped_items.json"
+        write_items_json(
+            join(WEB_DATA_DIR, filename),
+            {
+                "current_index": run[1],
+                "items_length": self.count_mapped_items(timestamp),
+            },
+            self.iter_mapped_items(timestamp),
+        )
+        return filename
+
+    def checkpoint(
+        self,
+        timestamp: str,
+        every_items: Optional[int] = None,
+        every_seconds: Optional[float] = None,
+        batch_size: int = 20,
+    ) -> "SqliteCheckpoint":
+        """
+        Get an enrich checkpoint of a run, stored in the database.
+
+        Args:
+            timestamp (str): Run timestamp.
+            every_items (Optional[int], optional): If set, export the mapped data file every N indexes.
+                Defaults to None.
+            every_seconds (Optional[float], optional): If set, export the mapped data file every T seconds.
+                Defaults to None.
+            batch_size (int, optional): Number of enriched indexes committed per transaction.
+                Defaults to 20.
+
+        Returns:
+            SqliteCheckpoint: Checkpoint.
+        """
+        return SqliteCheckpoint(self, timestamp, every_items, every_seconds, batch_size)
+
+    def close(self):
+        """
+        Close the database.
+        """
+        with self._lock:
+            self._db.close()
+
+
+class SqliteCheckpoint:
+    """
+    Enrich checkpoint stored in a SQLite database, with the same interface as `JournalCheckpoint`.
+    Enriched indexes are committed by batches, with the run current index in the same transaction.
+    """
+
+    def __init__(
+        self,
+        storage: SqliteStorage,
+        timestamp: str,
+        every_items: Optional[int],
+        every_seconds: Optional[float],
+        batch_size: int,
+    ):
+        self.storage = storage
+        self.timestamp = timestamp
+        self.every_items = every_items
+        self.every_seconds = every_seconds
+        self.batch_size = batch_size
+        self.current_index = -1
+        self._batch: List[Tuple[int, List[Dict[str, Any]]]] = []
+        self._pending_items = 0
+        self._last_flush = monotonic()
+
+    def load(self) -> int:
+        """
+        Retrieve the checkpoint.
+
+        Returns:
+            int: Last enriched index (-1 if nothing was enriched yet).
+        """
+        run = self.storage.get_run(self.timestamp)
+        if run is None:
+            raise ValueError(f"Unknown run '{self.timestamp}'")
+        self.current_index = run[1]
+        return self.current_index
+
+    def commit(self):
+        """
+        Commit the pending enriched indexes.
+        """
+        if self._batch:
+            self.storage.save_mapped_items(
+                self.timestamp, self._batch, self.current_index
+            )
+            self._batch = []
+
+    def record(self, index: int, items: List[Dict[str, Any]]):
+        """
+        Add the items enriched for a given index, committing them by batches.
+
+        Args:
+            index (int): Index in the raw data.
+            items (List[Dict[str, Any]]): Mapped items, as JSON-compatible dicts.
+        """
+        self._batch.append((index, items))
+        self.current_index = index
+        if len(self._batch) >= self.batch_size:
+            self.commit()
+
+        self._pending_items += 1
+        if (self.every_items and self._pending_items >= self.every_items) or (
+            self.every_seconds and monotonic() - self._last_flush >= self.every_seconds
+        ):
+            self.materialize()
+
+    def materialize(self):
+        """
+        Export the mapped data file from the database.
+        """
+        self.commit()
+        self.storage.export_mapped(self.timestamp)
+        self._pending_items = 0
+        self._last_flush = monotonic()
+
+    def close(self):
+        """
+        Commit pending indexes, keeping them for a later resume.
+        """
+        self.commit()
+
+    def finalize(self):
+        """
+        Commit pending indexes and export the mapped data file.
+        """
+        self.materialize()
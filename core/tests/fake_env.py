@@ -0,0 +1,16 @@
+"""
+Environment variables of the scraper, set for the tests importing the models or the scrapers.
+Only read when requesting, no request is sent by the tests.
+"""
+
+from os import environ
+
+for name, value in {
+    "AMIAMI_USER_KEY": "amiami_test",
+    "AMIAMI_USER_AGENT": "python-amiami_test",
+    "AMIAMI_API_ROOT": "http://127.0.0.1/api/v1.0",
+    "AMIAMI_IMG_ROOT": "http://127.0.0.1",
+    "ITEMS_PER_PAGE": "50",
+    "BROWSER": "chrome110",
+}.items():
+    environ.setdefault(name, value)
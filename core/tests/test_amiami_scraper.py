@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+from unittest import TestCase, main
+
+import fake_env  # noqa: F401
+from benchmarks.fixtures import build_item_response, build_list_item
+from models.amiami.index import AmiAmiItem, AmiAmiItemResponse
+from scrapers.amiami import AmiAmiScraper
+from utils.archive_util import DetailsArchive
+
+
+class FakeDetailsScraper(AmiAmiScraper):
+    """
+    Scraper answering the details requests from in-memory payloads.
+    """
+
+    def __init__(self, details: Dict[str, AmiAmiItemResponse]):
+        super().__init__()
+        self.details = details
+        self.requested: List[str] = []
+
+    def _crawl_item_details(
+        self,
+        code: str,
+        code_type: str,
+        archive: Optional[DetailsArchive] = None,
+    ) -> AmiAmiItemResponse:
+        self.requested.append(code)
+        return self.details[code]
+
+
+def build_details(index: int, scode: str, alternatives: List[str]) -> AmiAmiItemResponse:
+    data = build_item_response(index, scode=scode, alternatives=len(alternatives))
+    for other_item, alternative in zip(data["_embedded"]["other_items"], alternatives):
+        other_item["scode"] = alternative
+    return AmiAmiItemResponse.model_validate(data)
+
+
+class SharedAlternativesTest(TestCase):
+    def setUp(self):
+        # Both pre-owned items list each other and a shared alternative
+        details = {
+            "FIGURE-000001": build_details(1, "S1", ["S2", "S3"]),
+            "FIGURE-000003": build_details(3, "S2", ["S1", "S3", "S4"]),
+        }
+        for index, scode in enumerate(["S1", "S2", "S3", "S4"]):
+            details[scode] = build_details(index * 2 + 1, scode, [])
+        self.scraper = FakeDetailsScraper(details)
+
+    def tearDown(self):
+        self.scraper.close()
+
+    def enrich(self, indexes: List[int]) -> List[str]:
+        scodes = []
+        for position, index in enumerate(indexes):
+            item = AmiAmiItem.model_validate(build_list_item(index))
+            mapped_items, failed = self.scraper._enrich_item("test", position, len(indexes), item)
+            self.assertFalse(failed)
+            scodes.extend(mapped_item.scode for mapped_item in mapped_items)
+        return scodes
+
+    def test_items_are_output_once(self):
+        scodes = self.enrich([1, 3])
+
+        self.assertEqual(scodes, ["S1", "S2", "S3", "S4"])
+        # The second gcode is still requested, for its own alternatives
+        self.assertEqual(
+            self.scraper.requested, ["FIGURE-000001", "S2", "S3", "FIGURE-000003", "S4"]
+        )
+
+    def test_obtained_gcode_is_not_requested_again(self):
+        self.enrich([1, 3])
+        self.scraper.requested.clear()
+
+        self.assertEqual(self.enrich([1, 3]), [])
+        self.assertEqual(self.scraper.requested, [])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from os.path import join
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import cli
+import fake_env  # noqa: F401
+from benchmarks.fixtures import build_list_item
+from models.amiami.index import AmiAmiItem
+from storages.sqlite import SqliteStorage
+
+
+def build_raw_items(count: int) -> List[AmiAmiItem]:
+    return [AmiAmiItem.model_validate(build_list_item(index)) for index in range(count)]
+
+
+class ResumeTest(TestCase):
+    def setUp(self):
+        self.output_dir = TemporaryDirectory()
+        self.database_file = join(self.output_dir.name, "amiami.sqlite3")
+        for target, value in (
+            ("OUTPUT_DIR", self.output_dir.name),
+            ("DATABASE_FILE", self.database_file),
+        ):
+            patcher = patch.object(cli, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.output_dir.cleanup)
+
+    def resume(self) -> List[tuple]:
+        with patch.object(cli, "enrich_runs", return_value=0) as enrich_runs:
+            self.assertEqual(cli.run_resume(cli.build_parser().parse_args(["resume"])), 0)
+        return [call.args + tuple(call.kwargs.values()) for call in enrich_runs.call_args_list]
+
+    def save_run(self, storage: SqliteStorage, timestamp: str, current_index: int):
+        items = build_raw_items(3)
+        storage.save_raw_items(timestamp, f"{timestamp}-raw_items.ndjson", "query", items)
+        entries = [
+            (index, [items[index].minify().model_dump(mode="json")])
+            for index in range(current_index + 1)
+        ]
+        storage.save_mapped_items(timestamp, entries, current_index)
+
+    def test_nothing_to_resume(self):
+        self.assertEqual(self.resume(), [])
+
+    def test_sqlite_and_journal_runs(self):
+        storage = SqliteStorage(self.database_file)
+        try:
+            self.save_run(storage, "20250101_000000", -1)  # Crawled only
+            self.save_run(storage, "20250102_000000", 0)  # Interrupted
+            self.save_run(storage, "20250103_000000", 2)  # Enriched
+        finally:
+            storage.close()
+        open(join(self.output_dir.name, f"20250104_000000{cli.JOURNAL_SUFFIX}"), "w").close()
+
+        self.assertEqual(self.resume(), [(["20250102_000000", "20250104_000000"], None, True)])
+
+
+if __name__ == "__main__":
+    main()
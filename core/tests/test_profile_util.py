@@ -0,0 +1,85 @@
+from os import listdir
+from tempfile import TemporaryDirectory
+from threading import Barrier, Thread
+from typing import List
+from unittest import TestCase, main
+
+from utils.profile_util import StageProfiler
+
+
+def busy():
+    return sum(i * i for i in range(20000))
+
+
+class StageProfilerTest(TestCase):
+    def setUp(self):
+        self.profiler = StageProfiler(snapshots=False)
+
+    def tearDown(self):
+        self.profiler.close()
+
+    def test_concurrent_stages(self):
+        # Both stages are running at the same time, in two threads
+        barrier = Barrier(2, timeout=10)
+        errors: List[BaseException] = []
+
+        def run(name: str):
+            try:
+                with self.profiler.stage(name):
+                    barrier.wait()
+                    busy()
+                    barrier.wait()
+            except BaseException as e:
+                errors.append(e)
+                barrier.abort()
+
+        threads = [Thread(target=run, args=(name,)) for name in ("first", "second")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.profiler.stats["first"].calls, 1)
+        self.assertEqual(self.profiler.stats["second"].calls, 1)
+        self.assertEqual(self.profiler._profiling_thread, None)
+        with TemporaryDirectory() as output_dir:
+            self.profiler.dump(output_dir)
+            # At least the first started stage is followed by cProfile
+            filenames = listdir(output_dir)
+            self.assertIn("report.txt", filenames)
+            self.assertTrue({"first.prof", "second.prof"} & set(filenames))
+
+    def test_nested_stages(self):
+        with self.profiler.stage("parent"):
+            busy()
+            with self.profiler.stage("child"):
+                busy()
+            busy()
+
+        self.assertEqual(self.profiler._local.frames, [])
+        self.assertEqual(self.profiler._profiling_thread, None)
+        self.assertGreaterEqual(
+            self.profiler.stats["parent"].wall_time, self.profiler.stats["child"].wall_time
+        )
+        with TemporaryDirectory() as output_dir:
+            self.profiler.dump(output_dir)
+            self.assertEqual(
+                sorted(listdir(output_dir)), ["child.prof", "parent.prof", "report.txt"]
+            )
+
+    def test_failing_stage(self):
+        with self.assertRaises(RuntimeError):
+            with self.profiler.stage("failing"):
+                raise RuntimeError()
+
+        self.assertEqual(self.profiler._local.frames, [])
+        self.assertEqual(self.profiler.stats["failing"].calls, 1)
+        # The profiler is released for the next stages
+        with self.profiler.stage("next"):
+            busy()
+        self.assertIn("next", {name for name, _ in self.profiler._profiles})
+
+
+if __name__ == "__main__":
+    main()
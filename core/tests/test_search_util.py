@@ -0,0 +1,70 @@
+from json import load as json_load
+from os.path import join
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List
+from unittest import TestCase, main
+
+from utils.checkpoint_util import write_items_json
+from utils.search_util import write_search_index
+
+
+def make_item(gcode: str, name: str, description: str = "") -> Dict[str, Any]:
+    return {"gcode": gcode, "scode": None, "name": name, "description": description, "tags": []}
+
+
+def decode(deltas: List[int]) -> List[int]:
+    ids, current = [], 0
+    for delta in deltas:
+        current += delta
+        ids.append(current)
+    return ids
+
+
+class WriteSearchIndexTest(TestCase):
+    def build(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with TemporaryDirectory() as data_dir:
+            write_items_json(join(data_dir, "items.json"), {"items_length": len(items)}, items)
+            with open(join(data_dir, "_data_files.txt"), "w") as f:
+                f.write("items.json\n")
+            index_path = join(data_dir, "_search_index.json")
+            write_search_index(data_dir, join(data_dir, "_data_files.txt"), index_path)
+            with open(index_path, "r", encoding="utf-8") as f:
+                return json_load(f)
+
+    def test_ngrams_lookup(self):
+        index = self.build(
+            [
+                make_item("FIGURE-1", "Nendoroid Miku", "Painted figure"),
+                make_item("FIGURE-2", "Figma Saber"),
+            ]
+        )
+        self.assertEqual(index["items_length"], 2)
+
+        # Tokens containing "fig", found from its n-gram
+        ngram_index = index["ngrams"].index("fig")
+        tokens = [index["tokens"][i] for i in decode(index["ngram_tokens"][ngram_index])]
+        self.assertEqual(tokens, ["figma", "figure", "figure-1", "figure-2"])
+
+        # Items of a token
+        token_index = index["tokens"].index("figure")
+        self.assertEqual(decode(index["postings"][token_index]), [0])
+
+        # Every n-gram of every token is indexed
+        for token_id, token in enumerate(index["tokens"]):
+            for start in range(len(token) - index["ngram_length"] + 1):
+                ngram = token[start : start + index["ngram_length"]]
+                ngram_tokens = decode(index["ngram_tokens"][index["ngrams"].index(ngram)])
+                self.assertIn(token_id, ngram_tokens)
+
+    def test_fingerprint(self):
+        items = [make_item("FIGURE-1", "Nendoroid Miku", "Painted figure")]
+        fingerprint = self.build(items)["fingerprint"]
+        self.assertEqual(self.build(items)["fingerprint"], fingerprint)
+
+        # Same number of items, different searched text
+        items[0]["description"] = "Painted figure, reissue"
+        self.assertNotEqual(self.build(items)["fingerprint"], fingerprint)
+
+
+if __name__ == "__main__":
+    main()
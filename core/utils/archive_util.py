@@ -0,0 +1,74 @@
+from gzip import BadGzipFile, GzipFile
+from threading import Lock
+from typing import Iterator, Optional, Tuple
+
+from config import AmiAmiCodeTypeLiteral
+
+DETAILS_ARCHIVE_SUFFIX = "-item_details.jsonl.gz"
+
+
+class DetailsArchive:
+    """
+    Gzip-compressed archive of the raw details responses received by an enriching.
+    Each response is one line (`<code_type>=<code>\\t<raw JSON>`), so that the items can be
+    mapped again later without requesting them. A resumed enriching appends a new gzip member,
+    read transparently.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Archive filepath.
+        """
+        self.path = path
+        self._lock = Lock()
+        self._file: Optional[GzipFile] = None
+
+    def add(self, code: str, code_type: AmiAmiCodeTypeLiteral, content: bytes):
+        """
+        Archive a raw details response.
+
+        Args:
+            code (str): Requested item code.
+            code_type (AmiAmiCodeTypeLiteral): Requested item code type.
+            content (bytes): Raw response body (JSON).
+        """
+        # Line breaks are only whitespace in valid JSON (they are escaped in strings)
+        line = f"{code_type}={code}\t".encode() + content.replace(b"\r", b" ").replace(b"\n", b" ")
+        with self._lock:
+            if self._file is None:
+                self._file = GzipFile(self.path, "ab")
+            self._file.write(line + b"\n")
+
+    def close(self):
+        """
+        Close the archive. Responses archived after the last close of an interrupted
+        enriching may be lost.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_details_archive(path: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Iterate over the raw details responses of an archive, stopping at a truncated end
+    (archive of an interrupted enriching).
+
+    Args:
+        path (str): Archive filepath.
+
+    Yields:
+        Iterator[Tuple[str, bytes]]: (key, content), where:
+            - key: Requested code, as `<code_type>=<code>`
+            - content: Raw response body (JSON)
+    """
+    with GzipFile(path, "rb") as f:
+        try:
+            for line in f:
+                key, _, content = line.rstrip(b"\n").partition(b"\t")
+                if content:
+                    yield key.decode(), content
+        except (EOFError, BadGzipFile):
+            print(f"Archive '{path}' is truncated, reading stopped at the last complete response")
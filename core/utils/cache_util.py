@@ -0,0 +1,127 @@
+from sqlite3 import connect
+from threading import Lock
+from time import time
+from typing import Optional
+
+
+class DiskCache:
+    """
+    Persistent key/value cache of raw bytes, stored in a SQLite file.
+    Entries expire after a given TTL, and the least recently used ones are evicted
+    when the cache exceeds its maximum size.
+    """
+
+    def __init__(self, path: str, ttl: float, max_size: int):
+        """
+        Args:
+            path (str): Path of the SQLite file.
+            ttl (float): Entries time to live, in seconds.
+            max_size (int): Maximum total size of the stored values, in bytes.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+        self._db = connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+            """
+        )
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a value from the cache.
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            Optional[bytes]: Stored value, or None if missing or expired.
+        """
+        now = time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, size, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[2] > self.ttl:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._size -= row[1]
+                row = None
+            if row is None:
+                self.misses += 1
+                self._db.commit()
+                return None
+
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: bytes):
+        """
+        Store a value in the cache, evicting least recently used entries if needed.
+
+        Args:
+            key (str): Entry key.
+            value (bytes): Value to store.
+        """
+        now = time()
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if previous is not None:
+                self._size -= previous[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._size += len(value)
+
+            # Evict least recently used entries
+            while self._size > self.max_size:
+                oldest = self._db.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 1"
+                ).fetchone()
+                if oldest is None:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (oldest[0],))
+                self._size -= oldest[1]
+                self.evictions += 1
+            self._db.commit()
+
+    def stats(self) -> str:
+        """
+        Summarize the cache counters.
+
+        Returns:
+            str: Counters summary.
+        """
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({ratio:.0%} hit ratio), "
+            + f"{self.evictions} evictions, {self._size / 1024**2:.1f} MB stored"
+        )
+
+    def close(self):
+        """
+        Close the cache file.
+        """
+        with self._lock:
+            self._db.close()
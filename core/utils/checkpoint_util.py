@@ -0,0 +1,173 @@
+from json import dumps as json_dumps
+from json import load as json_load
+from json import loads as json_loads
+from os import fsync, remove, replace
+from os.path import exists
+from textwrap import indent
+from time import monotonic
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+JournalEntry = Tuple[int, List[Dict[str, Any]]]
+
+
+def write_items_json(
+    path: str,
+    header: Dict[str, Any],
+    items: Iterable[Dict[str, Any]],
+):
+    """
+    Write a data dump ({header fields..., "items": [...]}) as indented JSON, atomically.
+    Items are streamed to the file, so memory usage does not depend on the dump size.
+
+    Args:
+        path (str): Filepath.
+        header (Dict[str, Any]): Fields written before the items.
+        items (Iterable[Dict[str, Any]]): Items, as JSON-compatible dicts.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, value in header.items():
+            f.write(f"    {json_dumps(key)}: {json_dumps(value, ensure_ascii=False)},\n")
+        f.write('    "items": [')
+        separator = "\n"
+        for item in items:
+            item_json = json_dumps(item, indent=4, ensure_ascii=False)
+            f.write(separator + indent(item_json, " " * 8))
+            separator = ",\n"
+        f.write("]\n}" if separator == "\n" else "\n    ]\n}")
+        f.flush()
+        fsync(f.fileno())
+    replace(tmp_path, path)
+
+
+class JournalCheckpoint:
+    """
+    Append-only checkpoint for the enriching process.
+
+    Each enriched index is appended as one JSON line to a journal file, so saving an item
+    costs the size of that item only. The final JSON file is materialized from the journal,
+    atomically, at the end of the run or at a given cadence.
+    """
+
+    def __init__(
+        self,
+        journal_path: str,
+        output_path: str,
+        every_items: Optional[int] = None,
+        every_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            journal_path (str): Path of the JSONL journal.
+            output_path (str): Path of the final JSON file.
+            every_items (Optional[int], optional): If set, materialize the final file every N indexes.
+                Defaults to None.
+            every_seconds (Optional[float], optional): If set, materialize the final file every T seconds.
+                Defaults to None.
+        """
+        self.journal_path = journal_path
+        self.output_path = output_path
+        self.every_items = every_items
+        self.every_seconds = every_seconds
+        self.current_index = -1
+        self._journal = None
+        self._pending_items = 0
+        self._last_flush = monotonic()
+
+    def _read_journal(self) -> Iterator[JournalEntry]:
+        """
+        Replay the journal entries.
+        A trailing incomplete line (interrupted write) is dropped from the journal.
+
+        Yields:
+            Iterator[JournalEntry]: (index, items) for each valid line.
+        """
+        if not exists(self.journal_path):
+            return
+        valid_size = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json_loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                yield entry["index"], entry["items"]
+        # Cut partial line, so that next appends start on a clean line
+        with open(self.journal_path, "r+b") as f:
+            f.truncate(valid_size)
+
+    def load(self) -> int:
+        """
+        Retrieve the checkpoint, replaying the journal.
+        If there is no journal but a final file exists, the journal is seeded from it.
+
+        Returns:
+            int: Last enriched index (-1 if nothing was enriched yet).
+        """
+        for index, _ in self._read_journal():
+            self.current_index = max(self.current_index, index)
+
+        if self.current_index < 0 and exists(self.output_path):
+            with open(self.output_path, "r", encoding="utf-8") as f:
+                data = json_load(f)
+            self.record(data.get("current_index", 0), data.get("items", []))
+            self._pending_items = 0
+
+        return self.current_index
+
+    def record(self, index: int, items: List[Dict[str, Any]]):
+        """
+        Append the items enriched for a given index to the journal.
+
+        Args:
+            index (int): Index in the raw data.
+            items (List[Dict[str, Any]]): Mapped items, as JSON-compatible dicts.
+        """
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(
+            json_dumps({"index": index, "items": items}, ensure_ascii=False) + "\n"
+        )
+        self._journal.flush()
+        fsync(self._journal.fileno())
+
+        self.current_index = index
+        self._pending_items += 1
+        if (self.every_items and self._pending_items >= self.every_items) or (
+            self.every_seconds and monotonic() - self._last_flush >= self.every_seconds
+        ):
+            self.materialize()
+
+    def materialize(self):
+        """
+        Write the final JSON file from the journal, atomically.
+        """
+        items_length = sum(len(items) for _, items in self._read_journal())
+        write_items_json(
+            self.output_path,
+            {"current_index": self.current_index, "items_length": items_length},
+            (item for _, items in self._read_journal() for item in items),
+        )
+        self._pending_items = 0
+        self._last_flush = monotonic()
+
+    def close(self):
+        """
+        Close the journal, keeping it for a later resume.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def finalize(self):
+        """
+        Materialize the final file and drop the journal, now redundant.
+        """
+        self.close()
+        if exists(self.journal_path):
+            self.materialize()
+            remove(self.journal_path)
+        elif not exists(self.output_path):
+            self.materialize()
@@ -0,0 +1,279 @@
+from glob import glob
+from gzip import compress as gzip_compress
+from json import JSONDecodeError, JSONDecoder
+from json import dumps as json_dumps
+from json import load as json_load
+from json import loads as json_loads
+from os import remove, replace
+from os.path import basename, dirname, join
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_SUFFIX = ".manifest.json"
+NDJSON_SUFFIX = ".ndjson"
+
+# Characters read at once when streaming a JSON data dump
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+def write_bytes(path: str, data: bytes):
+    """
+    Write a file atomically.
+
+    Args:
+        path (str): Filepath.
+        data (bytes): File content.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    replace(tmp_path, path)
+
+
+def dumps_compact(data: Any) -> bytes:
+    """
+    Serialize data as minified JSON.
+
+    Args:
+        data (Any): JSON-compatible data.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    return json_dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_compact_export(
+    output_dir: str,
+    name: str,
+    header: Dict[str, Any],
+    items: Iterable[Dict[str, Any]],
+    shard_size: int,
+    encodings: Tuple[str, ...] = ("gz", "br"),
+) -> str:
+    """
+    Export items as minified JSON shards, with pre-compressed siblings and a manifest.
+    Files are named `<name>.<shard>.json` (+ `.gz` / `.br`) and `<name>.manifest.json`.
+    Brotli siblings are skipped if the `brotli` package is not installed.
+
+    Args:
+        output_dir (str): Output directory.
+        name (str): Base name of the exported files.
+        header (Dict[str, Any]): Fields written in the manifest (e.g. current_index).
+        items (Iterable[Dict[str, Any]]): Items, as JSON-compatible dicts.
+        shard_size (int): Maximum number of items per shard.
+        encodings (Tuple[str, ...], optional): Pre-compressed siblings to write.
+            Defaults to ("gz", "br").
+
+    Returns:
+        str: Manifest filename.
+    """
+    if brotli is None:
+        encodings = tuple(encoding for encoding in encodings if encoding != "br")
+
+    shards: List[Dict[str, Any]] = []
+
+    def write_shard(shard_items: List[Dict[str, Any]]):
+        filename = f"{name}.{len(shards):03d}.json"
+        data = dumps_compact({"items_length": len(shard_items), "items": shard_items})
+        write_bytes(join(output_dir, filename), data)
+        shard = {
+            "filename": filename,
+            "items_length": len(shard_items),
+            "size": len(data),
+            "encodings": {},
+        }
+        if "gz" in encodings:
+            write_bytes(join(output_dir, filename + ".gz"), gzip_compress(data, 9, mtime=0))
+            shard["encodings"]["gz"] = filename + ".gz"
+        if "br" in encodings:
+            write_bytes(join(output_dir, filename + ".br"), brotli.compress(data))
+            shard["encodings"]["br"] = filename + ".br"
+        shards.append(shard)
+
+    shard_items: List[Dict[str, Any]] = []
+    for item in items:
+        shard_items.append(item)
+        if len(shard_items) >= shard_size:
+            write_shard(shard_items)
+            shard_items = []
+    if shard_items or not shards:
+        write_shard(shard_items)
+
+    # Remove shards left by a previous (bigger) export
+    written = {join(output_dir, shard["filename"]) for shard in shards}
+    for path in glob(join(output_dir, f"{name}.[0-9][0-9][0-9].json*")):
+        if path.split(".json")[0] + ".json" not in written:
+            remove(path)
+
+    manifest_filename = name + MANIFEST_SUFFIX
+    manifest = {
+        **header,
+        "items_length": sum(shard["items_length"] for shard in shards),
+        "shards": shards,
+    }
+    write_bytes(join(output_dir, manifest_filename), dumps_compact(manifest))
+    return manifest_filename
+
+
+def write_ndjson_export(path: str, items: Iterable[Dict[str, Any]]) -> int:
+    """
+    Export items as NDJSON (one minified JSON item per line), atomically.
+    Items are streamed to the file, so that readers can parse it line by line as it downloads.
+
+    Args:
+        path (str): Filepath.
+        items (Iterable[Dict[str, Any]]): Items, as JSON-compatible dicts.
+
+    Returns:
+        int: Number of exported items.
+    """
+    items_length = 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for item in items:
+            f.write(json_dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+            items_length += 1
+    replace(tmp_path, path)
+    return items_length
+
+
+class _JsonStream:
+    """
+    Incremental reader of JSON values from a text file, decoding one value at a time.
+    """
+
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.decoder = JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and get the next character, without consuming it.
+
+        Returns:
+            str: Next character, or an empty string at the end of the file.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in " \t\r\n":
+                self.position += 1
+            if self.position < len(self.buffer) or not self._fill():
+                return self.buffer[self.position : self.position + 1]
+
+    def expect(self, chars: str) -> str:
+        """
+        Consume the next character, which must be one of the given ones.
+
+        Args:
+            chars (str): Expected characters.
+
+        Raises:
+            ValueError: If the next character is not expected.
+
+        Returns:
+            str: Consumed character.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at character {self.position}, got {char!r}")
+        self.position += 1
+        return char
+
+    def decode(self) -> Any:
+        """
+        Decode the next JSON value.
+
+        Returns:
+            Any: Decoded value.
+        """
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except JSONDecodeError:
+                # Value cut at the end of the buffer
+                if not self._fill():
+                    raise
+                continue
+            # A number ending the buffer (e.g. "12" of "12.5") may go on in the next chunk
+            is_number = isinstance(value, (int, float))
+            if is_number and not self.buffer[end:].lstrip("0123456789.eE+-") and self._fill():
+                continue
+            self.position = end
+            return value
+
+
+def _iter_json_dump_items(f: IO[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the items of a JSON data dump ({fields..., "items": [...]}), decoding one item
+    at a time, so that memory usage only depends on the size of an item.
+
+    Args:
+        f (IO[str]): Data dump file.
+
+    Yields:
+        Iterator[Dict[str, Any]]: Items, as JSON-compatible dicts.
+    """
+    stream = _JsonStream(f)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.decode()
+        stream.expect(":")
+        if key != "items":
+            stream.decode()
+        else:
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    yield stream.decode()
+                    if stream.expect(",]") == "]":
+                        break
+        if stream.expect(",}") == "}":
+            return
+
+
+def iter_data_file_items(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the items of a web data file, either a JSON dump, an NDJSON export
+    or a compact export manifest.
+    Items are streamed one at a time (one shard at a time for an export manifest).
+
+    Args:
+        path (str): Path of the data file.
+
+    Yields:
+        Iterator[Dict[str, Any]]: Items, as JSON-compatible dicts.
+    """
+    if path.endswith(NDJSON_SUFFIX):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from (json_loads(line) for line in f if line.strip())
+        return
+
+    if not basename(path).endswith(MANIFEST_SUFFIX):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from _iter_json_dump_items(f)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json_load(f)
+    for shard in data["shards"]:
+        with open(join(dirname(path), shard["filename"]), "r", encoding="utf-8") as f:
+            yield from json_load(f)["items"]
@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock, Thread, current_thread, local
+from typing import Any, List, Optional, Tuple
+
+from curl_cffi import CurlHttpVersion, requests
+
+
+class TooManyRequestsError(Exception):
+    """
+    Raised when requests are still throttled (HTTP 429) after all retries.
+    """
+
+    ...
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): Header value.
+
+    Returns:
+        Optional[float]: Delay in seconds, or None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class SessionPool:
+    """
+    Pool of long-lived HTTP sessions, one per thread.
+    Each session keeps its connections (and TLS sessions) alive between requests,
+    while threads never share a curl handle.
+    Sessions of exited threads (e.g. of a shut down executor) are closed when a new one is created.
+    """
+
+    def __init__(self, **session_kwargs: Any):
+        """
+        Args:
+            **session_kwargs (Any): Arguments given to each created `requests.Session`
+                (impersonate, headers...). HTTP/2 over TLS is used unless specified otherwise.
+        """
+        session_kwargs.setdefault("http_version", CurlHttpVersion.V2TLS)
+        self.session_kwargs = session_kwargs
+        self._local = local()
+        self._lock = Lock()
+        self._sessions: List[Tuple[Thread, requests.Session]] = []
+
+    def get(self) -> requests.Session:
+        """
+        Get the session bound to the current thread, creating it if needed.
+
+        Returns:
+            requests.Session: Session.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session(**self.session_kwargs)
+            self._local.session = session
+            with self._lock:
+                dead_sessions = [entry for entry in self._sessions if not entry[0].is_alive()]
+                self._sessions = [entry for entry in self._sessions if entry[0].is_alive()]
+                self._sessions.append((current_thread(), session))
+            for _, dead_session in dead_sessions:
+                dead_session.close()
+        return session
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def close(self):
+        """
+        Close all created sessions. The pool can still be used afterwards,
+        new sessions will be created on demand.
+        """
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for _, session in sessions:
+            session.close()
+        self._local = local()
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
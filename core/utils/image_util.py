@@ -0,0 +1,210 @@
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from io import BytesIO
+from json import dumps as json_dumps
+from json import load as json_load
+from os.path import exists, join, splitext
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from utils.checkpoint_util import write_items_json
+from utils.export_util import write_bytes
+from utils.http_util import SessionPool
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Registry of the mirrored images ({remote url: local filename}), in the images directory
+INDEX_FILENAME = "_images.json"
+
+
+class ImageMirror:
+    """
+    Local mirror of the items images, so that the webview renders them from disk instead of
+    requesting the image server for each row.
+    Images are named by a hash of their content (identical images are only stored once),
+    and remote URLs already mirrored are never requested again.
+    Thumbnails need the optional `Pillow` package, full images are used without it.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        url_prefix: str,
+        sessions: SessionPool,
+        workers: int = 8,
+        thumbnail_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            output_dir (str): Directory of the mirrored images.
+            url_prefix (str): URL of the directory from the webview (e.g. "img").
+            sessions (SessionPool): Sessions used to download the images.
+            workers (int, optional): Number of images downloaded concurrently. Defaults to 8.
+            thumbnail_size (Optional[int], optional): If set, items link to JPEG thumbnails
+                fitting in a square of this size (in pixels) instead of the full images.
+                Defaults to None.
+        """
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix.rstrip("/")
+        self.sessions = sessions
+        self.workers = max(1, workers)
+        self.thumbnail_size = thumbnail_size
+        if thumbnail_size is not None and Image is None:
+            print("Pillow is not installed, full images are used instead of thumbnails")
+            self.thumbnail_size = None
+        self.downloaded = 0
+        self.failed = 0
+        self._lock = Lock()
+        self._write_lock = Lock()
+        self._index_path = join(output_dir, INDEX_FILENAME)
+        self._index: Dict[str, str] = {}
+        if exists(self._index_path):
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                self._index = json_load(f)
+
+    def _write(self, filename: str, data: bytes):
+        # Different URLs can give the same content, hence the same file
+        with self._write_lock:
+            path = join(self.output_dir, filename)
+            if not exists(path):
+                write_bytes(path, data)
+
+    def _download(self, url: str) -> Optional[str]:
+        """
+        Download an image, unless an image with the same content is already stored.
+
+        Args:
+            url (str): Remote URL.
+
+        Returns:
+            Optional[str]: Local filename, or None if the image could not be downloaded.
+        """
+        try:
+            response = self.sessions.get().get(url, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error on image '{url}': {e}")
+            with self._lock:
+                self.failed += 1
+            return None
+
+        extension = splitext(urlsplit(url).path)[1].lower() or ".jpg"
+        filename = sha1(response.content).hexdigest()[:20] + extension
+        self._write(filename, response.content)
+        with self._lock:
+            self.downloaded += 1
+        return filename
+
+    def _get_thumbnail(self, filename: str) -> Optional[str]:
+        """
+        Get the thumbnail of a mirrored image, creating it if needed.
+
+        Args:
+            filename (str): Local filename of the full image.
+
+        Returns:
+            Optional[str]: Local filename of the thumbnail, or None if the image can not be read.
+        """
+        thumbnail = f"{splitext(filename)[0]}.{self.thumbnail_size}.jpg"
+        if exists(join(self.output_dir, thumbnail)):
+            return thumbnail
+        try:
+            with Image.open(join(self.output_dir, filename)) as image:
+                image.thumbnail((self.thumbnail_size, self.thumbnail_size))
+                buffer = BytesIO()
+                image.convert("RGB").save(buffer, "JPEG", quality=85, optimize=True)
+        except Exception as e:
+            print(f"Error on thumbnail of '{filename}': {e}")
+            return None
+        self._write(thumbnail, buffer.getvalue())
+        return thumbnail
+
+    def _mirror_url(self, url: str) -> Optional[str]:
+        """
+        Mirror an image.
+
+        Args:
+            url (str): Remote URL.
+
+        Returns:
+            Optional[str]: Local filename to link to, or None to keep the remote URL.
+        """
+        filename = self._index.get(url)
+        if filename is None or not exists(join(self.output_dir, filename)):
+            filename = self._download(url)
+            if filename is None:
+                return None
+            with self._lock:
+                self._index[url] = filename
+        if self.thumbnail_size is not None:
+            return self._get_thumbnail(filename) or filename
+        return filename
+
+    def mirror(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        Mirror the images of items, and point their `image_url` to the local copies.
+        Each remote URL is only downloaded once, images that can not be downloaded keep
+        their remote URL.
+
+        Args:
+            items (Iterable[Dict[str, Any]]): Items, as JSON-compatible dicts (updated in place).
+
+        Returns:
+            int: Number of items pointing to a local image.
+        """
+        items_by_url: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            url = item.get("image_url") or ""
+            if url.startswith(("http://", "https://")):
+                items_by_url.setdefault(url, []).append(item)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            filenames = executor.map(self._mirror_url, items_by_url)
+            mirrored_count = 0
+            for (url, url_items), filename in zip(items_by_url.items(), filenames):
+                if filename is None:
+                    continue
+                for item in url_items:
+                    item["image_url"] = f"{self.url_prefix}/{filename}"
+                mirrored_count += len(url_items)
+
+        with self._lock:
+            index_data = json_dumps(self._index, indent=4, sort_keys=True)
+        write_bytes(self._index_path, index_data.encode("utf-8"))
+        return mirrored_count
+
+    def stats(self) -> str:
+        """
+        Summarize the mirror counters.
+
+        Returns:
+            str: Counters summary.
+        """
+        with self._lock:
+            return (
+                f"{self.downloaded} images downloaded, {self.failed} failed, "
+                + f"{len(self._index)} mirrored in total"
+            )
+
+
+def mirror_data_file_images(mirror: ImageMirror, path: str) -> int:
+    """
+    Mirror the images of an enriched data file, and rewrite it with the local image URLs.
+
+    Args:
+        mirror (ImageMirror): Image mirror.
+        path (str): Path of the data file.
+
+    Returns:
+        int: Number of items pointing to a local image.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json_load(f)
+    items = data.pop("items")
+    mirrored_count = mirror.mirror(items)
+    write_items_json(path, data, items)
+    return mirrored_count
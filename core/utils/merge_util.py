@@ -0,0 +1,137 @@
+from os.path import basename, join
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from utils.checkpoint_util import write_items_json
+from utils.export_util import iter_data_file_items
+from utils.search_util import read_data_list
+
+
+def get_source_timestamp(source: str) -> str:
+    """
+    Get the run timestamp of a data file, from its name (`<timestamp>-mapped_items...`).
+
+    Args:
+        source (str): Data filename.
+
+    Returns:
+        str: Run timestamp.
+    """
+    return basename(source).split("-", 1)[0]
+
+
+def get_item_key(item: Dict[str, Any]) -> str:
+    """
+    Get the deduplication key of a mapped item: its scode, or its gcode if details were not scraped.
+
+    Args:
+        item (Dict[str, Any]): Mapped item.
+
+    Returns:
+        str: Item key.
+    """
+    return item["scode"] or item["gcode"]
+
+
+def _add_item_key(keys: Set[str], key: str, gcode: str):
+    """
+    Add the key of an item to the keys kept for its product, where items with details
+    replace the listing item (keyed by gcode) of the same product.
+
+    Args:
+        keys (Set[str]): Keys kept for the product (updated in place).
+        key (str): Item key.
+        gcode (str): Product gcode.
+    """
+    if key != gcode:
+        keys.discard(gcode)
+        keys.add(key)
+    elif not keys:
+        keys.add(key)
+
+
+def _iter_sourced_items(
+    data_dir: str,
+    filenames: List[str],
+) -> Iterator[Tuple[str, Dict[str, Any], str]]:
+    """
+    Stream the items of data files, with their source (kept from a previous merge if any).
+
+    Args:
+        data_dir (str): Directory of the data files.
+        filenames (List[str]): Data filenames.
+
+    Yields:
+        Iterator[Tuple[str, Dict[str, Any], str]]: (key, item, source) of each item.
+    """
+    for filename in filenames:
+        for item in iter_data_file_items(join(data_dir, filename)):
+            yield get_item_key(item), item, item.pop("source", None) or filename
+
+
+def merge_data_files(
+    data_dir: str,
+    data_list_file: str,
+    output_filename: str,
+    replace_sources: bool = False,
+) -> Tuple[int, int]:
+    """
+    Merge all listed data files into one dataset, keeping each product (gcode) from the newest run
+    containing it, with the file it comes from in its `source` field. Items of a product with
+    details (keyed by scode) replace its listing item (keyed by gcode) from the same run.
+
+    Files are streamed twice: first to find the newest run and the kept keys of each product,
+    then to write the kept items.
+    Memory usage is bounded by the number of unique items, not by the total number of rows.
+
+    Args:
+        data_dir (str): Directory of the data files.
+        data_list_file (str): Path of the listing file.
+        output_filename (str): Filename of the merged dataset, in the data directory.
+            If it is listed, its items are merged again, with their original source.
+        replace_sources (bool, optional): If True, the listing file is rewritten to only load
+            the merged dataset, the merged files being commented out. Defaults to False.
+
+    Returns:
+        Tuple[int, int]: (rows_count, items_count), where:
+            - rows_count: Number of items read
+            - items_count: Number of unique items written
+    """
+    filenames = read_data_list(data_list_file)
+
+    # Newest run timestamp of each product, with the keys of its items in that run
+    newest: Dict[str, Tuple[str, Set[str]]] = {}
+    rows_count = 0
+    for key, item, source in _iter_sourced_items(data_dir, filenames):
+        rows_count += 1
+        timestamp = get_source_timestamp(source)
+        newest_timestamp, keys = newest.get(item["gcode"], ("", set()))
+        if timestamp > newest_timestamp:
+            newest_timestamp, keys = timestamp, set()
+            newest[item["gcode"]] = (newest_timestamp, keys)
+        if timestamp == newest_timestamp:
+            _add_item_key(keys, key, item["gcode"])
+    items_count = sum(len(keys) for _, keys in newest.values())
+
+    def iter_kept_items() -> Iterator[Dict[str, Any]]:
+        for key, item, source in _iter_sourced_items(data_dir, filenames):
+            newest_timestamp, keys = newest.get(item["gcode"], ("", set()))
+            # Only the first occurrence of a kept key from the newest run is kept
+            if newest_timestamp == get_source_timestamp(source) and key in keys:
+                keys.remove(key)
+                item["source"] = source
+                yield item
+
+    write_items_json(
+        join(data_dir, output_filename),
+        {"items_length": items_count, "sources": filenames},
+        iter_kept_items(),
+    )
+
+    if replace_sources:
+        with open(data_list_file, "w") as f:
+            f.write(output_filename + "\n")
+            for filename in filenames:
+                if filename != output_filename:
+                    f.write(f"# {filename}\n")
+
+    return rows_count, items_count
@@ -0,0 +1,253 @@
+from contextlib import contextmanager
+from json import dumps as json_dumps
+from threading import Lock
+from time import perf_counter, time
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from utils.export_util import write_bytes
+
+# Upper bounds of the histograms buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+# Status label of the requests failing without response (connection errors, timeouts...)
+ERROR_STATUS = "error"
+
+StatusType = Union[int, str]
+
+
+class Histogram:
+    """
+    Distribution of observed values, counted in fixed buckets.
+    Not thread-safe, see `RunMetrics`.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        """
+        Args:
+            buckets (Tuple[float, ...]): Upper bounds of the buckets, sorted.
+        """
+        self.buckets = buckets
+        # Last bucket is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = next(
+            (index for index, bound in enumerate(self.buckets) if value <= bound),
+            len(self.buckets),
+        )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "buckets": list(self.buckets),
+            "counts": self.counts,
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0,
+            "max": round(self.max, 6),
+        }
+
+    def cumulative_counts(self) -> Iterator[Tuple[str, int]]:
+        """
+        Iterate over the cumulative counts of the buckets, as exported to Prometheus.
+
+        Yields:
+            Iterator[Tuple[str, int]]: (le, count) of each bucket, +Inf included.
+        """
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield str(bound), total
+
+
+class RunMetrics:
+    """
+    Thread-safe telemetry of the scraper: per-endpoint request latencies, status codes,
+    received bytes and retries, rate limiting waits and durations of the scraper stages
+    (responses validation, checkpoint writes...).
+    Metrics are cumulated since the creation of the scraper.
+    """
+
+    def __init__(self):
+        self.started_at = time()
+        self.requests: Dict[Tuple[str, StatusType], int] = {}
+        self.latencies: Dict[str, Histogram] = {}
+        self.received_bytes: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.throttle_pause_time = 0.0
+        self.durations: Dict[str, Histogram] = {}
+        self._lock = Lock()
+
+    def observe_request(self, endpoint: str, status: StatusType, latency: float, size: int):
+        """
+        Record a request sent to the API.
+
+        Args:
+            endpoint (str): Endpoint name (e.g. "items", "item").
+            status (StatusType): Response status code, or ERROR_STATUS if no response was received.
+            latency (float): Request duration, in seconds.
+            size (int): Size of the response body, in bytes.
+        """
+        with self._lock:
+            self.requests[endpoint, status] = self.requests.get((endpoint, status), 0) + 1
+            self.latencies.setdefault(endpoint, Histogram(LATENCY_BUCKETS)).observe(latency)
+            self.received_bytes[endpoint] = self.received_bytes.get(endpoint, 0) + size
+
+    def observe_retry(self, endpoint: str):
+        with self._lock:
+            self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+    def observe_wait(self, seconds: float):
+        """
+        Record the time a request waited for the rate limiter (throttling pauses included).
+        Waits of concurrent workers are summed, so the total can exceed the run duration.
+
+        Args:
+            seconds (float): Waited time, in seconds.
+        """
+        with self._lock:
+            self.wait_time += seconds
+
+    def observe_throttle(self, pause: float):
+        """
+        Record a throttled request (HTTP 429).
+
+        Args:
+            pause (float): Pause applied to all requests, in seconds.
+        """
+        with self._lock:
+            self.throttled += 1
+            self.throttle_pause_time += pause
+
+    def observe_duration(self, stage: str, seconds: float):
+        with self._lock:
+            self.durations.setdefault(stage, Histogram(DURATION_BUCKETS)).observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """
+        Record the duration of a block of code.
+
+        Args:
+            stage (str): Stage name (e.g. "validation", "checkpoint_record").
+        """
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_duration(stage, perf_counter() - start_time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of the metrics, as JSON-compatible data.
+
+        Returns:
+            Dict[str, Any]: Metrics.
+        """
+        with self._lock:
+            endpoints = sorted(self.latencies)
+            return {
+                "started_at": self.started_at,
+                "exported_at": time(),
+                "requests": {
+                    endpoint: {
+                        "statuses": {
+                            str(status): count
+                            for (name, status), count in sorted(
+                                self.requests.items(), key=lambda entry: str(entry[0])
+                            )
+                            if name == endpoint
+                        },
+                        "latency": self.latencies[endpoint].to_dict(),
+                        "received_bytes": self.received_bytes.get(endpoint, 0),
+                        "retries": self.retries.get(endpoint, 0),
+                    }
+                    for endpoint in endpoints
+                },
+                "rate_limiter": {
+                    "wait_time": round(self.wait_time, 6),
+                    "throttled": self.throttled,
+                    "throttle_pause_time": round(self.throttle_pause_time, 6),
+                },
+                "durations": {
+                    stage: histogram.to_dict()
+                    for stage, histogram in sorted(self.durations.items())
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "amiami") -> str:
+        """
+        Snapshot of the metrics, in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Prefix of the metrics names. Defaults to "amiami".
+
+        Returns:
+            str: Metrics, one sample per line.
+        """
+        lines: List[str] = []
+
+        def declare(name: str, kind: str, help: str):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def add_histogram(name: str, label: str, histograms: Dict[str, Histogram]):
+            for value, histogram in sorted(histograms.items()):
+                labels = f'{label}="{value}"'
+                for bound, count in histogram.cumulative_counts():
+                    lines.append(f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+
+        with self._lock:
+            declare("requests_total", "counter", "Requests sent to the API.")
+            for (endpoint, status), count in sorted(
+                self.requests.items(), key=lambda entry: str(entry[0])
+            ):
+                lines.append(
+                    f'{prefix}_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+            declare("request_duration_seconds", "histogram", "Duration of the API requests.")
+            add_histogram("request_duration_seconds", "endpoint", self.latencies)
+            declare("received_bytes_total", "counter", "Size of the API responses bodies.")
+            for endpoint, size in sorted(self.received_bytes.items()):
+                lines.append(f'{prefix}_received_bytes_total{{endpoint="{endpoint}"}} {size}')
+            declare("retries_total", "counter", "Requests retried after a throttling.")
+            for endpoint, count in sorted(self.retries.items()):
+                lines.append(f'{prefix}_retries_total{{endpoint="{endpoint}"}} {count}')
+            declare("throttled_total", "counter", "Requests throttled by the API (HTTP 429).")
+            lines.append(f"{prefix}_throttled_total {self.throttled}")
+            declare(
+                "limiter_wait_seconds_total",
+                "counter",
+                "Time waited for the rate limiter, summed over requests.",
+            )
+            lines.append(f"{prefix}_limiter_wait_seconds_total {self.wait_time}")
+            declare("throttle_pause_seconds_total", "counter", "Pauses applied after throttlings.")
+            lines.append(f"{prefix}_throttle_pause_seconds_total {self.throttle_pause_time}")
+            declare("stage_duration_seconds", "histogram", "Duration of the scraper stages.")
+            add_histogram("stage_duration_seconds", "stage", self.durations)
+            declare("started_at_seconds", "gauge", "Creation time of the scraper.")
+            lines.append(f"{prefix}_started_at_seconds {self.started_at}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path: str, prometheus_path: str):
+        """
+        Write the metrics as JSON and as a Prometheus textfile (e.g. for the node_exporter
+        textfile collector), atomically.
+
+        Args:
+            json_path (str): Path of the JSON file.
+            prometheus_path (str): Path of the Prometheus textfile.
+        """
+        write_bytes(json_path, json_dumps(self.to_dict(), indent=4).encode("utf-8"))
+        write_bytes(prometheus_path, self.to_prometheus().encode("utf-8"))
@@ -0,0 +1,34 @@
+from json import load as json_load
+from typing import Any, Dict
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+def read_plan_file(path: str) -> Dict[str, Any]:
+    """
+    Read a query plan file, either JSON or TOML (`.toml` extension).
+    TOML plans need Python 3.11+ or the optional `tomli` package.
+
+    Args:
+        path (str): Path of the plan file.
+
+    Raises:
+        RuntimeError: If the plan is a TOML file and no TOML parser is available.
+
+    Returns:
+        Dict[str, Any]: Plan data, to validate as an AmiAmiQueryPlan.
+    """
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise RuntimeError("TOML plans need Python 3.11+ or the tomli package")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json_load(f)
@@ -0,0 +1,244 @@
+from contextlib import contextmanager
+from cProfile import Profile
+from os import makedirs
+from os.path import join
+from pstats import Stats
+from threading import Lock, get_ident, local
+from time import perf_counter, thread_time
+from tracemalloc import (
+    Filter,
+    Snapshot,
+    get_traced_memory,
+    is_tracing,
+    reset_peak,
+    take_snapshot,
+)
+from tracemalloc import __file__ as tracemalloc_file
+from tracemalloc import start as start_tracing
+from tracemalloc import stop as stop_tracing
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.export_util import write_bytes
+
+
+class StageStats:
+    """
+    Cumulated measures of a profiled stage.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.memory_peak = 0
+        self.top_allocations: List[str] = []
+
+
+class StageFrame:
+    """
+    Stage running in a thread.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.profile: Optional[Profile] = None
+        self.memory_start = 0
+        self.memory_peak = 0
+
+
+class StageProfiler:
+    """
+    Opt-in profiler of the scraper stages: each stage gets its own cProfile statistics,
+    its wall and CPU times, and its tracemalloc allocation peak (with a snapshot of the top
+    allocating lines of the process when the stage reaches a new peak).
+
+    A single stage at a time is followed by cProfile, as profilers can not overlap from Python 3.12
+    (and then follow all threads): stages starting while another thread holds it only get their
+    times and memory peak. A nested stage takes over the profiler of its parent, but its times
+    are included in the parent ones.
+    Memory peaks are exact when stages run sequentially (e.g. `enrich_workers=1`),
+    and approximate when they overlap in several threads, as tracemalloc peaks are global.
+    """
+
+    def __init__(self, trace_memory: bool = True, snapshots: bool = True, top_lines: int = 10):
+        """
+        Args:
+            trace_memory (bool, optional): If True, trace memory allocations of the stages
+                (slows down the whole program). Defaults to True.
+            snapshots (bool, optional): If True, take a snapshot of the allocations when a stage
+                reaches a new peak, to report its top allocating lines. Defaults to True.
+            top_lines (int, optional): Number of allocating lines reported per stage.
+                Defaults to 10.
+        """
+        self.trace_memory = trace_memory
+        self.snapshots = snapshots
+        self.top_lines = top_lines
+        self.stats: Dict[str, StageStats] = {}
+        self._profiles: Dict[Tuple[str, int], Profile] = {}
+        self._lock = Lock()
+        self._local = local()
+        # Thread of the stage currently followed by cProfile, if any
+        self._profiling_thread: Optional[int] = None
+        self._started_tracing = False
+        if trace_memory and not is_tracing():
+            start_tracing()
+            self._started_tracing = True
+
+    def _start_profile(self, name: str) -> Optional[Profile]:
+        """
+        Enable the cProfile statistics of a stage in the current thread, if no other thread
+        holds the profiler.
+
+        Args:
+            name (str): Stage name.
+
+        Returns:
+            Optional[Profile]: Enabled profile, or None if the stage is not followed by cProfile.
+        """
+        thread = get_ident()
+        with self._lock:
+            if self._profiling_thread not in (None, thread):
+                return None
+            profile = self._profiles.get((name, thread)) or Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiling tool is active (e.g. a debugger)
+                return None
+            self._profiles[(name, thread)] = profile
+            self._profiling_thread = thread
+            return profile
+
+    def _stop_profile(self, profile: Profile):
+        with self._lock:
+            profile.disable()
+            self._profiling_thread = None
+
+    def _update_peaks(self, frames: List["StageFrame"]):
+        # Peak is reset by each stage, keep it for the enclosing ones
+        peak = get_traced_memory()[1]
+        for frame in frames:
+            frame.memory_peak = max(frame.memory_peak, peak)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Profile a block of code as a given stage.
+
+        Args:
+            name (str): Stage name.
+        """
+        frames: List[StageFrame] = getattr(self._local, "frames", None) or []
+        self._local.frames = frames
+        parent = frames[-1] if frames else None
+        if parent is not None and parent.profile is not None:
+            self._stop_profile(parent.profile)
+        frame = StageFrame(name)
+        if self.trace_memory:
+            self._update_peaks(frames)
+            frame.memory_start = get_traced_memory()[0]
+            reset_peak()
+
+        wall_start, cpu_start = perf_counter(), thread_time()
+        try:
+            frame.profile = self._start_profile(name)
+            frames.append(frame)
+            yield
+        finally:
+            if frame.profile is not None:
+                self._stop_profile(frame.profile)
+            wall_time, cpu_time = perf_counter() - wall_start, thread_time() - cpu_start
+            memory_peak = 0
+            if self.trace_memory:
+                self._update_peaks(frames)
+                memory_peak = max(0, frame.memory_peak - frame.memory_start)
+            if frames and frames[-1] is frame:
+                frames.pop()
+            if parent is not None and parent.profile is not None:
+                parent.profile = self._start_profile(parent.name)
+
+            with self._lock:
+                stats = self.stats.setdefault(name, StageStats())
+                stats.calls += 1
+                stats.wall_time += wall_time
+                stats.cpu_time += cpu_time
+                new_peak = memory_peak > stats.memory_peak
+                stats.memory_peak = max(stats.memory_peak, memory_peak)
+            if new_peak and self.snapshots:
+                self._record_top_allocations(stats, take_snapshot())
+
+    def _record_top_allocations(self, stats: StageStats, snapshot: Snapshot):
+        # Allocations of tracemalloc itself are not relevant
+        snapshot = snapshot.filter_traces((Filter(False, tracemalloc_file),))
+        top_allocations = [
+            str(statistic) for statistic in snapshot.statistics("lineno")[: self.top_lines]
+        ]
+        with self._lock:
+            stats.top_allocations = top_allocations
+
+    def report(self) -> str:
+        """
+        Format the wall time, CPU time and memory peak of each stage as a table.
+
+        Returns:
+            str: Breakdown table, stages sorted by wall time.
+        """
+        lines = [
+            f"{'stage':<20} {'calls':>8} {'wall (s)':>10} {'cpu (s)':>10}"
+            + f" {'cpu/call (ms)':>14} {'peak (KB)':>10}"
+        ]
+        with self._lock:
+            stages = sorted(self.stats.items(), key=lambda entry: -entry[1].wall_time)
+            for name, stats in stages:
+                lines.append(
+                    f"{name:<20} {stats.calls:>8} {stats.wall_time:>10.3f} {stats.cpu_time:>10.3f}"
+                    + f" {stats.cpu_time / stats.calls * 1000:>14.3f}"
+                    + f" {stats.memory_peak / 1024:>10.1f}"
+                )
+        return "\n".join(lines)
+
+    def dump(self, output_dir: str) -> str:
+        """
+        Write the cProfile statistics of each stage (`<stage>.prof`, readable with `pstats`
+        or snakeviz), and the breakdown table with the top allocating lines (`report.txt`).
+        Must not be called while stages are running.
+
+        Args:
+            output_dir (str): Output directory.
+
+        Returns:
+            str: Breakdown table.
+        """
+        makedirs(output_dir, exist_ok=True)
+        with self._lock:
+            profiles = list(self._profiles.items())
+        by_stage: Dict[str, Stats] = {}
+        for (name, _), profile in profiles:
+            # Stats of the threads of a stage are merged
+            stats = by_stage.get(name)
+            if stats is None:
+                by_stage[name] = Stats(profile)
+            else:
+                stats.add(profile)
+        for name, stats in by_stage.items():
+            stats.dump_stats(join(output_dir, f"{name}.prof"))
+
+        report = self.report()
+        sections = [report]
+        with self._lock:
+            for name, stats in sorted(self.stats.items()):
+                if stats.top_allocations:
+                    sections.append(
+                        f"Top allocations (whole process) when '{name}' reached its peak:\n"
+                        + "\n".join(stats.top_allocations)
+                    )
+        write_bytes(join(output_dir, "report.txt"), ("\n\n".join(sections) + "\n").encode())
+        return report
+
+    def close(self):
+        """
+        Stop tracing memory allocations, if started by the profiler.
+        """
+        if self._started_tracing:
+            stop_tracing()
+            self._started_tracing = False
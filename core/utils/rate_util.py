@@ -0,0 +1,134 @@
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+from typing import Optional
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket limiting the global request rate, adapting it AIMD-style:
+    the rate grows additively on each success, and is cut multiplicatively when the server
+    throttles requests, all requests being paused for the requested (or a backoff) duration.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        capacity: float = 1,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        base_backoff: float = 2,
+        max_backoff: float = 120,
+    ):
+        """
+        Args:
+            rate (float): Initial rate, in requests per second.
+            min_rate (float): Minimum rate, in requests per second.
+            max_rate (float): Maximum rate, in requests per second.
+            capacity (float, optional): Bucket capacity, i.e. allowed burst of requests.
+                Defaults to 1.
+            increase (float, optional): Rate added on each successful request.
+                Defaults to 0.1.
+            decrease (float, optional): Rate multiplier on each throttled request.
+                Defaults to 0.5.
+            base_backoff (float, optional): Pause after a first throttling without Retry-After, in seconds.
+                Doubled on each consecutive throttling. Defaults to 2.
+            max_backoff (float, optional): Maximum pause without Retry-After, in seconds.
+                Defaults to 120.
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError(
+                f"Expected 0 < min_rate <= rate <= max_rate, got {min_rate}, {rate}, {max_rate}"
+            )
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.capacity = capacity
+        self.increase = increase
+        self.decrease = decrease
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.throttled_count = 0
+        self.waited_time = 0.0
+
+        self._lock = Lock()
+        self._tokens = capacity
+        self._updated_at = monotonic()
+        self._blocked_until = 0.0
+        self._consecutive_throttles = 0
+
+    def _refill(self, now: float):
+        if now > self._updated_at:
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def wait(self) -> float:
+        """
+        Block until the caller is allowed to perform its request.
+        Tokens are reserved under the lock, but the sleep happens outside of it.
+
+        Returns:
+            float: Waited time, in seconds.
+        """
+        with self._lock:
+            now = monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # Bucket is only refilled after a pause, and a negative balance is a debt to wait for
+            delay = max(0, self._updated_at - now) + max(0, -self._tokens) / self.rate
+        if delay > 0:
+            sleep(delay)
+
+        # Requests reserved before a throttling must also respect the pause
+        with self._lock:
+            pause = self._blocked_until - monotonic()
+        if pause > 0:
+            sleep(pause)
+            delay += pause
+
+        with self._lock:
+            self.waited_time += delay
+        return delay
+
+    def on_success(self):
+        """
+        Report a successful request, increasing the rate.
+        """
+        with self._lock:
+            self._consecutive_throttles = 0
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> float:
+        """
+        Report a throttled request (HTTP 429), decreasing the rate and pausing all requests.
+
+        Args:
+            retry_after (Optional[float], optional): Delay requested by the server, in seconds.
+                Defaults to None (exponential backoff).
+
+        Returns:
+            float: Pause applied, in seconds.
+        """
+        with self._lock:
+            now = monotonic()
+            self.throttled_count += 1
+            # Requests in flight during a throttling get throttled too, only count it once
+            if now >= self._blocked_until:
+                self._consecutive_throttles += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+
+            if retry_after is None:
+                retry_after = min(
+                    self.max_backoff,
+                    self.base_backoff * 2 ** (self._consecutive_throttles - 1),
+                )
+            # Jitter, so that workers do not all retry at the same time
+            pause = retry_after * uniform(1, 1.25)
+
+            self._blocked_until = max(self._blocked_until, now + pause)
+            self._tokens = min(self._tokens, 0)
+            self._updated_at = max(self._updated_at, self._blocked_until)
+            return pause
@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+from threading import Lock, local
+from typing import Dict, Hashable, Iterable, Iterator, List, Set, Tuple
+
+from config import AmiAmiCodeTypeLiteral
+
+
+class CodeRegistry:
+    """
+    Run-scoped registry of the item codes whose details were already requested.
+    Shared by all workers and enrichings of a scraper, so a given gcode or scode
+    is requested (and output) only once, even when it is in flight elsewhere.
+
+    Claims made while working for an owner (e.g. an enriched index of a run) stay pending
+    until the owner is committed, so they can be rolled back if its results are never saved.
+    Codes can also be reserved for an owner group, so that concurrent runs give them
+    to the same run as a sequential execution would.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._local = local()
+        self._claimed: Set[str] = set()
+        self._pending: Dict[Tuple[Hashable, Hashable], List[str]] = {}
+        self._reserved: Dict[str, Hashable] = {}
+        self.saved_requests = 0
+
+    @contextmanager
+    def owner(self, group: Hashable, key: Hashable) -> Iterator[None]:
+        """
+        Attach the claims made by the current thread to an owner.
+
+        Args:
+            group (Hashable): Owner group (e.g. run timestamp).
+            key (Hashable): Owner key in its group (e.g. enriched index).
+        """
+        self._local.owner = (group, key)
+        try:
+            yield
+        finally:
+            self._local.owner = None
+
+    def _add(self, key: str):
+        self._claimed.add(key)
+        owner = getattr(self._local, "owner", None)
+        if owner is not None:
+            self._pending.setdefault(owner, []).append(key)
+
+    def claim(self, code: str, code_type: AmiAmiCodeTypeLiteral) -> bool:
+        """
+        Claim an item code before requesting its details.
+
+        Args:
+            code (str): Item code.
+            code_type (AmiAmiCodeTypeLiteral): Item code type.
+
+        Returns:
+            bool: True if the caller should request the details, False if they were already
+                requested (or are being requested) in this run, or are reserved for another group.
+        """
+        key = f"{code_type}={code}"
+        with self._lock:
+            # Codes reserved for another group are refused to owned claims
+            owner = getattr(self._local, "owner", None)
+            reserved = owner is not None and self._reserved.get(key, owner[0]) != owner[0]
+            if key in self._claimed or reserved:
+                self.saved_requests += 1
+                return False
+            self._add(key)
+            return True
+
+    def add(self, code: str, code_type: AmiAmiCodeTypeLiteral):
+        """
+        Register an item code obtained without a dedicated request (e.g. the scode of a crawled gcode).
+
+        Args:
+            code (str): Item code.
+            code_type (AmiAmiCodeTypeLiteral): Item code type.
+        """
+        with self._lock:
+            self._add(f"{code_type}={code}")
+
+    def reserve(self, codes: Iterable[str], code_type: AmiAmiCodeTypeLiteral, group: Hashable):
+        """
+        Reserve item codes for an owner group: claims made for other groups will be refused.
+        Codes already reserved stay with their first group.
+
+        Args:
+            codes (Iterable[str]): Item codes.
+            code_type (AmiAmiCodeTypeLiteral): Item codes type.
+            group (Hashable): Owner group.
+        """
+        with self._lock:
+            for code in codes:
+                self._reserved.setdefault(f"{code_type}={code}", group)
+
+    def clear_reservations(self):
+        """
+        Drop all reservations, codes not claimed yet become claimable by any owner.
+        """
+        with self._lock:
+            self._reserved.clear()
+
+    def release(self, code: str, code_type: AmiAmiCodeTypeLiteral):
+        """
+        Release a claimed item code (after a failed request), so it can be requested again.
+
+        Args:
+            code (str): Item code.
+            code_type (AmiAmiCodeTypeLiteral): Item code type.
+        """
+        with self._lock:
+            self._claimed.discard(f"{code_type}={code}")
+
+    def commit(self, group: Hashable, key: Hashable):
+        """
+        Make the claims of an owner definitive, once its results are saved.
+
+        Args:
+            group (Hashable): Owner group.
+            key (Hashable): Owner key in its group.
+        """
+        with self._lock:
+            self._pending.pop((group, key), None)
+
+    def rollback(self, group: Hashable):
+        """
+        Release the claims of the owners of a group that were not committed.
+
+        Args:
+            group (Hashable): Owner group.
+        """
+        with self._lock:
+            for owner in [owner for owner in self._pending if owner[0] == group]:
+                self._claimed.difference_update(self._pending.pop(owner))
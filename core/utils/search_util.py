@@ -0,0 +1,167 @@
+from os.path import exists, join
+from typing import Any, Dict, Iterator, List, Set
+from zlib import crc32
+
+from utils.export_util import dumps_compact, iter_data_file_items, write_bytes
+
+# Item fields searched by the webview text input
+SEARCH_FIELDS = (
+    "name",
+    "gcode",
+    "scode",
+    "jancode",
+    "maker_name",
+    "modeler_name",
+    "description",
+)
+
+# Length of the substrings of the tokens indexed for the lookup of query words
+NGRAM_LENGTH = 3
+
+
+def read_data_list(data_list_file: str) -> List[str]:
+    """
+    Read the data files listed for the webview, skipping empty and commented lines.
+
+    Args:
+        data_list_file (str): Path of the listing file.
+
+    Returns:
+        List[str]: Listed filenames, in loading order.
+    """
+    if not exists(data_list_file):
+        return []
+    with open(data_list_file, "r", encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def add_to_data_list(data_list_file: str, filename: str) -> bool:
+    """
+    Append a data file to the listing file, if not listed yet.
+
+    Args:
+        data_list_file (str): Path of the listing file.
+        filename (str): Data filename.
+
+    Returns:
+        bool: True if the file was added.
+    """
+    if exists(data_list_file):
+        with open(data_list_file, "r") as f:
+            if filename in f.read().splitlines():
+                return False
+    with open(data_list_file, "a") as f:
+        f.write(filename + "\n")
+    return True
+
+
+def iter_item_tokens(item: Dict[str, Any]) -> Iterator[str]:
+    """
+    Split the searched fields of an item into lowercase, whitespace-separated tokens.
+    As tokens are only cut on whitespace, any query word found in a field is a substring of one of them.
+
+    Args:
+        item (Dict[str, Any]): Mapped item.
+
+    Yields:
+        Iterator[str]: Tokens (possibly repeated).
+    """
+    for field in SEARCH_FIELDS:
+        if item.get(field):
+            yield from item[field].lower().split()
+    for tag in item.get("tags", []):
+        yield from tag.lower().split()
+
+
+def get_search_blob(item: Dict[str, Any]) -> str:
+    """
+    Get the text searched by the webview in an item, as built when it is loaded
+    (`prepareItem` in `web/script.js`).
+
+    Args:
+        item (Dict[str, Any]): Mapped item.
+
+    Returns:
+        str: Lowercase searched fields, separated by NUL characters.
+    """
+    values = [item.get("name"), item.get("gcode"), item.get("scode"), item.get("jancode")]
+    values += item.get("tags", [])
+    values += [item.get("maker_name"), item.get("modeler_name"), item.get("description")]
+    return "\0".join(value or "" for value in values).lower()
+
+
+def iter_ngrams(token: str) -> Iterator[str]:
+    """
+    Iterate over the substrings of a token looked up by the webview (possibly repeated).
+
+    Args:
+        token (str): Token.
+
+    Yields:
+        Iterator[str]: Substrings of `NGRAM_LENGTH` characters.
+    """
+    for start in range(len(token) - NGRAM_LENGTH + 1):
+        yield token[start : start + NGRAM_LENGTH]
+
+
+def _delta_encode(ids: List[int]) -> List[int]:
+    return [ids[0]] + [ids[i] - ids[i - 1] for i in range(1, len(ids))]
+
+
+def write_search_index(data_dir: str, data_list_file: str, index_path: str) -> int:
+    """
+    Build the inverted index of the items of all listed data files, as loaded by the webview.
+    Items ids are their position in the concatenation of the files, in listing order.
+
+    The index holds the sorted tokens with the postings of each of them (ids of the items
+    containing it), and the n-grams of the tokens with the ids of the tokens containing each
+    of them, so that the tokens containing a query word are found without scanning the vocabulary.
+    Postings are sorted and delta-encoded. A fingerprint of the searched text of the items
+    (CRC32 of their search blobs, as UTF-16LE) tells the webview whether the index matches
+    the loaded items.
+
+    Args:
+        data_dir (str): Directory of the data files.
+        data_list_file (str): Path of the listing file.
+        index_path (str): Path of the index file.
+
+    Returns:
+        int: Number of indexed items.
+    """
+    filenames = read_data_list(data_list_file)
+    postings: Dict[str, List[int]] = {}
+    fingerprint = 0
+    item_id = -1
+    for filename in filenames:
+        for item_id, item in enumerate(iter_data_file_items(join(data_dir, filename)), item_id + 1):
+            item_tokens: Set[str] = set(iter_item_tokens(item))
+            for token in item_tokens:
+                postings.setdefault(token, []).append(item_id)
+            # Code units of the JavaScript strings, lone surrogates included
+            blob = (get_search_blob(item) + "\1").encode("utf-16-le", "surrogatepass")
+            fingerprint = crc32(blob, fingerprint)
+
+    tokens = sorted(postings)
+    ngram_tokens: Dict[str, List[int]] = {}
+    for token_id, token in enumerate(tokens):
+        for ngram in set(iter_ngrams(token)):
+            ngram_tokens.setdefault(ngram, []).append(token_id)
+    ngrams = sorted(ngram_tokens)
+
+    write_bytes(
+        index_path,
+        dumps_compact(
+            {
+                "files": filenames,
+                "items_length": item_id + 1,
+                "fingerprint": fingerprint,
+                "tokens": tokens,
+                "postings": [_delta_encode(postings[token]) for token in tokens],
+                "ngram_length": NGRAM_LENGTH,
+                "ngrams": ngrams,
+                "ngram_tokens": [_delta_encode(ngram_tokens[ngram]) for ngram in ngrams],
+            }
+        ),
+    )
+    return item_id + 1
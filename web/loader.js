@@ -0,0 +1,86 @@
+// Data files loading, shared by the page and the loading worker
+
+const manifestSuffix = '.manifest.json';
+const ndjsonSuffix = '.ndjson';
+const supportsGzip = typeof DecompressionStream !== 'undefined';
+
+
+// Fetch a file, failing on HTTP errors
+const fetchFile = async (url) => {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Error while loading '${url}'.`);
+    }
+    return response;
+};
+
+
+// Fetch and parse a JSON file
+const fetchJson = async (url) => {
+    const response = await fetchFile(url);
+    return response.json();
+};
+
+
+// Fetch and parse a gzipped JSON file, if the browser can decompress it
+const fetchGzipJson = async (url) => {
+    const response = await fetchFile(url);
+    const buffer = await response.arrayBuffer();
+    const bytes = new Uint8Array(buffer);
+
+    // Some servers send .gz files with a gzip Content-Encoding, already decoded by the browser
+    if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+        return JSON.parse(new TextDecoder().decode(bytes));
+    }
+    const stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).json();
+};
+
+
+// Load the shards of a compact export in parallel
+const loadManifest = async (folderPath, filename) => {
+    const manifest = await fetchJson(folderPath + filename);
+    const shards = await Promise.all(manifest.shards.map(async (shard) => {
+        // Brotli siblings are only served by the web server itself (Content-Encoding negotiation)
+        const data = shard.encodings.gz && supportsGzip
+            ? await fetchGzipJson(folderPath + shard.encodings.gz)
+            : await fetchJson(folderPath + shard.filename);
+        return data.items;
+    }));
+    return shards.flat();
+};
+
+
+// Parse an NDJSON file while it downloads, giving items by chunks of lines
+const streamNdjson = async (folderPath, filename, onItems) => {
+    const response = await fetchFile(folderPath + filename);
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        if (value) buffer += value;
+
+        // Keep the last (incomplete) line for the next chunk
+        const lines = buffer.split('\n');
+        buffer = done ? '' : lines.pop();
+        const items = [];
+        for (const line of lines) {
+            if (line.trim().length > 0) items.push(JSON.parse(line));
+        }
+        if (items.length > 0) onItems(items);
+        if (done) break;
+    }
+};
+
+
+// Load a data file, whatever its format, giving its items (in file order) through onItems
+const loadDataFile = async (folderPath, filename, onItems) => {
+    if (filename.endsWith(manifestSuffix)) {
+        return onItems(await loadManifest(folderPath, filename));
+    }
+    if (filename.endsWith(ndjsonSuffix)) {
+        return streamNdjson(folderPath, filename, onItems);
+    }
+    const data = await fetchJson(folderPath + filename);
+    onItems(data.items);
+};
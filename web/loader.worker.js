@@ -0,0 +1,14 @@
+// Loading worker: fetches and parses all data files concurrently, off the main thread
+importScripts('loader.js');
+
+self.onmessage = async (event) => {
+    const { folderPath, filenames } = event.data;
+    await Promise.all(filenames.map(async (filename, fileIndex) => {
+        try {
+            await loadDataFile(folderPath, filename, items => self.postMessage({ type: 'items', fileIndex, items }));
+        } catch (error) {
+            self.postMessage({ type: 'error', fileIndex, message: String(error) });
+        }
+    }));
+    self.postMessage({ type: 'done' });
+};
@@ -4,20 +4,207 @@ document.addEventListener('DOMContentLoaded', () => {
 
     const folderPath = 'data/';
     const dataFilesPath = '_data_files.txt';
-
-    let currentIndex = 0;
-    const batchSize = 50;
+    const searchIndexPath = '_search_index.json';
+    const workerPath = 'loader.worker.js';
+    const progressiveRefreshDelay = 500;
+
+    const bufferRows = 10;
+    const defaultRowHeight = 200;
+    // Browsers cap element heights (about 17.9M px in Firefox, 33.5M px in Chrome),
+    // past this height the table keeps it and its scroll offset is scaled to the rows
+    const maxTableHeight = 5000000;
+    let rowHeight = null;
+    let renderedRange = null;
+    let renderRequested = false;
     const timeoutValue = 500;
+    const searchDelay = 200;
+    const maxIndexedShare = 0.2;
     const itemConditionOrder = ['J', 'C', 'B', 'B+', 'A-', 'A', ''];
 
     let jsonData = [];
     let filteredData = [];
+    let searchIndex = null;
 
     let currentSort = { column: 'name', direction: 'asc' };
 
     const minPriceInput = document.getElementById('minPrice');
     const maxPriceInput = document.getElementById('maxPrice');
 
+    // CRC32 of the searched text of the loaded items, as computed when building the search index
+    const crcTable = Array.from({ length: 256 }, (_, n) => {
+        let c = n;
+        for (let k = 0; k < 8; k++) c = c & 1 ? 0xEDB88320 ^ (c >>> 1) : c >>> 1;
+        return c >>> 0;
+    });
+    // (over the UTF-16LE code units of their search blobs, each followed by U+0001)
+    const searchFingerprint = () => {
+        let crc = 0xFFFFFFFF;
+        for (const item of jsonData) {
+            const blob = item._searchBlob + '\u0001';
+            for (let i = 0; i < blob.length; i++) {
+                const code = blob.charCodeAt(i);
+                crc = crcTable[(crc ^ code) & 0xFF] ^ (crc >>> 8);
+                crc = crcTable[(crc ^ (code >>> 8)) & 0xFF] ^ (crc >>> 8);
+            }
+        }
+        return (crc ^ 0xFFFFFFFF) >>> 0;
+    };
+
+
+    // Load the inverted search index, only if it was built over the loaded files and items
+    const loadSearchIndex = async (filenames) => {
+        try {
+            const index = await fetchJson(folderPath + searchIndexPath);
+            const upToDate = index.items_length === jsonData.length
+                && index.files.length === filenames.length
+                && index.files.every((filename, i) => filename === filenames[i])
+                && index.fingerprint === searchFingerprint();
+            if (!upToDate) {
+                console.log('Search index is outdated, using linear search.');
+                return null;
+            }
+            console.log(`Search index loaded, ${index.tokens.length} tokens found.`);
+            return {
+                tokens: index.tokens,
+                postings: index.postings,
+                ngramLength: index.ngram_length,
+                ngrams: new Map(index.ngrams.map((ngram, ngramIndex) => [ngram, ngramIndex])),
+                ngramTokens: index.ngram_tokens,
+                decoded: new Map(),
+            };
+        } catch (error) {
+            console.log('No search index found, using linear search.');
+            return null;
+        }
+    };
+
+
+    // Decode (delta-encoded) postings, once
+    const decodePostings = (key, deltas) => {
+        let ids = searchIndex.decoded.get(key);
+        if (!ids) {
+            ids = new Array(deltas.length);
+            let id = 0;
+            for (let i = 0; i < deltas.length; i++) {
+                id += deltas[i];
+                ids[i] = id;
+            }
+            searchIndex.decoded.set(key, ids);
+        }
+        return ids;
+    };
+
+
+    // Intersect sorted ids, looking up the ids of the smallest list in the other one
+    const intersectSorted = (small, large) => {
+        const result = [];
+        let low = 0;
+        for (const id of small) {
+            let high = large.length;
+            while (low < high) {
+                const middle = (low + high) >>> 1;
+                if (large[middle] < id) low = middle + 1;
+                else high = middle;
+            }
+            if (low === large.length) break;
+            if (large[low] === id) result.push(id);
+        }
+        return result;
+    };
+
+
+    // Ids of the items with a token containing a word, in loading order
+    // (null if the word is too short to be looked up, or too common for the lookup to pay off)
+    const searchWord = (word) => {
+        const chars = Array.from(word);
+        const { ngramLength } = searchIndex;
+        if (chars.length < ngramLength) return null;
+
+        // Tokens containing all n-grams of the word, from the rarest n-gram
+        const ngramIndexes = [];
+        for (let i = 0; i + ngramLength <= chars.length; i++) {
+            const ngramIndex = searchIndex.ngrams.get(chars.slice(i, i + ngramLength).join(''));
+            if (ngramIndex === undefined) return [];
+            ngramIndexes.push(ngramIndex);
+        }
+        ngramIndexes.sort((a, b) => searchIndex.ngramTokens[a].length - searchIndex.ngramTokens[b].length);
+        // Scanning all items is cheaper than checking most of the vocabulary, or merging
+        // the postings of a word found in most items
+        if (searchIndex.ngramTokens[ngramIndexes[0]].length > jsonData.length * maxIndexedShare) return null;
+        let tokenIds = decodePostings(`n${ngramIndexes[0]}`, searchIndex.ngramTokens[ngramIndexes[0]]);
+        for (let i = 1; i < ngramIndexes.length && tokenIds.length > 0; i++) {
+            const ngramIndex = ngramIndexes[i];
+            tokenIds = intersectSorted(tokenIds, decodePostings(`n${ngramIndex}`, searchIndex.ngramTokens[ngramIndex]));
+        }
+
+        const matchingTokenIds = tokenIds.filter(tokenId => searchIndex.tokens[tokenId].includes(word));
+        let postingsLength = 0;
+        for (const tokenId of matchingTokenIds) postingsLength += searchIndex.postings[tokenId].length;
+        if (postingsLength > jsonData.length * maxIndexedShare) return null;
+
+        // Items containing the matching tokens, marked to get them back in loading order
+        const marks = new Uint8Array(jsonData.length);
+        for (const tokenId of matchingTokenIds) {
+            for (const id of decodePostings(`t${tokenId}`, searchIndex.postings[tokenId])) marks[id] = 1;
+        }
+        const ids = [];
+        if (matchingTokenIds.length > 0) {
+            for (let id = 0; id < marks.length; id++) {
+                if (marks[id]) ids.push(id);
+            }
+        }
+        return ids;
+    };
+
+
+    // Ids of the items that may match a text query, in loading order (null if all items may match)
+    // Each query word must be part of an indexed token, exact matching is still checked afterwards.
+    // Words shorter than the indexed n-grams are only checked by the exact matching
+    const searchCandidates = (query) => {
+        const words = query.split(/\s+/).filter(word => word.length > 0);
+        if (!searchIndex || words.length === 0) return null;
+
+        let candidates = null;
+        for (const word of words) {
+            const ids = searchWord(word);
+            if (ids === null) continue;
+            candidates = candidates === null ? ids
+                : ids.length < candidates.length ? intersectSorted(ids, candidates) : intersectSorted(candidates, ids);
+            if (candidates.length === 0) break;
+        }
+        return candidates;
+    };
+
+
+    // Load data files in a worker, forwarding their items as they are parsed
+    const loadWithWorker = (filenames, onItems) => new Promise(resolve => {
+        const worker = new Worker(workerPath);
+        worker.onmessage = (event) => {
+            const message = event.data;
+            if (message.type === 'items') {
+                onItems(message.fileIndex, message.items);
+            } else if (message.type === 'error') {
+                console.error(`Error while loading '${filenames[message.fileIndex]}':`, message.message);
+            } else if (message.type === 'done') {
+                worker.terminate();
+                resolve();
+            }
+        };
+        worker.postMessage({ folderPath, filenames });
+    });
+
+
+    // Display first rows while files are loading, as long as the user did not scroll further
+    let progressiveRefreshTimeoutId = null;
+    const scheduleProgressiveRefresh = () => {
+        if (progressiveRefreshTimeoutId !== null || !isNearTop()) return;
+        progressiveRefreshTimeoutId = setTimeout(() => {
+            progressiveRefreshTimeoutId = null;
+            if (isNearTop()) refreshView();
+        }, progressiveRefreshDelay);
+    };
+
+
     // Load JSON data
     const loadData = async () => {
         // Read file listing JSON files to load
@@ -32,55 +219,165 @@ document.addEventListener('DOMContentLoaded', () => {
             .filter(line => line.length > 0 && !line.startsWith('#'));
         console.log(`Found ${filenames.length} JSON files.`);
 
-        try {
-            // Load JSON files
-            for (const filename of filenames) {
-                console.log(`> Loading '${filename}'`);
-                const response = await fetch(folderPath + filename);
-                if (!response.ok) {
-                    throw new Error('Error while loading JSON file.');
-                }
-                const data = await response.json();
-                jsonData = jsonData.concat(data.items);
+        // Items of each file, to rebuild the loading order (used by the search index) at the end
+        const filesItems = filenames.map(() => []);
+        const onItems = (fileIndex, items) => {
+            dataVersion++;
+            for (const item of items) {
+                prepareItem(item);
+                filesItems[fileIndex].push(item);
+                jsonData.push(item);
             }
-        } catch (error) {
-            console.error('Error while loading JSON files:', error);
+            scheduleProgressiveRefresh();
+        };
+
+        // Load all files concurrently, parsing them in a worker if possible
+        if (typeof Worker !== 'undefined') {
+            await loadWithWorker(filenames, onItems);
+        } else {
+            await Promise.all(filenames.map((filename, fileIndex) =>
+                loadDataFile(folderPath, filename, items => onItems(fileIndex, items))
+                    .catch(error => console.error(`Error while loading '${filename}':`, error))
+            ));
         }
 
+        jsonData = [];
+        dataVersion++;
+        for (const items of filesItems) {
+            for (const item of items) jsonData.push(item);
+        }
         console.log(`All files loaded, ${jsonData.length} items found.`);
+        clearTimeout(progressiveRefreshTimeoutId);
+        progressiveRefreshTimeoutId = null;
         filteredData = jsonData;
         refreshView();
+
+        // Checking the index fingerprint reads all items, searches are linear until it is done
+        searchIndex = await loadSearchIndex(filenames);
     }
 
 
-    // Display progressively the data
-    const displayData = () => {
+    // Build the row of an item
+    const createRow = (item, index) => {
+        const euroPrice = item._euroPrice.toFixed(2);
+        const releaseDate = item.release_date ? new Date(item.release_date).toLocaleDateString('en-GB', { year: 'numeric', month: 'short', day: 'numeric' }) : defaultValue;
+
+        const jancode = item.jancode ? `<a href="https://myfigurecollection.net/?keywords=${item.jancode}&_tb=item" target="_blank">${item.jancode}</a>` : defaultValue;
+
+        const row = document.createElement('tr');
+        row.className = index % 2 === 0 ? 'item-row' : 'item-row even';
+        row.innerHTML = ''
+            + `<td>${index + 1} / ${filteredData.length}</td>`
+            + `<td><img src="${item.image_url}" alt="${item.name}" loading="lazy"></td>`
+            + `<td><div class="name-cell">${item.name}</div></td>`
+            + `<td><span class="split-cell"><span class="top"><a href="${item.gcode_url}" target="_blank">${item.gcode}</a></span><span class="bottom"><a href="${item.scode_url}" target="_blank">${item.scode}</a></span></span></td>`
+            + `<td><span class="split-cell"><span class="top">¥${item.price}</span><span class="bottom">${euroPrice} €</span></span></td>`
+            + `<td>${item.sale_status || defaultValue}</td>`
+            + `<td>${releaseDate}</td>`
+            + `<td>${jancode}</td>`
+            + `<td><span class="split-cell"><span class="top">${item.item_condition ? `ITEM: ${item.item_condition}` : 'New'}</span><span class="bottom">${item.box_condition ? `BOX: ${item.box_condition}` : 'New'}</span></span></td>`
+            + '';
+        return row;
+    };
+
+
+    // Build an empty row standing for the height of the rows not rendered
+    const createSpacer = (height) => {
+        const spacer = document.createElement('tr');
+        spacer.className = 'spacer-row';
+        spacer.innerHTML = `<td colspan="9" style="height: ${height}px"></td>`;
+        return spacer;
+    };
+
+
+    // Position of the table body in the page
+    const getTableBodyTop = () => {
         const tableBody = document.getElementById('itemsTableBody');
-        const endIndex = currentIndex + batchSize;
-        const currentBatch = filteredData.slice(currentIndex, endIndex);
-
-        currentBatch.forEach((item, index) => {
-            const euroPrice = (item.price * yenToEuroMultiplier).toFixed(2);
-            const releaseDate = item.release_date ? new Date(item.release_date).toLocaleDateString('en-GB', { year: 'numeric', month: 'short', day: 'numeric' }) : defaultValue;
-
-            const jancode = item.jancode ? `<a href="https://myfigurecollection.net/?keywords=${item.jancode}&_tb=item" target="_blank">${item.jancode}</a>` : defaultValue;
-
-            const row = document.createElement('tr');
-            row.innerHTML = ''
-                + `<td>${index + currentIndex + 1} / ${filteredData.length}</td>`
-                + `<td><img src="${item.image_url}" alt="${item.name}" loading="lazy"></td>`
-                + `<td>${item.name}</td>`
-                + `<td><span class="split-cell"><span class="top"><a href="${item.gcode_url}" target="_blank">${item.gcode}</a></span><span class="bottom"><a href="${item.scode_url}" target="_blank">${item.scode}</a></span></span></td>`
-                + `<td><span class="split-cell"><span class="top">¥${item.price}</span><span class="bottom">${euroPrice} €</span></span></td>`
-                + `<td>${item.sale_status || defaultValue}</td>`
-                + `<td>${releaseDate}</td>`
-                + `<td>${jancode}</td>`
-                + `<td><span class="split-cell"><span class="top">${item.item_condition ? `ITEM: ${item.item_condition}` : 'New'}</span><span class="bottom">${item.box_condition ? `BOX: ${item.box_condition}` : 'New'}</span></span></td>`
-                + '';
-            tableBody.appendChild(row);
-        });
+        return tableBody.getBoundingClientRect().top + window.scrollY;
+    };
+
+
+    // Height of the table body, and how its scroll offset is scaled when it is capped:
+    // rows are shifted up by `extra` px along the table, except in its first and last `margin` px
+    const getTableLayout = () => {
+        const height = rowHeight || defaultRowHeight;
+        const rowsHeight = filteredData.length * height;
+        const tableHeight = Math.min(rowsHeight, maxTableHeight);
+        const scrollable = Math.max(0, tableHeight - window.innerHeight);
+        const extra = rowsHeight - tableHeight;
+        const margin = height;
+        const ratio = extra > 0 ? extra / Math.max(1, scrollable - 2 * margin) : 0;
+        return { height, tableHeight, scrollable, extra, margin, ratio };
+    };
+
+
+    // Offset of the rows displayed at a given scroll offset of the table body
+    const getRowsOffset = ({ extra, margin, ratio }, offset) => offset + Math.min(Math.max(0, (offset - margin) * ratio), extra);
+
+
+    // Scroll offset of the table body displaying the rows from a given offset
+    const getScrollOffset = ({ scrollable, extra, margin, ratio }, rowsOffset) => Math.min(
+        Math.max(Math.min(margin + (rowsOffset - margin) / (1 + ratio), rowsOffset), rowsOffset - extra),
+        scrollable,
+    );
+
+
+    // Range of rows visible in the window, plus a buffer on both sides, and the spacers around them
+    // When the table height is capped, rows are shifted up to be displayed at the scaled offset
+    const getVisibleRange = () => {
+        const layout = getTableLayout();
+        const { height, tableHeight, scrollable } = layout;
+        const offset = Math.min(Math.max(0, window.scrollY - getTableBodyTop()), scrollable);
+        const rowsOffset = getRowsOffset(layout, offset);
+        const shift = rowsOffset - offset;
+        // Buffer rows shifted above the table (or below it) cannot be displayed
+        const start = Math.max(0, Math.ceil(shift / height), Math.floor(rowsOffset / height) - bufferRows);
+        const end = Math.min(
+            filteredData.length,
+            Math.floor((shift + tableHeight) / height),
+            Math.ceil((rowsOffset + window.innerHeight) / height) + bufferRows,
+        );
+        const top = start * height - shift;
+        const bottom = Math.max(0, tableHeight - top - Math.max(0, end - start) * height);
+        return { start, end: Math.max(start, end), top, bottom };
+    };
 
-        currentIndex = endIndex;
+
+    // Check if the first rows are visible
+    const isNearTop = () => getVisibleRange().start === 0;
+
+
+    // Only materialize the visible rows, spacers keeping the table at its full height
+    const displayData = (force = false) => {
+        const range = getVisibleRange();
+        const sameRows = !force && renderedRange && range.start === renderedRange.start && range.end === renderedRange.end;
+        if (sameRows && range.top === renderedRange.top) {
+            return;
+        }
+        renderedRange = range;
+
+        const tableBody = document.getElementById('itemsTableBody');
+        // Scaled scrolling within the same rows, only move them
+        if (sameRows) {
+            tableBody.firstElementChild.firstElementChild.style.height = `${range.top}px`;
+            tableBody.lastElementChild.firstElementChild.style.height = `${range.bottom}px`;
+            return;
+        }
+        const rows = [];
+        for (let index = range.start; index < range.end; index++) {
+            rows.push(createRow(filteredData[index], index));
+        }
+        tableBody.replaceChildren(
+            createSpacer(range.top),
+            ...rows,
+            createSpacer(range.bottom),
+        );
+
+        // Rows have a fixed height (see styles), measure it once to place the spacers exactly
+        if (rowHeight === null && rows.length > 0) {
+            rowHeight = rows[0].getBoundingClientRect().height || null;
+            if (rowHeight !== null && rowHeight !== defaultRowHeight) displayData(true);
+        }
 
         // Update item count
         updateDisplayedCount();
@@ -94,51 +391,96 @@ document.addEventListener('DOMContentLoaded', () => {
     };
 
 
-    // Scroll handling to paginate items
+    // Scroll handling, rendering the rows at most once per frame
     const handleScroll = () => {
-        // Triggered before end of page
-        const nearBottom = window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 200;
-        if (nearBottom && currentIndex < filteredData.length) {
+        if (renderRequested) return;
+        renderRequested = true;
+        requestAnimationFrame(() => {
+            renderRequested = false;
             displayData();
-        }
+        });
     };
 
 
-    // Data filtering
-    const filterData = () => {
-        return jsonData.filter(item => {
-            const query = document.getElementById('searchInput').value.toLowerCase();
+    // Scroll to a given item (1-based index in the displayed list)
+    const jumpToIndex = (index) => {
+        if (filteredData.length === 0) return;
+        const target = Math.min(Math.max(1, index), filteredData.length) - 1;
+        const layout = getTableLayout();
+        window.scrollTo(0, getTableBodyTop() + getScrollOffset(layout, target * layout.height));
+        displayData();
+    };
+
+
+    // Precompute the normalized fields used by the filters, once per item
+    // Fields are joined with a character that cannot be typed, so a query never matches across two fields
+    const prepareItem = (item) => {
+        item._searchBlob = [item.name, item.gcode, item.scode, item.jancode || '', ...item.tags,
+            item.maker_name, item.modeler_name, item.description].join('\u0000').toLowerCase();
+        item._euroPrice = Number((item.price * yenToEuroMultiplier).toFixed(2));
+    };
+
+
+    // Read all filter inputs, once per filtering
+    const readFilters = () => ({
+        query: document.getElementById('searchInput').value.toLowerCase(),
+        itemConditions: Array.from(document.querySelectorAll('input[name="item_condition"]:checked')).map(el => el.value),
+        boxConditions: Array.from(document.querySelectorAll('input[name="box_condition"]:checked')).map(el => el.value),
+        itemBoolDetails: Array.from(document.querySelectorAll('input[name="item_bool_details"]:checked')).map(el => el.value),
+        minPrice: parseFloat(minPriceInput.value.replace(',', '.')) || 0.0,
+        maxPrice: parseFloat(maxPriceInput.value.replace(',', '.')) || Infinity,
+    });
 
-            // Checkbox filters
-            const itemConditions = Array.from(document.querySelectorAll('input[name="item_condition"]:checked')).map(el => el.value);
-            const boxConditions = Array.from(document.querySelectorAll('input[name="box_condition"]:checked')).map(el => el.value);
-            const itemBoolDetails = Array.from(document.querySelectorAll('input[name="item_bool_details"]:checked')).map(el => el.value);
 
-            // Number filters
-            const minPrice = parseFloat(minPriceInput.value.replace(',', '.')) || 0.0;
-            const maxPrice = parseFloat(maxPriceInput.value.replace(',', '.')) || Infinity;
-            const euroPrice = (item.price * yenToEuroMultiplier).toFixed(2);
+    // Check if a set of values filter is at least as strict as another one (empty meaning any value)
+    const isNarrowerSet = (values, previousValues) => previousValues.length === 0
+        || (values.length > 0 && values.every(value => previousValues.includes(value)));
 
+
+    // Check if all items matching some filters also matched the previous ones
+    const isNarrowerFilters = (filters, previous) => filters.query.includes(previous.query)
+        && isNarrowerSet(filters.itemConditions, previous.itemConditions)
+        && isNarrowerSet(filters.boxConditions, previous.boxConditions)
+        && previous.itemBoolDetails.every(filter => filters.itemBoolDetails.includes(filter))
+        && filters.minPrice >= previous.minPrice
+        && filters.maxPrice <= previous.maxPrice;
+
+
+    // Last filtering, refined instead of recomputed when filters only get stricter
+    let lastFiltering = null;
+    let dataVersion = 0;
+
+
+    // Data filtering
+    const filterData = () => {
+        const filters = readFilters();
+        const { query, itemConditions, boxConditions, itemBoolDetails, minPrice, maxPrice } = filters;
+
+        let items;
+        if (lastFiltering && lastFiltering.dataVersion === dataVersion && isNarrowerFilters(filters, lastFiltering.filters)) {
+            items = lastFiltering.result;
+        } else {
+            const candidates = searchCandidates(query);
+            items = candidates === null ? jsonData : candidates.map(id => jsonData[id]);
+        }
+
+        const result = items.filter(item => {
             // Query filter
-            const matchesText = item.name.toLowerCase().includes(query)
-                || item.gcode.toLowerCase().includes(query)
-                || item.scode.toLowerCase().includes(query)
-                || item.jancode?.toLowerCase().includes(query)
-                || item.tags.some(tag => tag.toLowerCase().includes(query))
-                || item.maker_name.toLowerCase().includes(query)
-                || item.modeler_name.toLowerCase().includes(query)
-                || item.description.toLowerCase().includes(query);
+            const matchesText = item._searchBlob.includes(query);
 
             // Check conditions
-
             const matchesItemCondition = itemConditions.length === 0 || itemConditions.includes(item.item_condition);
             const matchesBoxCondition = boxConditions.length === 0 || boxConditions.includes(item.box_condition);
             const matchesBool = itemBoolDetails.length === 0 || itemBoolDetails.every(filter => item[filter] === true);
 
-            const matchesPrice = euroPrice >= minPrice && euroPrice <= maxPrice;
+            const matchesPrice = item._euroPrice >= minPrice && item._euroPrice <= maxPrice;
 
             return matchesText && matchesItemCondition && matchesBoxCondition && matchesBool && matchesPrice;
         });
+
+        lastFiltering = { filters, dataVersion, result };
+        // Displayed data gets sorted in place, keep the filtering result untouched
+        return result.slice();
     };
 
 
@@ -168,9 +510,7 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         // Reload data after sorting
-        document.getElementById('itemsTableBody').innerHTML = '';
-        currentIndex = 0;
-        displayData();
+        displayData(true);
     };
 
 
@@ -191,22 +531,23 @@ document.addEventListener('DOMContentLoaded', () => {
     // Refresh view
     const refreshView = () => {
         filteredData = filterData();
-        currentIndex = 0;
-        document.getElementById('itemsTableBody').innerHTML = '';
-        displayData();
+        displayData(true);
+    };
+
+
+    // Delay a function call until its trigger stopped firing for a given time
+    const debounce = (callback, delay) => {
+        let timeoutId;
+        return () => {
+            clearTimeout(timeoutId);
+            timeoutId = setTimeout(callback, delay);
+        };
     };
 
 
     // Search input management
-    let searchInputTimeoutId;
     const searchInput = document.getElementById('searchInput');
-    searchInput.addEventListener('input', () => {
-        clearTimeout(searchInputTimeoutId);
-
-        searchInputTimeoutId = setTimeout(() => {
-            refreshView();
-        }, timeoutValue);
-    });
+    searchInput.addEventListener('input', debounce(refreshView, searchDelay));
 
 
     // Checkbox filters management
@@ -219,23 +560,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
 
     // Price management
-    let minPriceTimeoutId;
-    minPriceInput.addEventListener('input', () => {
-        clearTimeout(minPriceTimeoutId);
-
-        minPriceTimeoutId = setTimeout(() => {
-            refreshView();
-        }, timeoutValue);
-    });
-
-    let maxPriceTimeoutId;
-    maxPriceInput.addEventListener('input', () => {
-        clearTimeout(maxPriceTimeoutId);
-
-        maxPriceTimeoutId = setTimeout(() => {
-            refreshView();
-        }, timeoutValue);
-    });
+    minPriceInput.addEventListener('input', debounce(refreshView, timeoutValue));
+    maxPriceInput.addEventListener('input', debounce(refreshView, timeoutValue));
 
 
     // Initial loading
@@ -243,6 +569,14 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Scroll manager
     window.addEventListener('scroll', handleScroll);
+    window.addEventListener('resize', handleScroll);
+
+    // Jump to a given index
+    const jumpInput = document.getElementById('jumpToIndex');
+    jumpInput.addEventListener('change', () => {
+        const index = parseInt(jumpInput.value, 10);
+        if (!Number.isNaN(index)) jumpToIndex(index);
+    });
 
     // Initialize sorting
     document.querySelectorAll('.sortable').forEach(header => {